@@ -0,0 +1,7 @@
+from modulo.http import route
+
+
+@route(r'^/benchmark/(?P<id>\d+)$')
+async def benchmark(context, response, id):
+    response.json({'id': id})
+    await response.send()
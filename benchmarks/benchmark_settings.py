@@ -0,0 +1 @@
+ROUTES = ['benchmark_routes']
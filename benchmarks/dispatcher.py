@@ -0,0 +1,51 @@
+import os
+import re
+import sys
+from timeit import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('MODULO_CONFIG_MODULE', 'benchmark_settings')
+
+from modulo.http.dispatcher import Dispatcher  # noqa: E402
+
+
+def build(count):
+    routes = {}
+    for index in range(count):
+        if index % 2:
+            routes[f'route{index}'] = re.compile(rf'^/api/resource{index}/(?P<id>\d+)$')
+        else:
+            routes[f'route{index}'] = re.compile(rf'^/pages/page{index}/?$')
+    return routes
+
+
+def linear(routes, path):
+    for name, pattern in routes.items():
+        match = pattern.match(path)
+        if match is not None:
+            return name, match.groupdict()
+    return None
+
+
+def main() -> None:
+    number = 20000
+    print(f'{"routes":>6} {"case":>6} {"linear us":>10} {"compiled us":>12} {"speedup":>8} {"compile ms":>11}')
+    for count in (10, 100, 1000):
+        routes = build(count)
+        compile_time = timeit(lambda: Dispatcher(routes), number=1)
+        dispatcher = Dispatcher(routes)
+        cases = {
+            'first': '/pages/page0',
+            'last': f'/api/resource{count - 1}/42',
+            'miss': '/missing/path'
+        }
+        for case, path in cases.items():
+            assert dispatcher.match(path) == linear(routes, path)
+            slow = timeit(lambda: linear(routes, path), number=number) / number * 1e6
+            fast = timeit(lambda: dispatcher.match(path), number=number) / number * 1e6
+            print(f'{count:>6} {case:>6} {slow:>10.2f} {fast:>12.2f} {slow / fast:>7.1f}x {compile_time * 1000:>11.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+import asyncio
+import gc
+import os
+import sys
+import tracemalloc
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('MODULO_CONFIG_MODULE', 'benchmark_settings')
+
+from modulo.conf import settings  # noqa: E402
+from modulo.server import ASGIServer  # noqa: E402
+
+
+REQUESTS = 20000
+SCOPE = {
+    'type': 'http',
+    'asgi': {'version': '3.0'},
+    'http_version': '1.1',
+    'method': 'GET',
+    'scheme': 'http',
+    'path': '/benchmark/42',
+    'query_string': b'',
+    'headers': [(b'host', b'localhost'), (b'accept', b'application/json')]
+}
+
+
+async def serve(server: ASGIServer) -> None:
+    events = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+    async def receive():
+        return events.pop() if events else {'type': 'http.disconnect'}
+
+    async def send(message):
+        pass
+
+    await server(dict(SCOPE), receive, send)
+
+
+def collections() -> int:
+    return sum(generation['collections'] for generation in gc.get_stats())
+
+
+async def measure(pool_size: int):
+    settings._values['HANDLER_POOL_SIZE'] = pool_size
+    server = ASGIServer()
+    for _ in range(100):
+        await serve(server)
+    gc.collect()
+    start_collections = collections()
+    start = perf_counter()
+    for _ in range(REQUESTS):
+        await serve(server)
+    elapsed = perf_counter() - start
+    gc_runs = collections() - start_collections
+    tracemalloc.start()
+    for _ in range(1000):
+        await serve(server)
+    _, peak = tracemalloc.get_traced_memory()
+    before = tracemalloc.take_snapshot()
+    await serve(server)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'lineno') if stat.count_diff > 0)
+    return elapsed, gc_runs, peak, blocks
+
+
+async def main() -> None:
+    print(f'{"handler pool":>12} {"req/s":>8} {"gc runs":>8} {"peak KiB":>9} {"blocks kept/request":>20}')
+    for pool_size in (0, settings.HANDLER_POOL_SIZE):
+        elapsed, gc_runs, peak, blocks = await measure(pool_size)
+        print(f'{pool_size:>12} {REQUESTS / elapsed:>8.0f} {gc_runs:>8} {peak / 1024:>9.1f} {blocks:>20}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
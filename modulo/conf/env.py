@@ -1,3 +1,8 @@
+from os import environ
+from typing import Any, List
+from .exceptions import MissingConfigurationKeyException
+
+
 def from_env(key: str, default: Any = None, allow_missing: bool = True) -> str:
     if not allow_missing and key not in environ:
         raise MissingConfigurationKeyException(key)
@@ -1,21 +1,59 @@
+from __future__ import annotations
 from os import environ
-from tempfile import gettempdir()
+from tempfile import gettempdir
 from typing import Any, Optional
 from importlib import import_module
 from .exceptions import MissingConfigurationException, MissingConfigurationKeyException
 from .env import env_bool, env_list, env_str
-from modulo.session.backend import File
+try:
+    from modulo.session.backend import File
+except ImportError:
+    File = None
 
 DEFAULT_SETTINGS = {
     'APPLICATION_KEY': env_str('APPLICATION_KEY'),
     'DEBUG': env_bool('DEBUG'),
-    'CUSTOM_HANDLERS': {}
-    'ROUTES': []
+    'CUSTOM_HANDLERS': {},
+    'ROUTES': [],
     'SESSION_BACKEND': File,
     'SESSION_OPTIONS': {
         'folder': gettempdir()
     },
-    'SESSION_LIFETIME': 86400
+    'SESSION_LIFETIME': 86400,
+    'BODY_SPOOL_THRESHOLD': 1024 * 1024,
+    'BODY_MAX_SIZE': 0,
+    'MULTIPART_MAX_PART_SIZE': 0,
+    'MULTIPART_MAX_FIELD_SIZE': 1024 * 1024,
+    'MULTIPART_MAX_PARTS': 1000,
+    'FILE_CHUNK_SIZE': 64 * 1024,
+    'FILE_CACHE_SIZE': 0,
+    'FILE_CACHE_MAX_FILE_SIZE': 256 * 1024,
+    'JSON_CODEC': 'auto',
+    'COMPRESSION_ALGORITHMS': ['gzip', 'deflate'],
+    'COMPRESSION_LEVEL': 6,
+    'COMPRESSION_MIN_SIZE': 512,
+    'COMPRESSION_EXECUTOR_THRESHOLD': 256 * 1024,
+    'COMPRESSION_EXCLUDED_TYPES': [
+        'image/png', 'image/jpeg', 'image/gif', 'image/webp', 'image/avif',
+        'video/', 'audio/', 'font/woff',
+        'application/zip', 'application/gzip', 'application/x-gzip',
+        'application/x-bzip2', 'application/x-xz', 'application/x-7z-compressed',
+        'application/zstd'
+    ],
+    'HTTP_CACHE_TTL': 60,
+    'HTTP_CACHE_MAX_ENTRIES': 1024,
+    'HTTP_CACHE_MAX_SIZE': 32 * 1024 * 1024,
+    'HANDLER_POOL_SIZE': 1024,
+    'DATABASE_STICKINESS': 0,
+    'DATABASE_EJECT_TIME': 30,
+    'QUERY_CACHE_BACKEND': None,
+    'QUERY_CACHE_OPTIONS': {
+        'max_entries': 10000,
+        'max_rows': 100000
+    },
+    'QUERY_CACHE_TTL': 60,
+    'DATABASE_SLOW_QUERY_THRESHOLD': 0,
+    'DATABASE_EXPLAIN_SAMPLE_RATE': 0.0
 }
 
 
@@ -34,7 +72,7 @@ class Settings():
     def __getattr__(self: Settings, key: str) -> Any:
         if key not in self._values:
             try:
-                self._values[key] = getattr(self.values, key)
+                self._values[key] = getattr(self._original_values, key)
             except AttributeError:
                 if key in DEFAULT_SETTINGS:
                     self._values[key] = DEFAULT_SETTINGS[key]
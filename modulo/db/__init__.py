@@ -1,3 +1,8 @@
+from .exceptions import PoolTimeoutException
 from .pool import Pool
-from .backends import Abstract, Postgres
-from .table import Request, Result, Table, Where
+from .backends import Abstract, Postgres, Sqlite
+from .table import Page, Request, Result, Table, Where, batch, gather
+from .transaction import Transaction, transaction
+from .session import Session, session
+from .loader import Loader, loaders
+from .cache import QueryCache
@@ -1,2 +1,3 @@
 from .abstract import Abstract
 from .postgres import Postgres
+from .sqlite import Sqlite
@@ -1,12 +1,18 @@
-from typing import List, Tuple, Any, TYPE_CHECKING, Union
+from __future__ import annotations
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple, Any, TYPE_CHECKING, Union
 from asyncio import Queue
 
 
 if TYPE_CHECKING:
+    from modulo.db.pool import Pool
     from modulo.db.table import Request
+    from modulo.db.transaction import Transaction
 
 
 class Abstract():
+    max_parameters: int = 999
+    supports_batch: bool = False
+
     async def transaction(self: Abstract) -> None:
         raise NotImplementedError()
 
@@ -16,7 +22,22 @@ class Abstract():
     async def rollback(self: Abstract) -> None:
         raise NotImplementedError()
 
-    async def execute_query(self: Abstract, sql: str, params: Optional[Union[Tuple[Any], Dict[str, Any]]] = None) -> None:
+    async def complete(self: Abstract) -> None:
+        raise NotImplementedError()
+
+    async def reset(self: Abstract) -> None:
+        raise NotImplementedError()
+
+    async def savepoint(self: Abstract, name: str) -> None:
+        raise NotImplementedError()
+
+    async def release_savepoint(self: Abstract, name: str) -> None:
+        raise NotImplementedError()
+
+    async def rollback_to_savepoint(self: Abstract, name: str) -> None:
+        raise NotImplementedError()
+
+    async def execute_query(self: Abstract, sql: str, params: Optional[Union[Tuple[Any], Dict[str, Any]]] = None, prepare: bool = True) -> None:
         raise NotImplementedError()
 
     async def fetch_one(self: Abstract) -> Tuple[Any]:
@@ -25,9 +46,18 @@ class Abstract():
     async def fetch_some(self: Abstract, cnt: int) -> List[Tuple[Any]]:
         raise NotImplementedError()
 
+    async def open_cursor(self: Abstract, sql: str, params: Optional[Union[Tuple[Any], Dict[str, Any]]] = None) -> None:
+        raise NotImplementedError()
+
+    async def close_cursor(self: Abstract) -> None:
+        raise NotImplementedError()
+
     async def fetch_all(self: Abstract) -> List[Dict[str, Any]]:
         raise NotImplementedError()
 
+    async def fetch_batch(self: Abstract) -> List[List[Tuple[Any]]]:
+        raise NotImplementedError()
+
     async def count(self: Abstract) -> int:
         raise NotImplementedError()
 
@@ -37,14 +67,49 @@ class Abstract():
     async def close(self: Abstract) -> None:
         raise NotImplementedError()
 
+    async def ping(self: Abstract) -> bool:
+        raise NotImplementedError()
+
+    @staticmethod
+    async def copy_from(pool: Pool, transaction: Optional[Transaction], table: str, columns: List[str], rows: AsyncIterator[Sequence[Any]]) -> int:
+        raise NotImplementedError()
+
     @staticmethod
     def to_sql(request: Request) -> str:
         raise NotImplementedError()
 
+    @staticmethod
+    def to_insert(table: str, columns: Tuple[str], rows: int, returning: Optional[str] = None) -> str:
+        raise NotImplementedError()
+
+    @staticmethod
+    def to_update_many(table: str, alias: str, primary: str, columns: Tuple[str], rows: int) -> str:
+        raise NotImplementedError()
+
+    @staticmethod
+    def to_batch(writes: List[str], selects: List[Tuple[str, int]]) -> str:
+        raise NotImplementedError()
+
+    @staticmethod
+    def to_explain(sql: str) -> str:
+        raise NotImplementedError()
+
+    @staticmethod
+    def placeholder(name: str) -> str:
+        raise NotImplementedError()
+
+    @staticmethod
+    def rename_placeholders(sql: str, mapping: Dict[str, str]) -> str:
+        raise NotImplementedError()
+
     @staticmethod
     def to_partial_where(key: str, placeholder: str, is_list: bool = False, is_subquery: bool = False, is_none: bool = False) -> str:
         raise NotImplementedError()
     
+    @staticmethod
+    def to_seek(columns: List[str], placeholders: List[str], descending: List[bool]) -> str:
+        raise NotImplementedError()
+
     @staticmethod
     def where_and(first: str, second: str) -> str:
         raise NotImplementedError()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import List, Tuple, TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from modulo.db.table import Request
+
+
+STATEMENT_CACHE_SIZE = 2048
+
+
+def shape(request: Request) -> Tuple:
+    fragments = request.values()[0] if request._action in ('INSERT', 'UPDATE') else {}
+    return (
+        request._action,
+        str(request._table),
+        request._table.alias,
+        tuple(request._columns.items()),
+        tuple((join['type'], str(join['target']), join['target'].alias, tuple(join['on'].items())) for join in request._join),
+        str(request._where),
+        str(request._having),
+        tuple(request._group_by),
+        tuple(request._order_by or ()),
+        request._limit,
+        request._offset,
+        tuple(fragments.items())
+    )
+
+
+def seek_condition(columns: List[str], placeholders: List[str], descending: List[bool]) -> str:
+    if len(set(descending)) == 1:
+        operator = '<' if descending[0] else '>'
+        return f'({", ".join(columns)}) {operator} ({", ".join(placeholders)})'
+    clauses = []
+    for index, column in enumerate(columns):
+        operator = '<' if descending[index] else '>'
+        terms = [f'{columns[position]} = {placeholders[position]}' for position in range(index)]
+        terms.append(f'{column} {operator} {placeholders[index]}')
+        clauses.append(f'({" AND ".join(terms)})')
+    return ' OR '.join(clauses)
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def compile_shape(shape: Tuple) -> str:
+    action, table, alias, columns, joins, where, having, group_by, order_by, limit, offset, fragments = shape
+    if action == 'SELECT':
+        columns = [f'{column} AS {name}' for name, column in columns]
+        joins = [f'{join_type} JOIN {target} AS {target_alias} ON {" AND ".join(f"{target_alias}.{key} = {val}" for key, val in on)}' for join_type, target, target_alias, on in joins]
+        orders = [f'{order[1:] if order[0] in ["+", "-"] else order} {"DESC" if order[0] == "-" else "ASC"}' for order in order_by]
+        sql = f"SELECT {', '.join(columns)} FROM {table} AS {alias}"
+        if joins:
+            sql = f"{sql} {' '.join(joins)}"
+        if where:
+            sql = f'{sql} WHERE {where}'
+        if group_by:
+            sql = f'{sql} GROUP BY {", ".join(group_by)}'
+        if having:
+            sql = f'{sql} HAVING {having}'
+        if orders:
+            sql = f'{sql} ORDER BY {", ".join(orders)}'
+        if limit >= 0:
+            sql = f'{sql} LIMIT {limit}'
+        if offset > 0:
+            sql = f'{sql} OFFSET {offset}'
+        return sql
+    elif action == 'INSERT':
+        sql = f"INSERT INTO {table} ({', '.join(column for column, _ in fragments)}) VALUES ({', '.join(value for _, value in fragments)})"
+        return sql
+    elif action == 'UPDATE':
+        sql = f'UPDATE {table} AS {alias} SET {", ".join(f"{column} = {value}" for column, value in fragments)}'
+        if where:
+            sql = f'{sql} WHERE {where}'
+        return sql
+    elif action == 'DELETE':
+        sql = f'DELETE FROM {table} AS {alias}'
+        if where:
+            sql = f'{sql} WHERE {where}'
+        return sql
+    else:
+        raise TypeError(f"Unsupported action for request: {action}")
@@ -1,140 +1,358 @@
-from typing import Optional, Union, Dict, Tuple, Any, TYPE_CHECKING
+from __future__ import annotations
+import re
+from asyncio import AbstractEventLoop, get_running_loop, run_coroutine_threadsafe
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from hashlib import blake2b
+from json import dumps
+from typing import AsyncIterator, Optional, Union, Dict, List, Sequence, Tuple, Any, TYPE_CHECKING
 try:
     import aiopg
+    import psycopg2
+    from psycopg2.extensions import TRANSACTION_STATUS_IDLE, string_types
 except ImportError:
     raise ImportError("Postgres backend require aiopg library")
 from .abstract import Abstract
+from .compiler import STATEMENT_CACHE_SIZE, compile_shape, seek_condition, shape
 
 
 if TYPE_CHECKING:
+    from modulo.db.pool import Pool
     from modulo.db.table import Request
+    from modulo.db.transaction import Transaction
+
+
+COPY_WORKERS = 4
+_PLACEHOLDER = re.compile(r'%\((\w+)\)s')
+_PREPARE_TOKEN = re.compile(r'%\((\w+)\)s|%%')
+
+
+def _to_positional(sql: str) -> Tuple[str, List[str]]:
+    names: List[str] = []
+
+    def replace(match: re.Match) -> str:
+        name = match.group(1)
+        if name is None:
+            return '%'
+        if name not in names:
+            names.append(name)
+        return f'${names.index(name) + 1}'
+
+    return _PREPARE_TOKEN.sub(replace, sql), names
+
+
+def _array_literal(values: Sequence[Any]) -> str:
+    items = []
+    for value in values:
+        if value is None:
+            items.append('NULL')
+        elif isinstance(value, (list, tuple)):
+            items.append(_array_literal(value))
+        else:
+            items.append('"' + _copy_text(value).replace('\\', '\\\\').replace('"', '\\"') + '"')
+    return '{' + ','.join(items) + '}'
+
+
+def _copy_text(value: Any) -> str:
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return '\\x' + bytes(value).hex()
+    if isinstance(value, dict):
+        return dumps(value)
+    if isinstance(value, (list, tuple)):
+        return _array_literal(value)
+    return str(value)
+
+
+def _copy_value(value: Any) -> str:
+    if value is None:
+        return '\\N'
+    return _copy_text(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+_copy_executor = ThreadPoolExecutor(max_workers=COPY_WORKERS, thread_name_prefix='modulo-copy')
+
+
+class _CopySource():
+    def __init__(self: _CopySource, rows: AsyncIterator[Sequence[Any]], loop: AbstractEventLoop) -> None:
+        self._rows = rows
+        self._loop = loop
+        self._buffer = bytearray()
+        self._done = False
+
+    async def _next(self: _CopySource) -> Optional[Sequence[Any]]:
+        try:
+            return await self._rows.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    def read(self: _CopySource, size: int = 8192) -> bytes:
+        while len(self._buffer) < size and not self._done:
+            row = run_coroutine_threadsafe(self._next(), self._loop).result()
+            if row is None:
+                self._done = True
+            else:
+                self._buffer += ('\t'.join(_copy_value(value) for value in row) + '\n').encode('utf-8')
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
 
 
 class Postgres(Abstract):
+    max_parameters: int = 65535
+    supports_batch: bool = True
+
     def __init__(self: Postgres) -> None:
         self._connection: aiopg.Connection = None
         self._cursor: aiopg.Cursor = None
         self._started = False
+        self._implicit = False
         self._done = False
-    
-    async def open(self: Abstract, dsn: str) -> None:
+        self._server_cursor: Optional[str] = None
+        self._server_cursors = 0
+        self._prepared_statements = 0
+        self._statements: OrderedDict[str, Tuple[str, str]] = OrderedDict()
+
+    async def open(self: Postgres, dsn: str, prepared_statements: int = 0) -> None:
         self._connection = await aiopg.connect(dsn)
         self._cursor = await self._connection.cursor()
+        self._prepared_statements = prepared_statements
 
     async def transaction(self: Postgres) -> None:
         await self._cursor.execute('BEGIN;')
         self._started = True
+        self._implicit = False
         self._done = False
-    
+
     async def commit(self: Postgres) -> None:
         await self._cursor.execute('COMMIT;')
         self._started = False
         self._done = True
-    
+
     async def rollback(self: Postgres) -> None:
         await self._cursor.execute('ROLLBACK;')
         self._started = False
         self._done = False
-    
-    async def execute_query(self: Postgres, sql: str, params: Optional[Union[Tuple[Any], Dict[str, Any]]] = None) -> None:
+
+    async def complete(self: Postgres) -> None:
+        if self._started and self._implicit:
+            await self.commit()
+
+    async def reset(self: Postgres) -> None:
+        self._server_cursor = None
+        if self._connection.raw.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+            await self.rollback()
+        self._started = False
+
+    async def savepoint(self: Postgres, name: str) -> None:
+        await self._cursor.execute(f'SAVEPOINT {name};')
+
+    async def release_savepoint(self: Postgres, name: str) -> None:
+        await self._cursor.execute(f'RELEASE SAVEPOINT {name};')
+
+    async def rollback_to_savepoint(self: Postgres, name: str) -> None:
+        await self._cursor.execute(f'ROLLBACK TO SAVEPOINT {name};')
+
+    async def _prepare(self: Postgres, sql: str) -> str:
+        statement = self._statements.get(sql)
+        if statement is not None:
+            self._statements.move_to_end(sql)
+            return statement[1]
+        positional, names = _to_positional(sql)
+        name = f'modulo_{blake2b(sql.encode("utf-8"), digest_size=8).hexdigest()}'
+        await self._cursor.execute(f'PREPARE {name} AS {positional}')
+        statement = (name, f'EXECUTE {name} ({", ".join(self.placeholder(param) for param in names)})' if names else f'EXECUTE {name}')
+        self._statements[sql] = statement
+        while len(self._statements) > self._prepared_statements:
+            _, (evicted, _) = self._statements.popitem(last=False)
+            await self._cursor.execute(f'DEALLOCATE {evicted}')
+        return statement[1]
+
+    async def execute_query(self: Postgres, sql: str, params: Optional[Union[Tuple[Any], Dict[str, Any]]] = None, prepare: bool = True) -> None:
         if not self._started:
             await self.transaction()
+            self._implicit = True
+        if prepare and self._prepared_statements and params and isinstance(params, dict):
+            sql = await self._prepare(sql)
         await self._cursor.execute(sql, parameters=params)
-    
-    async def _check_connection_done(self: Postgres) -> None:
-        if not self._done:
-            if not self._started:
-                raise SyntaxError("Cannot get data / length without request")
-            else:
-                await self.commit()
-    
+
+    def _check_connection_done(self: Postgres) -> None:
+        if not self._done and not self._started:
+            raise SyntaxError("Cannot get data / length without request")
+
     async def fetch_all(self: Postgres) -> List[Tuple[Any]]:
         self._check_connection_done()
-        return await self._cursor.fetchall()
+        result = await self._cursor.fetchall()
+        await self.complete()
+        return result
 
     async def fetch_one(self: Postgres) -> Tuple[Any]:
         self._check_connection_done()
-        return await self._cursor.fetchone()
-    
+        result = await self._cursor.fetchone()
+        await self.complete()
+        return result
+
+    async def fetch_batch(self: Postgres) -> List[List[Tuple[Any]]]:
+        line = await self.fetch_one()
+        cursor = self._cursor.raw
+        casters = {**string_types, **self._connection.raw.string_types}
+        results = []
+        for index in range(0, len(line), 2):
+            types = [casters.get(int(oid)) for oid in line[index + 1]]
+            results.append([
+                tuple(value if value is None or caster is None else caster(value, cursor) for caster, value in zip(types, row))
+                for row in line[index]
+            ])
+        return results
+
     async def fetch_some(self: Postgres, cnt: int) -> List[Tuple[Any]]:
         self._check_connection_done()
+        if self._server_cursor is not None:
+            await self._cursor.execute(f'FETCH FORWARD {int(cnt)} FROM {self._server_cursor};')
+            return await self._cursor.fetchall()
         return await self._cursor.fetchmany(cnt)
-    
+
+    async def open_cursor(self: Postgres, sql: str, params: Optional[Union[Tuple[Any], Dict[str, Any]]] = None) -> None:
+        if not self._started:
+            await self.transaction()
+            self._implicit = True
+        self._server_cursors += 1
+        name = f'modulo_cursor_{self._server_cursors}'
+        await self._cursor.execute(f'DECLARE {name} NO SCROLL CURSOR FOR {sql}', parameters=params)
+        self._server_cursor = name
+
+    async def close_cursor(self: Postgres) -> None:
+        name, self._server_cursor = self._server_cursor, None
+        if name is None:
+            return
+        try:
+            await self._cursor.execute(f'CLOSE {name};')
+        except Exception:
+            if self._implicit:
+                await self.rollback()
+            raise
+        await self.complete()
+
     async def count(self: Postgres) -> int:
         self._check_connection_done()
-        return self._cursor.rowcount
-    
+        result = self._cursor.rowcount
+        await self.complete()
+        return result
+
     async def close(self: Postgres) -> None:
         if self._started and not self._done:
             await self.rollback()
+        self._statements.clear()
         self._cursor.close()
-        self._connection.close()
+        await self._connection.close()
+
+    @staticmethod
+    async def copy_from(pool: Pool, transaction: Optional[Transaction], table: str, columns: List[str], rows: AsyncIterator[Sequence[Any]]) -> int:
+        if transaction is not None:
+            raise TypeError("COPY runs on its own connection and cannot take part in a transaction, use insert_many with copy disabled")
+        dsn = pool._backend_opts['dsn']
+        loop = get_running_loop()
+        source = _CopySource(rows, loop)
+        sql = f'COPY {table} ({", ".join(columns)}) FROM STDIN'
+
+        def copy() -> int:
+            connection = psycopg2.connect(dsn)
+            try:
+                with connection:
+                    with connection.cursor() as cursor:
+                        cursor.copy_expert(sql, source, size=65536)
+                        return cursor.rowcount
+            finally:
+                connection.close()
+
+        return await loop.run_in_executor(_copy_executor, copy)
+
+    async def ping(self: Postgres) -> bool:
+        if self._connection is None or self._connection.closed:
+            return False
+        try:
+            await self._cursor.execute('SELECT 1')
+            await self._cursor.fetchone()
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def placeholder(name: str) -> str:
+        return f'%({name})s'
+
+    @staticmethod
+    def rename_placeholders(sql: str, mapping: Dict[str, str]) -> str:
+        return _PLACEHOLDER.sub(lambda match: f'%({mapping.get(match.group(1), match.group(1))})s', sql)
+
+    @staticmethod
+    @lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+    def to_insert(table: str, columns: Tuple[str], rows: int, returning: Optional[str] = None) -> str:
+        values = ', '.join(
+            f'({", ".join(Postgres.placeholder(f"r{row}_{index}") for index in range(len(columns)))})'
+            for row in range(rows)
+        )
+        sql = f'INSERT INTO {table} ({", ".join(columns)}) VALUES {values}'
+        if returning is not None:
+            sql = f'{sql} RETURNING {returning}'
+        return sql
+
+    @staticmethod
+    @lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+    def to_update_many(table: str, alias: str, primary: str, columns: Tuple[str], rows: int) -> str:
+        values = ', '.join(
+            f'({", ".join(Postgres.placeholder(f"u{row}_{index}") for index in range(len(columns) + 1))})'
+            for row in range(rows)
+        )
+        typed = f'SELECT {", ".join((primary,) + columns)} FROM {table} WHERE 1 = 0'
+        return (
+            f'UPDATE {table} AS {alias} SET {", ".join(f"{column} = modulo_values.{column}" for column in columns)} '
+            f'FROM ({typed} UNION ALL VALUES {values}) AS modulo_values '
+            f'WHERE {alias}.{primary} = modulo_values.{primary}'
+        )
+
+    @staticmethod
+    def to_batch(writes: List[str], selects: List[Tuple[str, int]]) -> str:
+        statements = list(writes)
+        if selects:
+            results = []
+            for index, (sql, width) in enumerate(selects):
+                columns = [f'c{position}' for position in range(width)]
+                alias = f'b{index}({", ".join(columns)})'
+                results.append(f"(SELECT coalesce(json_agg(json_build_array({', '.join(f'b{index}.{column}::text' for column in columns)})), '[]'::json) FROM ({sql}) AS {alias})")
+                results.append(f"(SELECT json_build_array({', '.join(f'pg_typeof(b{index}.{column})::oid' for column in columns)}) FROM (SELECT 1) AS modulo_row LEFT JOIN (SELECT * FROM ({sql}) AS modulo_empty LIMIT 0) AS {alias} ON true)")
+            statements.append(f'SELECT {", ".join(results)}')
+        return '; '.join(statements)
+
+    @staticmethod
+    def to_explain(sql: str) -> str:
+        return f'EXPLAIN (ANALYZE, BUFFERS) {sql}'
 
     @staticmethod
     def to_sql(request: Request) -> str:
-        if request._action == 'SELECT':
-            columns = [f'{column} AS {name}' for name, column in request._columns]
-            joins = [f'{j["type"]} JOIN {j["target"]} AS {id(j["target"])} ON {" AND ".join([str(id(j["target"])) + f".{key} = {val}" for key, val in j["on"].items()])}' for j in request._join]
-            orders = [f'{order[1:] if order[0] in ["+", "-"] else order} {"DESC" if order[0] == "-" else "ASC"}' for order in request._order_by]
-            sql = f"SELECT {', '.join(columns)} FROM {request._table} AS {id(request._table)} {' '.join(joins)}"
-            where = str(request._where)
-            if where:
-                sql = f'{sql} WHERE {where}'
-            if request._group_by:
-                sql = f'{sql} GROUP BY {", ".join(request._group_by)}'
-            if orders:
-                sql = f'{sql} ORDER BY {", ".join(orders)}'
-            if request._limit >= 0:
-                sql = f'{sql} LIMIT {request._limit}'
-            if request._offset > 0:
-                sql = f'{sql} OFFSET {request._offset}'
-            return sql
-        elif request._action == 'INSERT':
-            columns = [request._columns[key] for key in request._columns]
-            params = request._params
-            placeholders = [
-                f'%({id(request)}{col})s' if not isinstance(params[col], request)
-                else params[col].sql
-                for col in request._columns
-            ]
-            sql = f"INSERT INTO {request._table} ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
-            return sql
-        elif request._action == 'UPDATE':
-            params = request._params
-            updates = [
-                f"{col} = %({id(request)}{col})s" if not isinstance(params[col], Request)
-                else params[col].sql
-                for col in request._columns
-            ]
-            sql = f'UPDATE {request._table} AS {id(request._table)} SET {", ".join(updates)}'
-            where = str(request._where)
-            if where:
-                sql = f'{sql} WHERE {where}'
-            return sql
-        elif request._action == 'DELETE':
-            sql = f'DELETE FROM {request._table} AS {id(request._table}'
-            where = str(request._where)
-            if where:
-                sql = f'{sql} WHERE {where}'
-            return sql
-        else:
-            raise TypeError(f"Unsupported action for request: {request._action}")
+        return compile_shape(shape(request))
 
     @staticmethod
     def to_partial_where(key: str, placeholder: str, is_list: bool = False, is_subquery: bool = False, is_none: bool = False) -> str:
         if is_subquery:
             return f'{key} IN ({placeholder})'
         elif is_list:
-            return f'{key} IN (%({placeholder})s)'
+            return f'{key} = ANY(%({placeholder})s)'
         elif is_none:
             return f'{key} IS NULL'
         else:
             return f'{key} = %({placeholder})s'
 
+    @staticmethod
+    def to_seek(columns: List[str], placeholders: List[str], descending: List[bool]) -> str:
+        return seek_condition(columns, placeholders, descending)
+
     @staticmethod
     def where_and(first: str, second: str) -> str:
         return f'({first}) AND ({second})'
-    
+
     @staticmethod
     def where_or(first: str, second: str) -> str:
-        return f'({first} OR ({second})'
+        return f'({first}) OR ({second})'
@@ -0,0 +1,244 @@
+from __future__ import annotations
+import re
+import sqlite3
+from asyncio import get_running_loop
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from json import dumps
+from typing import AsyncIterator, Optional, Union, Dict, List, Sequence, Tuple, Any, TYPE_CHECKING
+from .abstract import Abstract
+from .compiler import STATEMENT_CACHE_SIZE, compile_shape, seek_condition, shape
+
+
+if TYPE_CHECKING:
+    from modulo.db.pool import Pool
+    from modulo.db.table import Request
+    from modulo.db.transaction import Transaction
+
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+    'cache_size': -64000,
+    'mmap_size': 268435456
+}
+COPY_BATCH_SIZE = 1000
+_PLACEHOLDER = re.compile(r'(?<![:\w]):(\w+)')
+
+
+class Sqlite(Abstract):
+    max_parameters: int = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+    def __init__(self: Sqlite) -> None:
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._cursor: Optional[sqlite3.Cursor] = None
+        self._started = False
+        self._implicit = False
+        self._done = False
+
+    async def _run(self: Sqlite, func: callable, *args: Any) -> Any:
+        return await get_running_loop().run_in_executor(self._executor, func, *args)
+
+    @staticmethod
+    def _connect(database: str, pragmas: Dict[str, Any], timeout: float, statement_cache: int) -> sqlite3.Connection:
+        connection = sqlite3.connect(database, timeout=timeout, isolation_level=None, cached_statements=statement_cache)
+        for name, value in pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    async def open(self: Sqlite, database: str, pragmas: Optional[Dict[str, Any]] = None, timeout: float = 5.0, statement_cache: int = 256) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='modulo-sqlite')
+        self._connection = await self._run(self._connect, database, {**DEFAULT_PRAGMAS, **(pragmas or {})}, timeout, statement_cache)
+
+    async def _execute(self: Sqlite, sql: str, params: Optional[Union[Tuple[Any], Dict[str, Any]]] = None) -> None:
+        if isinstance(params, dict):
+            params = {key: dumps(value) if isinstance(value, (list, tuple)) else value for key, value in params.items()}
+        self._cursor = await self._run(self._connection.execute, sql, params or ())
+
+    async def transaction(self: Sqlite) -> None:
+        await self._execute('BEGIN')
+        self._started = True
+        self._implicit = False
+        self._done = False
+
+    async def commit(self: Sqlite) -> None:
+        await self._execute('COMMIT')
+        self._started = False
+        self._done = True
+
+    async def rollback(self: Sqlite) -> None:
+        await self._execute('ROLLBACK')
+        self._started = False
+        self._done = False
+
+    async def complete(self: Sqlite) -> None:
+        if self._started and self._implicit:
+            await self.commit()
+
+    async def reset(self: Sqlite) -> None:
+        if self._connection.in_transaction:
+            await self.rollback()
+        self._started = False
+
+    async def savepoint(self: Sqlite, name: str) -> None:
+        await self._execute(f'SAVEPOINT {name}')
+
+    async def release_savepoint(self: Sqlite, name: str) -> None:
+        await self._execute(f'RELEASE SAVEPOINT {name}')
+
+    async def rollback_to_savepoint(self: Sqlite, name: str) -> None:
+        await self._execute(f'ROLLBACK TO SAVEPOINT {name}')
+
+    async def execute_query(self: Sqlite, sql: str, params: Optional[Union[Tuple[Any], Dict[str, Any]]] = None, prepare: bool = True) -> None:
+        if not self._started:
+            await self.transaction()
+            self._implicit = True
+        await self._execute(sql, params)
+
+    def _check_connection_done(self: Sqlite) -> None:
+        if not self._done and not self._started:
+            raise SyntaxError("Cannot get data / length without request")
+
+    async def fetch_all(self: Sqlite) -> List[Tuple[Any]]:
+        self._check_connection_done()
+        result = await self._run(self._cursor.fetchall)
+        await self.complete()
+        return result
+
+    async def fetch_one(self: Sqlite) -> Tuple[Any]:
+        self._check_connection_done()
+        result = await self._run(self._cursor.fetchone)
+        await self.complete()
+        return result
+
+    async def fetch_some(self: Sqlite, cnt: int) -> List[Tuple[Any]]:
+        self._check_connection_done()
+        return await self._run(self._cursor.fetchmany, cnt)
+
+    async def open_cursor(self: Sqlite, sql: str, params: Optional[Union[Tuple[Any], Dict[str, Any]]] = None) -> None:
+        await self.execute_query(sql, params)
+
+    async def close_cursor(self: Sqlite) -> None:
+        await self.complete()
+
+    async def count(self: Sqlite) -> int:
+        self._check_connection_done()
+        result = self._cursor.rowcount
+        await self.complete()
+        return result
+
+    async def close(self: Sqlite) -> None:
+        if self._started and not self._done:
+            await self.rollback()
+        await self._run(self._connection.close)
+        self._executor.shutdown(wait=False)
+
+    async def ping(self: Sqlite) -> bool:
+        try:
+            await self._run(self._connection.execute, 'SELECT 1')
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    async def copy_from(pool: Pool, transaction: Optional[Transaction], table: str, columns: List[str], rows: AsyncIterator[Sequence[Any]]) -> int:
+        if transaction is not None:
+            return await transaction.connection._copy(table, columns, rows)
+        connection = await pool.get()
+        try:
+            return await connection._copy(table, columns, rows)
+        finally:
+            await pool.release(connection)
+
+    async def _copy(self: Sqlite, table: str, columns: List[str], rows: AsyncIterator[Sequence[Any]]) -> int:
+        sql = f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?" for _ in columns)})'
+        count = 0
+        owned = not self._started
+        if owned:
+            await self.transaction()
+        try:
+            batch: List[Sequence[Any]] = []
+            async for row in rows:
+                batch.append(row)
+                if len(batch) >= COPY_BATCH_SIZE:
+                    await self._run(self._connection.executemany, sql, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                await self._run(self._connection.executemany, sql, batch)
+                count += len(batch)
+        except BaseException:
+            if owned:
+                await self.rollback()
+            raise
+        if owned:
+            await self.commit()
+        return count
+
+    @staticmethod
+    def placeholder(name: str) -> str:
+        return f':{name}'
+
+    @staticmethod
+    def rename_placeholders(sql: str, mapping: Dict[str, str]) -> str:
+        return _PLACEHOLDER.sub(lambda match: f':{mapping.get(match.group(1), match.group(1))}', sql)
+
+    @staticmethod
+    @lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+    def to_insert(table: str, columns: Tuple[str], rows: int, returning: Optional[str] = None) -> str:
+        values = ', '.join(
+            f'({", ".join(Sqlite.placeholder(f"r{row}_{index}") for index in range(len(columns)))})'
+            for row in range(rows)
+        )
+        sql = f'INSERT INTO {table} ({", ".join(columns)}) VALUES {values}'
+        if returning is not None:
+            sql = f'{sql} RETURNING {returning}'
+        return sql
+
+    @staticmethod
+    @lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+    def to_update_many(table: str, alias: str, primary: str, columns: Tuple[str], rows: int) -> str:
+        values = ', '.join(
+            f'({", ".join(Sqlite.placeholder(f"u{row}_{index}") for index in range(len(columns) + 1))})'
+            for row in range(rows)
+        )
+        typed = f'SELECT {", ".join((primary,) + columns)} FROM {table} WHERE 1 = 0'
+        return (
+            f'UPDATE {table} AS {alias} SET {", ".join(f"{column} = modulo_values.{column}" for column in columns)} '
+            f'FROM ({typed} UNION ALL VALUES {values}) AS modulo_values '
+            f'WHERE {alias}.{primary} = modulo_values.{primary}'
+        )
+
+    @staticmethod
+    def to_explain(sql: str) -> str:
+        return f'EXPLAIN QUERY PLAN {sql}'
+
+    @staticmethod
+    def to_sql(request: Request) -> str:
+        return compile_shape(shape(request))
+
+    @staticmethod
+    def to_partial_where(key: str, placeholder: str, is_list: bool = False, is_subquery: bool = False, is_none: bool = False) -> str:
+        if is_subquery:
+            return f'{key} IN ({placeholder})'
+        elif is_list:
+            return f'{key} IN (SELECT value FROM json_each(:{placeholder}))'
+        elif is_none:
+            return f'{key} IS NULL'
+        else:
+            return f'{key} = :{placeholder}'
+
+    @staticmethod
+    def to_seek(columns: List[str], placeholders: List[str], descending: List[bool]) -> str:
+        return seek_condition(columns, placeholders, descending)
+
+    @staticmethod
+    def where_and(first: str, second: str) -> str:
+        return f'({first}) AND ({second})'
+
+    @staticmethod
+    def where_or(first: str, second: str) -> str:
+        return f'({first}) OR ({second})'
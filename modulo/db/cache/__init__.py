@@ -0,0 +1,3 @@
+from .abstract import Abstract
+from .memory import Memory
+from .query_cache import QueryCache
@@ -0,0 +1,16 @@
+from __future__ import annotations
+from typing import Any, List, Optional, Set, Tuple
+
+
+class Abstract():
+    async def get(self: Abstract, key: str) -> Optional[List[Tuple[Any]]]:
+        raise NotImplementedError()
+
+    async def set(self: Abstract, key: str, rows: List[Tuple[Any]], ttl: float, tags: Set[str]) -> None:
+        raise NotImplementedError()
+
+    async def invalidate(self: Abstract, tags: Set[str]) -> None:
+        raise NotImplementedError()
+
+    async def clear(self: Abstract) -> None:
+        raise NotImplementedError()
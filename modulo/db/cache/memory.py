@@ -0,0 +1,57 @@
+from __future__ import annotations
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Dict, List, Optional, Set, Tuple
+from .abstract import Abstract
+
+
+class Memory(Abstract):
+    def __init__(self: Memory, max_entries: int = 10000, max_rows: int = 100000) -> None:
+        self._max_entries = max_entries
+        self._max_rows = max_rows
+        self._rows = 0
+        self._entries: OrderedDict[str, Tuple[List[Tuple[Any]], float, Set[str]]] = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+
+    async def get(self: Memory, key: str) -> Optional[List[Tuple[Any]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    async def set(self: Memory, key: str, rows: List[Tuple[Any]], ttl: float, tags: Set[str]) -> None:
+        if len(rows) > self._max_rows:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (rows, monotonic() + ttl, tags)
+        self._rows += len(rows)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self._max_entries or self._rows > self._max_rows:
+            self._remove(next(iter(self._entries)))
+
+    async def invalidate(self: Memory, tags: Set[str]) -> None:
+        for tag in tags:
+            for key in self._tags.pop(tag, ()):
+                if key in self._entries:
+                    self._remove(key)
+
+    async def clear(self: Memory) -> None:
+        self._entries.clear()
+        self._tags.clear()
+        self._rows = 0
+
+    def _remove(self: Memory, key: str) -> None:
+        rows, _, tags = self._entries.pop(key)
+        self._rows -= len(rows)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
@@ -0,0 +1,51 @@
+from __future__ import annotations
+from hashlib import blake2b
+from typing import Any, Dict, List, Optional, Set, Tuple
+from modulo.conf import settings
+from .abstract import Abstract
+from .memory import Memory
+
+
+class QueryCache():
+    _instance = None
+
+    @staticmethod
+    def get() -> QueryCache:
+        if QueryCache._instance is None:
+            backend: type = settings.QUERY_CACHE_BACKEND or Memory
+            QueryCache._instance = QueryCache(backend(**settings.QUERY_CACHE_OPTIONS))
+        return QueryCache._instance
+
+    def __init__(self: QueryCache, store: Abstract) -> None:
+        self._store = store
+        self._generations: Dict[str, int] = {}
+
+    @staticmethod
+    def key(database: str, method: str, sql: str, params: Dict[str, Any]) -> str:
+        raw = f'{database}\0{method}\0{sql}\0{sorted(params.items())!r}'
+        return blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+    @staticmethod
+    async def notify_write(tables: Set[str]) -> None:
+        if QueryCache._instance is None and settings.QUERY_CACHE_BACKEND is None:
+            return
+        await QueryCache.get().invalidate(tables)
+
+    async def lookup(self: QueryCache, key: str) -> Optional[List[Tuple[Any]]]:
+        return await self._store.get(key)
+
+    def generations(self: QueryCache, tags: Set[str]) -> Dict[str, int]:
+        return {tag: self._generations.get(tag, 0) for tag in tags}
+
+    async def store(self: QueryCache, key: str, rows: List[Tuple[Any]], ttl: float, tags: Set[str], generations: Optional[Dict[str, int]] = None) -> None:
+        if generations is not None and self.generations(tags) != generations:
+            return
+        await self._store.set(key, rows, ttl, tags)
+
+    async def invalidate(self: QueryCache, tables: Set[str]) -> None:
+        for table in tables:
+            self._generations[table] = self._generations.get(table, 0) + 1
+        await self._store.invalidate(tables)
+
+    async def clear(self: QueryCache) -> None:
+        await self._store.clear()
@@ -0,0 +1,2 @@
+class PoolTimeoutException(Exception):
+    pass
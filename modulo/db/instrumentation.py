@@ -0,0 +1,112 @@
+from __future__ import annotations
+import re
+from asyncio import Task, create_task
+from functools import lru_cache
+from logging import getLogger
+from random import random
+from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+from modulo.conf import settings
+from modulo.events import event_handler
+from .replica import database_name
+from .transaction import Transaction
+
+
+if TYPE_CHECKING:
+    from .backends import Abstract
+    from .pool import Pool
+    from .table import Request
+
+
+QUERY_EVENT = 'db.query'
+SLOW_QUERY_EVENT = 'db.slow_query'
+
+logger = getLogger('modulo.db')
+_NORMALIZE = re.compile(r"%\(\w+\)s|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r'\s+')
+_tasks: Set[Task] = set()
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql: str) -> str:
+    return _SPACES.sub(' ', _NORMALIZE.sub('?', sql)).strip()
+
+
+class QueryStats():
+    __slots__ = ('database', 'table', 'action', 'sql', 'params', 'rows', 'pool_wait', 'execute_time', 'fetch_time', 'error', 'explain')
+
+    def __init__(self: QueryStats, database: str, table: str, action: str, sql: str, params: Dict[str, Any], rows: int, pool_wait: float, execute_time: float, fetch_time: float, error: Optional[BaseException] = None) -> None:
+        self.database = database
+        self.table = table
+        self.action = action
+        self.sql = sql
+        self.params = params
+        self.rows = rows
+        self.pool_wait = pool_wait
+        self.execute_time = execute_time
+        self.fetch_time = fetch_time
+        self.error = error
+        self.explain: Optional[List[str]] = None
+
+    @property
+    def fingerprint(self: QueryStats) -> str:
+        return fingerprint(self.sql)
+
+    @property
+    def duration(self: QueryStats) -> float:
+        return self.execute_time + self.fetch_time
+
+
+def active() -> bool:
+    return bool(settings.DATABASE_SLOW_QUERY_THRESHOLD) or QUERY_EVENT in event_handler or SLOW_QUERY_EVENT in event_handler
+
+
+async def record(request: Request, connection: Abstract, sql: str, params: Dict[str, Any], rows: int, pool_wait: float, execute_time: float, fetch_time: float, error: Optional[BaseException] = None) -> None:
+    stats = QueryStats(
+        database_name(connection.pool),
+        str(request._table),
+        request._action,
+        sql,
+        params,
+        rows,
+        pool_wait,
+        execute_time,
+        fetch_time,
+        error
+    )
+    await event_handler.trigger(QUERY_EVENT, {'query': stats})
+    threshold = settings.DATABASE_SLOW_QUERY_THRESHOLD
+    if not threshold or stats.duration < threshold:
+        return
+    explain = error is None and request._action == 'SELECT' and Transaction.current(request._table._databases['write']) is None
+    if explain and random() < settings.DATABASE_EXPLAIN_SAMPLE_RATE:
+        task = create_task(_explain(connection.pool, stats))
+        _tasks.add(task)
+        task.add_done_callback(_tasks.discard)
+    else:
+        await _slow(stats)
+
+
+async def _explain(pool: Pool, stats: QueryStats) -> None:
+    try:
+        backend = await pool.get()
+        try:
+            await backend.execute_query(pool.get_backend().to_explain(stats.sql), stats.params, prepare=False)
+            stats.explain = [str(line[-1]) for line in await backend.fetch_all()]
+        finally:
+            await pool.release(backend)
+    except Exception:
+        logger.exception('Could not capture the plan of a slow query')
+    await _slow(stats)
+
+
+async def _slow(stats: QueryStats) -> None:
+    logger.warning(
+        'Slow query on %s (%.1f ms, %d rows, %.1f ms pool wait): %s%s',
+        stats.database,
+        stats.duration * 1000,
+        stats.rows,
+        stats.pool_wait * 1000,
+        stats.sql,
+        ''.join(f'\n    {line}' for line in stats.explain or [])
+    )
+    await event_handler.trigger(SLOW_QUERY_EVENT, {'query': stats})
@@ -0,0 +1,120 @@
+from __future__ import annotations
+from asyncio import Future, create_task, gather, get_running_loop, shield
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple, TYPE_CHECKING
+from .transaction import Transaction
+
+
+if TYPE_CHECKING:
+    from .table import Result, Table
+
+
+_loaders: ContextVar[Optional[Dict[Tuple[Hashable, ...], Loader]]] = ContextVar('modulo_db_loaders', default=None)
+_unscoped: Dict[Tuple[Hashable, ...], Loader] = {}
+
+
+class Loader():
+    def __init__(self: Loader, table: Table, column: str, key: Tuple[Hashable, ...], memoize: bool = True) -> None:
+        self._table = table
+        self._key = key
+        self._column = column
+        self._transaction = Transaction.current(table._databases['write'])
+        self._memo: Optional[Dict[Any, Optional[Result]]] = {} if memoize else None
+        self._pending: Dict[Any, Future] = {}
+        self._scheduled = False
+
+    @staticmethod
+    def get(table: Table, column: str) -> Loader:
+        key = (type(table), table.alias, column, Transaction.current(table._databases['write']))
+        scope = _loaders.get()
+        if scope is None:
+            if key not in _unscoped:
+                _unscoped[key] = Loader(table, column, key, memoize=False)
+            return _unscoped[key]
+        if key not in scope:
+            scope[key] = Loader(table, column, key)
+        return scope[key]
+
+    async def load(self: Loader, value: Any) -> Optional[Result]:
+        memo = self._memo
+        if memo is not None and value in memo:
+            return memo[value]
+        future = self._pending.get(value, None)
+        if future is None:
+            loop = get_running_loop()
+            future = loop.create_future()
+            self._pending[value] = future
+            if not self._scheduled:
+                self._scheduled = True
+                loop.call_soon(self._schedule)
+        return await shield(future)
+
+    async def load_many(self: Loader, values: Iterable[Any]) -> List[Optional[Result]]:
+        return list(await gather(*[self.load(value) for value in values]))
+
+    def clear(self: Loader, value: Any = None) -> None:
+        if self._memo is None:
+            return
+        if value is None:
+            self._memo.clear()
+        else:
+            self._memo.pop(value, None)
+
+    def _schedule(self: Loader) -> None:
+        create_task(self._dispatch())
+
+    async def _dispatch(self: Loader) -> None:
+        pending = self._pending
+        self._pending = {}
+        self._scheduled = False
+        if self._memo is None:
+            _unscoped.pop(self._key, None)
+        try:
+            if self._transaction is None:
+                rows = await self._select(pending)
+            else:
+                async with self._transaction.lock:
+                    rows = await self._select(pending)
+        except Exception as error:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            return
+        except BaseException:
+            for future in pending.values():
+                future.cancel()
+            raise
+        found = {getattr(row, self._column): row for row in rows}
+        memo = self._memo
+        for value, future in pending.items():
+            result = found.get(value, None)
+            if memo is not None:
+                memo[value] = result
+            if not future.done():
+                future.set_result(result)
+
+    async def _select(self: Loader, values: Iterable[Any]) -> List[Result]:
+        return await self._table.select().where({self._column: list(values)}).all()
+
+
+class LoaderScope():
+    def __init__(self: LoaderScope) -> None:
+        self._token: Optional[Token] = None
+
+    def __enter__(self: LoaderScope) -> LoaderScope:
+        self._token = _loaders.set({})
+        return self
+
+    def __exit__(self: LoaderScope, exc_type: Optional[type], exc: Optional[BaseException], traceback: object) -> bool:
+        _loaders.reset(self._token)
+        return False
+
+    async def __aenter__(self: LoaderScope) -> LoaderScope:
+        return self.__enter__()
+
+    async def __aexit__(self: LoaderScope, exc_type: Optional[type], exc: Optional[BaseException], traceback: object) -> bool:
+        return self.__exit__(exc_type, exc, traceback)
+
+
+def loaders() -> LoaderScope:
+    return LoaderScope()
@@ -1,7 +1,16 @@
-from typing import Dict, Any, List, Awaitable
-from time import time
-from asyncio import Queue, QueueEmpty
+from __future__ import annotations
+from asyncio import CancelledError, Future, Task, TimeoutError, create_task, get_running_loop, sleep, wait_for
+from bisect import bisect_left
+from collections import deque
+from time import monotonic
+from typing import Any, Deque, Dict, List, Optional
+from modulo.conf import settings
+from modulo.events import handle
 from .backends import Abstract
+from .exceptions import PoolTimeoutException
+
+
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float('inf'))
 
 
 class Pool():
@@ -9,31 +18,211 @@ class Pool():
         backend_opts: Dict[str, Any] = options.get('backend', {})
         self._backend_opts: Dict[str, Any] = backend_opts.get('options', {})
         self._backend: type = backend_opts.get('type', Abstract)
-        self._lifetime: int = options.get('lifetime', 0)
+        self._lifetime: float = options.get('lifetime', 0)
         self._size: int = options.get('pool_size', 10)
+        self._min_size: int = min(options.get('min_size', 0), self._size)
+        self._acquire_timeout: float = options.get('acquire_timeout', 30)
+        self._idle_timeout: float = options.get('idle_timeout', 600)
+        self._reap_interval: float = options.get('reap_interval', 10)
+        self._pre_ping: Optional[float] = options.get('pre_ping', 1)
         self._cnt = 0
-        self._queue = Queue()
-    
-    async def get(self: Pool) -> Abstract:
+        self._in_use = 0
+        self._idle: Deque[Abstract] = deque()
+        self._waiters: Deque[Future] = deque()
+        self._reaper: Optional[Task] = None
+        self._wait_histogram: List[int] = [0] * len(WAIT_BUCKETS)
+        self._timeouts = 0
+        self._ejected_until = 0.0
+
+    async def start(self: Pool) -> None:
+        if self._reaper is None:
+            self._reaper = create_task(self._reap())
+        await self._fill()
+
+    async def close(self: Pool) -> None:
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        while self._idle:
+            await self._discard(self._idle.popleft())
+
+    async def _open(self: Pool) -> Abstract:
+        self._cnt += 1
+        try:
+            item: Abstract = self._backend()
+            await item.open(**self._backend_opts)
+        except BaseException:
+            self._cnt -= 1
+            self._notify(None)
+            raise
+        item.born = monotonic()
+        item.released = item.born
+        item.pool = self
+        return item
+
+    async def _discard(self: Pool, item: Abstract) -> None:
+        self._cnt -= 1
         try:
-            item = self._queue.get_nowait()
-        except QueueEmpty:
-            if self._cnt < self._size:
-                item: Abstract = self._backend(**self._backend_opts)
-                await item.open()
-                item.born = time()
-                self._cnt += 1
+            await item.close()
+        except Exception:
+            pass
+        self._notify(None)
+
+    async def _fill(self: Pool) -> None:
+        while self._cnt < self._min_size:
+            self._push(await self._open())
+
+    def _expired(self: Pool, item: Abstract, now: float) -> bool:
+        return bool(self._lifetime) and item.born + self._lifetime <= now
+
+    def _notify(self: Pool, item: Optional[Abstract]) -> bool:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(item)
+                return True
+        return False
+
+    def _push(self: Pool, item: Abstract) -> None:
+        if not self._notify(item):
+            self._idle.append(item)
+
+    async def _checkout(self: Pool, item: Abstract) -> bool:
+        now = monotonic()
+        if self._expired(item, now):
+            await self._discard(item)
+            return False
+        if self._pre_ping is not None and now - item.released >= self._pre_ping and not await item.ping():
+            await self._discard(item)
+            return False
+        return True
+
+    async def get(self: Pool) -> Abstract:
+        if self._reaper is None:
+            await self.start()
+        start = monotonic()
+        while True:
+            if self._idle:
+                item = self._idle.pop()
+                if not await self._checkout(item):
+                    continue
+            elif self._cnt < self._size:
+                item = await self._open()
             else:
-                item = await self._queue.get()
+                item = await self._wait(start)
+                if item is None or not await self._checkout(item):
+                    continue
+            break
+        self._in_use += 1
+        waited = monotonic() - start
+        self._wait_histogram[bisect_left(WAIT_BUCKETS, waited)] += 1
         return item
-    
+
+    async def _wait(self: Pool, start: float) -> Optional[Abstract]:
+        waiter = get_running_loop().create_future()
+        self._waiters.append(waiter)
+        timeout = None
+        if self._acquire_timeout:
+            timeout = self._acquire_timeout - (monotonic() - start)
+        try:
+            return await wait_for(waiter, timeout)
+        except TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                return waiter.result()
+            self._timeouts += 1
+            raise PoolTimeoutException(f'No database connection available after {self._acquire_timeout}s ({self._in_use} in use, pool size {self._size})') from None
+        except CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                item = waiter.result()
+                if item is not None:
+                    self._push(item)
+                else:
+                    self._notify(None)
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
     async def release(self: Pool, item: Abstract) -> None:
-        if item.born + self._lifetime <= time():
-            await item.close()
-            self._cnt -= 1
-        else:
-            self._queue.put_nowait(item)
-        return result
+        self._in_use -= 1
+        now = monotonic()
+        if self._expired(item, now) or not await self._reset(item):
+            await self._discard(item)
+            return
+        item.released = now
+        self._push(item)
+
+    @staticmethod
+    async def _reset(item: Abstract) -> bool:
+        try:
+            await item.reset()
+        except Exception:
+            return False
+        return True
+
+    async def _reap(self: Pool) -> None:
+        try:
+            while True:
+                await sleep(self._reap_interval)
+                now = monotonic()
+                removable = self._cnt - self._min_size
+                victims: List[Abstract] = []
+                for item in self._idle:
+                    if self._expired(item, now):
+                        victims.append(item)
+                    elif self._idle_timeout and item.released + self._idle_timeout <= now and len(victims) < removable:
+                        victims.append(item)
+                for item in victims:
+                    self._idle.remove(item)
+                for item in victims:
+                    await self._discard(item)
+                try:
+                    await self._fill()
+                except Exception:
+                    pass
+        except CancelledError:
+            pass
+
+    @property
+    def max_size(self: Pool) -> int:
+        return self._size
+
+    @property
+    def in_flight(self: Pool) -> int:
+        return self._in_use + len(self._waiters)
+
+    @property
+    def available(self: Pool) -> bool:
+        return self._ejected_until <= monotonic()
+
+    def eject(self: Pool, duration: float) -> None:
+        self._ejected_until = monotonic() + duration
+
+    @property
+    def stats(self: Pool) -> Dict[str, Any]:
+        return {
+            'size': self._cnt,
+            'max_size': self._size,
+            'in_use': self._in_use,
+            'idle': len(self._idle),
+            'waiters': sum(1 for waiter in self._waiters if not waiter.done()),
+            'timeouts': self._timeouts,
+            'wait_time': dict(zip(WAIT_BUCKETS, self._wait_histogram))
+        }
 
     def get_backend(self: Pool) -> type:
         return self._backend
+
+
+@handle('server.startup')
+async def start_pools() -> bool:
+    for pool in settings.DATABASES.values():
+        await pool.start()
+    return True
+
+
+@handle('server.shutdown')
+async def close_pools() -> bool:
+    for pool in settings.DATABASES.values():
+        await pool.close()
+    return True
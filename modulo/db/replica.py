@@ -0,0 +1,38 @@
+from __future__ import annotations
+from contextvars import ContextVar
+from time import monotonic
+from typing import Dict, List, TYPE_CHECKING
+from modulo.conf import settings
+
+
+if TYPE_CHECKING:
+    from .pool import Pool
+
+
+_writes: ContextVar[Dict[str, float]] = ContextVar('modulo_db_writes', default={})
+
+
+def record_write(database: str) -> None:
+    if settings.DATABASE_STICKINESS:
+        _writes.set({**_writes.get(), database: monotonic()})
+
+
+def recently_wrote(database: str) -> bool:
+    window = settings.DATABASE_STICKINESS
+    if not window:
+        return False
+    written = _writes.get().get(database, None)
+    return written is not None and monotonic() - written < window
+
+
+def replicas(names: List[str]) -> List[Pool]:
+    pools: List[Pool] = [settings.DATABASES[name] for name in names]
+    available = [pool for pool in pools if pool.available]
+    return sorted(available, key=lambda pool: pool.in_flight)
+
+
+def database_name(pool: Pool) -> str:
+    for name, candidate in settings.DATABASES.items():
+        if candidate is pool:
+            return name
+    return ''
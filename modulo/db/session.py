@@ -0,0 +1,93 @@
+from __future__ import annotations
+from contextvars import ContextVar, Token
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from .replica import record_write
+from .transaction import Transaction
+
+
+if TYPE_CHECKING:
+    from .table import Result, Table
+
+
+_sessions: ContextVar[Optional[Session]] = ContextVar('modulo_db_session', default=None)
+
+
+class Session():
+    def __init__(self: Session) -> None:
+        self._dirty: Dict[int, Result] = {}
+        self._deleted: Dict[int, Result] = {}
+        self._token: Optional[Token] = None
+
+    @staticmethod
+    def current() -> Optional[Session]:
+        return _sessions.get()
+
+    def add(self: Session, result: Result) -> None:
+        result._primary_value('updated')
+        if id(result) not in self._deleted:
+            self._dirty[id(result)] = result
+
+    def remove(self: Session, result: Result) -> None:
+        result._primary_value('deleted')
+        self._dirty.pop(id(result), None)
+        self._deleted[id(result)] = result
+
+    @property
+    def pending(self: Session) -> int:
+        return len(self._dirty) + len(self._deleted)
+
+    async def flush(self: Session) -> None:
+        updates: Dict[str, Dict[Tuple[Table, Tuple[str, ...]], List[Result]]] = {}
+        deletes: Dict[str, Dict[Table, List[Result]]] = {}
+        for key, result in list(self._dirty.items()):
+            if result._changes:
+                table = result._table
+                updates.setdefault(table._databases['write'], {}).setdefault((table, tuple(sorted(result._changes))), []).append(result)
+            else:
+                del self._dirty[key]
+        for result in self._deleted.values():
+            table = result._table
+            deletes.setdefault(table._databases['write'], {}).setdefault(table, []).append(result)
+        for database in {**updates, **deletes}:
+            async with Transaction(database) as transaction:
+                for (table, columns), results in updates.get(database, {}).items():
+                    await self._update(transaction, table, columns, results)
+                for table, results in deletes.get(database, {}).items():
+                    await table.delete().where({table.primary: [result._primary_value('deleted') for result in results]}).execute()
+            record_write(database)
+            for results in updates.get(database, {}).values():
+                for result in results:
+                    result._commit_changes()
+                    del self._dirty[id(result)]
+            for results in deletes.get(database, {}).values():
+                for result in results:
+                    del self._deleted[id(result)]
+
+    @staticmethod
+    async def _update(transaction: Transaction, table: Table, columns: Tuple[str, ...], results: List[Result]) -> None:
+        backend_type = table.get_backend('write')
+        batch_size = max(1, backend_type.max_parameters // (len(columns) + 1))
+        for start in range(0, len(results), batch_size):
+            batch = results[start:start + batch_size]
+            sql = backend_type.to_update_many(str(table), table.alias, table.primary, columns, len(batch))
+            params = {}
+            for row, result in enumerate(batch):
+                params[f'u{row}_0'] = result._primary_value('updated')
+                for index, column in enumerate(columns):
+                    params[f'u{row}_{index + 1}'] = result._changes[column]
+            await transaction.connection.execute_query(sql, params)
+        await table._written(transaction.database)
+
+    async def __aenter__(self: Session) -> Session:
+        self._token = _sessions.set(self)
+        return self
+
+    async def __aexit__(self: Session, exc_type: Optional[type], exc: Optional[BaseException], traceback: object) -> bool:
+        _sessions.reset(self._token)
+        if exc_type is None:
+            await self.flush()
+        return False
+
+
+def session() -> Session:
+    return Session()
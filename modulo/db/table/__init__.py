@@ -2,3 +2,5 @@ from .request import Request
 from .table import Table
 from .result import Result
 from .where import Where
+from .concurrent import batch, gather
+from .page import Page
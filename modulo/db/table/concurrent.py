@@ -0,0 +1,93 @@
+from __future__ import annotations
+from asyncio import Semaphore, gather as gather_tasks
+from typing import Any, Dict, List, Optional, Tuple
+from modulo.db.cache import QueryCache
+from modulo.db.replica import record_write
+from modulo.db.transaction import Transaction
+from .request import Request
+from .result import Result
+
+
+async def _run(request: Request) -> Any:
+    if request._action == 'SELECT':
+        return await request.all()
+    return await request.execute()
+
+
+async def gather(*requests: Request, limit: Optional[int] = None) -> List[Any]:
+    if not requests:
+        return []
+    for request in requests:
+        if Transaction.current(request._table._databases['write']) is not None:
+            return [await _run(request) for request in requests]
+    if limit is None:
+        limit = min(request._table._get_pool(request._mode).max_size for request in requests)
+    semaphore = Semaphore(max(1, limit))
+
+    async def run(request: Request) -> Any:
+        async with semaphore:
+            return await _run(request)
+
+    return await gather_tasks(*(run(request) for request in requests))
+
+
+async def batch(*requests: Request) -> List[Optional[List[Result]]]:
+    if not requests:
+        return []
+    writing = any(request._action != 'SELECT' for request in requests)
+    mode = 'write' if writing else 'read'
+    table = requests[0]._table
+    database = table._databases[mode]
+    reading = False
+    for request in requests:
+        if request._table._databases[mode] != database:
+            raise TypeError("Batched requests must all run on the same database")
+        if request._action == 'SELECT':
+            reading = True
+        elif reading:
+            raise TypeError("Batched writes must all come before the batched SELECTs")
+    backend_type = table.get_backend(mode)
+    if not backend_type.supports_batch:
+        if not writing:
+            return [await _run(request) for request in requests]
+        async with Transaction(database):
+            return [await _run(request) for request in requests]
+    writes: List[str] = []
+    selects: List[Tuple[str, int]] = []
+    params: Dict[str, Any] = {}
+    for index, request in enumerate(requests):
+        request_params = request.params
+        mapping = {name: f'b{index}_{name}' for name in request_params}
+        for name in request_params:
+            params[mapping[name]] = request_params[name]
+        sql = backend_type.rename_placeholders(request.sql, mapping)
+        if request._action == 'SELECT':
+            selects.append((sql, len(request._columns)))
+        else:
+            writes.append(sql)
+    connection = await table.database(mode)
+    try:
+        await connection.execute_query(backend_type.to_batch(writes, selects), params, prepare=False)
+        if selects:
+            data = await connection.fetch_batch()
+        else:
+            await connection.complete()
+    finally:
+        await table.release(mode, connection)
+    result: List[Optional[List[Result]]] = []
+    position = 0
+    for request in requests:
+        if request._action != 'SELECT':
+            result.append(None)
+            continue
+        columns = request._index()
+        result.append([Result(request._table, line, columns) for line in data[position]])
+        position += 1
+    if writing:
+        record_write(database)
+        tables = {str(request._table) for request in requests if request._action != 'SELECT'}
+        current = Transaction.current(database)
+        if current is not None:
+            current.written |= tables
+        await QueryCache.notify_write(tables)
+    return result
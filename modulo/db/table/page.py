@@ -0,0 +1,47 @@
+from __future__ import annotations
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import date, datetime, time
+from decimal import Decimal
+from json import dumps, loads
+from typing import Any, List, Optional
+from uuid import UUID
+from .result import Result
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    raise TypeError(f'Cannot encode {type(value)} in a pagination cursor')
+
+
+def encode_cursor(columns: List[str], values: List[Any]) -> str:
+    payload = dumps([columns, values], separators=(',', ':'), default=_encode_value)
+    return urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, columns: List[str]) -> List[Any]:
+    try:
+        encoded_columns, values = loads(urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (BinasciiError, ValueError, TypeError):
+        raise ValueError('Invalid pagination cursor') from None
+    if encoded_columns != columns or not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError('Pagination cursor does not match the requested ordering')
+    return values
+
+
+class Page():
+    __slots__ = ('rows', 'next', 'prev')
+
+    def __init__(self: Page, rows: List[Result], next: Optional[str] = None, prev: Optional[str] = None) -> None:
+        self.rows = rows
+        self.next = next
+        self.prev = prev
+
+    def __iter__(self: Page):
+        return iter(self.rows)
+
+    def __len__(self: Page) -> int:
+        return len(self.rows)
@@ -1,5 +1,18 @@
-from typing import List, Dict, Union, Optional, TYPE_CHECKING, Any
-from .result import Result, Line
+from __future__ import annotations
+from copy import copy
+from time import perf_counter
+from typing import AsyncIterator, List, Dict, Set, Tuple, Union, Optional, TYPE_CHECKING, Any
+try:
+    import numpy
+except ImportError:
+    numpy = None
+from modulo.conf import settings
+from modulo.db import instrumentation
+from modulo.db.cache import QueryCache
+from modulo.db.replica import record_write
+from modulo.db.transaction import Transaction
+from .page import Page, decode_cursor, encode_cursor
+from .result import Result
 from .where import Where
 
 
@@ -8,9 +21,9 @@ if TYPE_CHECKING:
 
 
 class Request():
-    def __init__(self: Request, table: Table, action: str, params: Dict[str, Any]) -> None:
+    def __init__(self: Request, table: Table, action: str, params: Optional[Dict[str, Any]] = None) -> None:
         self._count_only = False
-        self._columns = {column: column for column in table.columns}
+        self._columns = {column: column for column in table._columns}
         self._table: Table = table
         self._join: List[Dict[str, str]] = []
         self._action = action
@@ -20,15 +33,16 @@ class Request():
         self._group_by: List[str] = []
         self._mode = 'read' if action == 'SELECT' else 'write'
         self._backend_type = self._table.get_backend(self._mode)
-        self._where: Where = Where(self._backend_type)
-        self._having: Where = Where(self._backend_type)
-        self._params = params
+        self._where: Where = Where(self._backend_type, 'w')
+        self._having: Where = Where(self._backend_type, 'h')
+        self._params = params or {}
+        self._cache_ttl: Optional[float] = None
     
     def columns(self: Request, columns: Union[str, List[str], Dict[str, str]]) -> Request:
         if isinstance(columns, str):
             columns = {columns: columns}
         elif isinstance(columns, list):
-            columns = [column: column for column in columns]
+            columns = {column: column for column in columns}
         self._columns = columns
         return self
 
@@ -76,6 +90,7 @@ class Request():
 
     def offset(self: Request, cnt: int) -> Request:
         self._offset = cnt
+        return self
     
     def order_by(self: Request, by: Union[str, List[str]]) -> Request:
         if not isinstance(by, list):
@@ -91,50 +106,195 @@ class Request():
         })
         return self
     
+    def cache(self: Request, ttl: Optional[float] = None) -> Request:
+        self._cache_ttl = ttl if ttl is not None else settings.QUERY_CACHE_TTL
+        return self
+
+    @property
+    def tables(self: Request) -> Set[str]:
+        tables = {str(self._table)}
+        for join in self._join:
+            tables.add(str(join['target']))
+        tables |= self._where.tables
+        tables |= self._having.tables
+        for value in self._params.values():
+            if isinstance(value, Request):
+                tables |= value.tables
+        return tables
+
     @property
     def sql(self: Request) -> str:
         return self._backend_type.to_sql(self)
     
+    def values(self: Request) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        fragments: Dict[str, str] = {}
+        params: Dict[str, Any] = {}
+        for index, column in enumerate(self._params):
+            value = self._params[column]
+            if isinstance(value, Request):
+                subquery_params = value.params
+                mapping = {name: f'v{index}_{position}' for position, name in enumerate(subquery_params)}
+                fragments[column] = f'({self._backend_type.rename_placeholders(value.sql, mapping)})'
+                for name in subquery_params:
+                    params[mapping[name]] = subquery_params[name]
+            else:
+                fragments[column] = self._backend_type.placeholder(f'v{index}')
+                params[f'v{index}'] = value
+        return fragments, params
+
     @property
     def params(self: Request) -> Dict[str, Any]:
-        base_params = {
+        return {
             **self._where.params,
-            **self._having.params
+            **self._having.params,
+            **self.values()[1]
         }
-        for param in self._params:
-            if isinstance(self._params[param], Request):
-                base_params = {
-                    **base_params,
-                    **self._params[param].params
-                }
-            else:
-                base_params[f"{id(self)}{key}"] = self._params[param]
-        return base_params
     
+    def _index(self: Request) -> Dict[str, int]:
+        return {column: index for index, column in enumerate(self._columns)}
+
     async def execute(self: Request) -> None:
+        sql, params = self.sql, self.params
+        started = perf_counter()
+        backend = await self._table.database(self._mode)
+        acquired = perf_counter()
+        executed: Optional[float] = None
+        rows = 0
+        error: Optional[BaseException] = None
+        try:
+            await backend.execute_query(sql, params)
+            executed = perf_counter()
+            rows = await backend.count()
+        except BaseException as exception:
+            error = exception
+            raise
+        finally:
+            await self._table.release(self._mode, backend)
+            if instrumentation.active():
+                executed = executed or perf_counter()
+                await instrumentation.record(self, backend, sql, params, rows, acquired - started, executed - acquired, 0.0, error)
+        if self._mode == 'write':
+            database = self._table._databases['write']
+            record_write(database)
+            current = Transaction.current(database)
+            if current is not None:
+                current.written.add(str(self._table))
+            await QueryCache.notify_write({str(self._table)})
+
+    async def _fetch(self: Request, method: str) -> List[Tuple[Any]]:
+        sql, params = self.sql, self.params
+        key = None
+        generations = None
+        if self._cache_ttl is not None and Transaction.current(self._table._databases['write']) is None:
+            key = QueryCache.key(str(self._table._databases[self._mode]), method, sql, params)
+            cached = await QueryCache.get().lookup(key)
+            if cached is not None:
+                return cached
+            generations = QueryCache.get().generations(self.tables)
+        started = perf_counter()
         backend = await self._table.database(self._mode)
-        await backend.execute_query(self.sql, self.params)
-        await backend.commit()
-        await self._table.release(self._mode, backend)
+        acquired = perf_counter()
+        executed: Optional[float] = None
+        fetched: Optional[float] = None
+        data: List[Tuple[Any]] = []
+        error: Optional[BaseException] = None
+        try:
+            await backend.execute_query(sql, params)
+            executed = perf_counter()
+            if method == 'one':
+                line = await backend.fetch_one()
+                data = [line] if line is not None else []
+            else:
+                data = await backend.fetch_all()
+            fetched = perf_counter()
+        except BaseException as exception:
+            error = exception
+            raise
+        finally:
+            await self._table.release(self._mode, backend)
+            if instrumentation.active():
+                executed = executed or perf_counter()
+                fetched = fetched or perf_counter()
+                await instrumentation.record(self, backend, sql, params, len(data), acquired - started, executed - acquired, fetched - executed, error)
+        if key is not None:
+            await QueryCache.get().store(key, data, self._cache_ttl, self.tables, generations)
+        return data
     
     async def all(self: Request) -> List[Result]:
-        backend = await self._table.database(self._mode)
-        await backend.execute_query(self._sql, {
-            **self._where.params,
-            **self._having.params
-        })
-        data = await backend.fetch_all()
-        result = [Result(self._table, line, self._columns.keys()) for line in data]
-        await self._table.release(self._mode, backend)
-        return result
+        data = await self._fetch('all')
+        columns = self._index()
+        return [Result(self._table, line, columns) for line in data]
     
-    async def one(self: Request) -> Result:
+    async def one(self: Request) -> Optional[Result]:
+        data = await self._fetch('one')
+        return Result(self._table, data[0], self._index()) if data else None
+
+    async def stream(self: Request, batch_size: int = 1000) -> AsyncIterator[Result]:
         backend = await self._table.database(self._mode)
-        await backend.execute_query(self._sql, {
-            **self._where.params,
-            **self._having.params
-        })
-        data = await backend.fetch_one()
-        result = Result(self._table, line, self._columns.keys())
-        await self._table.release(self._mode, backend)
-        return result
+        try:
+            await backend.open_cursor(self.sql, self.params)
+            try:
+                columns = self._index()
+                while True:
+                    data = await backend.fetch_some(batch_size)
+                    if not data:
+                        break
+                    for line in data:
+                        yield Result(self._table, line, columns)
+            finally:
+                await backend.close_cursor()
+        finally:
+            await self._table.release(self._mode, backend)
+
+    async def columns_as_arrays(self: Request, use_numpy: Optional[bool] = None) -> Dict[str, Any]:
+        if use_numpy and numpy is None:
+            raise ImportError("Columnar results as arrays require numpy library")
+        backend = await self._table.database(self._mode)
+        try:
+            await backend.execute_query(self.sql, self.params)
+            data = await backend.fetch_all()
+        finally:
+            await self._table.release(self._mode, backend)
+        values = list(zip(*data)) if data else [()] * len(self._columns)
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        if use_numpy:
+            return {column: numpy.array(values[index]) for index, column in enumerate(self._columns)}
+        return {column: list(values[index]) for index, column in enumerate(self._columns)}
+
+    async def paginate(self: Request, after: Optional[str] = None, order_by: Optional[List[str]] = None, size: int = 50, before: Optional[str] = None) -> Page:
+        if after is not None and before is not None:
+            raise TypeError("Cannot paginate both after and before a cursor")
+        orders = list(order_by if order_by is not None else self._order_by or [])
+        columns = [order[1:] if order[0] in ('+', '-') else order for order in orders]
+        descending = [order[0] == '-' for order in orders]
+        primary = self._table.primary
+        if primary not in columns and f'{self._table.alias}.{primary}' not in columns:
+            columns.append(primary)
+            descending.append(descending[-1] if descending else False)
+        backwards = before is not None
+        request = copy(self)
+        request._where = Where(self._backend_type, 'w')
+        request._where.append(self._where)
+        request._columns = dict(self._columns)
+        names = {expression: name for name, expression in request._columns.items()}
+        for column in columns:
+            if column not in names:
+                names[column] = column.replace('.', '_')
+                request._columns[names[column]] = column
+        cursor = before if backwards else after
+        if cursor is not None:
+            request._where.seek(columns, decode_cursor(cursor, columns), [flag != backwards for flag in descending])
+        request._order_by = [f'{"-" if flag != backwards else "+"}{column}' for column, flag in zip(columns, descending)]
+        request._limit = size + 1
+        request._offset = 0
+        rows = await request.all()
+        more = len(rows) > size
+        rows = rows[:size]
+        if backwards:
+            rows.reverse()
+        first = encode_cursor(columns, [getattr(rows[0], names[column]) for column in columns]) if rows else None
+        last = encode_cursor(columns, [getattr(rows[-1], names[column]) for column in columns]) if rows else None
+        if backwards:
+            return Page(rows, next=last, prev=first if more else None)
+        return Page(rows, next=last if more else None, prev=first if after is not None else None)
@@ -1,36 +1,95 @@
-from typing import Optional, Tuple, Any, List
-from .table import Table
+from __future__ import annotations
+from typing import Dict, Tuple, Any, List, TYPE_CHECKING, Union
+from modulo.db.session import Session
+
+
+if TYPE_CHECKING:
+    from .table import Table
 
 
 class Result():
-    def __init__(self: Result, table: Table, data: Tuple[Any], columns: List[str]) -> None:
-        self._table = table
-        self._data = {columns[i]: data[i] for i in range(len(columns))}
+    __slots__ = ('_table', '_data', '_index', '_changes')
+
+    def __init__(self: Result, table: Table, data: Tuple[Any], columns: Union[Dict[str, int], List[str]]) -> None:
+        if not isinstance(columns, dict):
+            columns = {column: index for index, column in enumerate(columns)}
+        object.__setattr__(self, '_table', table)
+        object.__setattr__(self, '_data', data)
+        object.__setattr__(self, '_index', columns)
+        object.__setattr__(self, '_changes', None)
 
     def __getattr__(self: Result, key: str) -> Any:
-        return self._data[key]
-    
+        changes = self._changes
+        if changes is not None and key in changes:
+            return changes[key]
+        try:
+            return self._data[self._index[key]]
+        except KeyError:
+            raise AttributeError(key) from None
+
     def __setattr__(self: Result, key: str, value: Any) -> None:
-        self._data[key] = value
-    
+        if self._changes is None:
+            object.__setattr__(self, '_changes', {})
+        self._changes[key] = value
+
+    @property
+    def dirty(self: Result) -> Dict[str, Any]:
+        return dict(self._changes or {})
+
+    def as_dict(self: Result) -> Dict[str, Any]:
+        return {
+            **{column: self._data[index] for column, index in self._index.items()},
+            **(self._changes or {})
+        }
+
+    def _commit_changes(self: Result) -> None:
+        changes = self._changes
+        object.__setattr__(self, '_changes', None)
+        data = list(self._data)
+        index = self._index
+        for key, value in changes.items():
+            if key not in index:
+                if index is self._index:
+                    index = dict(index)
+                index[key] = len(data)
+                data.append(value)
+            else:
+                data[index[key]] = value
+        object.__setattr__(self, '_data', tuple(data))
+        object.__setattr__(self, '_index', index)
+
+    def _primary_value(self: Result, action: str) -> Any:
+        primary = self._table.primary
+        if primary not in self._index:
+            raise KeyError(f'Primary key column in {self._table} ({primary}) was not retrieved when creating this result object, thus it cannot be {action}')
+        return self._data[self._index[primary]]
+
     async def save(self: Result) -> None:
         from .request import Request
 
-        if self._table.primary not in self._data:
-            raise KeyError(f'Primary key column in {self._table} ({self._table.primary}) was not retrieved when creating this result object, thus it cannot be updated')
-        request = Request(self._table, 'UPDATE', self._data)
+        primary = self._primary_value('updated')
+        if not self._changes:
+            return
+        session = Session.current()
+        if session is not None:
+            session.add(self)
+            return
+        request = Request(self._table, 'UPDATE', dict(self._changes))
         request.where({
-            self._table.primary: self._data[self._table.primary]
+            self._table.primary: primary
         })
         await request.execute()
-    
+        self._commit_changes()
+
     async def delete(self: Result) -> None:
         from .request import Request
 
-        if self._table.primary not in self._data:
-            raise KeyError(f'Primary key column in {self._table} ({self._table.primary}) was not retrieved when creating this result object, thus it cannot be deleted')
+        session = Session.current()
+        if session is not None:
+            session.remove(self)
+            return
         request = Request(self._table, 'DELETE')
         request.where({
-            self._table.primary: self._data[self._table.primary]
+            self._table.primary: self._primary_value('deleted')
         })
         await request.execute()
@@ -1,19 +1,44 @@
-from typing import Dict, Union
+from __future__ import annotations
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Union
 from modulo.conf import settings
 from modulo.db.pool import Pool
 from modulo.db.backends import Abstract
+from modulo.db.cache import QueryCache
+from modulo.db.loader import Loader
+from modulo.db.replica import record_write, recently_wrote, replicas
+from modulo.db.transaction import Transaction
 from .request import Request
+from .result import Result
 from .where import Where
 from .field import Field
 
 
+async def _iterate(rows: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+    if hasattr(rows, '__aiter__'):
+        async for row in rows:
+            yield row
+    else:
+        for row in rows:
+            yield row
+
+
+async def _chain(first: List[Any], rest: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    for row in first:
+        yield row
+    async for row in rest:
+        yield row
+
+
 class Table():
     _columns: Dict[str, Field] = {}
     _databases: Dict[str, str] = {}
     _name: str = ""
     _primary: str = "id"
+    _alias: Optional[str] = None
 
-    def __init__(self: Table) -> None:
+    def __init__(self: Table, alias: Optional[str] = None) -> None:
+        if alias is not None:
+            self._alias = alias
         if 'read' not in self._databases:
             self._databases['read'] = 'default'
         if 'write' not in self._databases:
@@ -28,19 +53,45 @@ class Table():
     @property
     def primary(self: Table) -> str:
         return self._primary
+
+    @property
+    def alias(self: Table) -> str:
+        return self._alias or self._name
     
     def _get_pool(self: Table, mode: str) -> Pool:
         if mode not in self._databases:
             raise KeyError(f"Mode not supported: {mode}")
-        pool: Pool = settings.DATABASES[self._databases[mode]]
+        name: Union[str, List[str]] = self._databases[mode]
+        if isinstance(name, list):
+            name = name[0]
+        pool: Pool = settings.DATABASES[name]
         return pool
     
     async def database(self: Table, mode: str) -> Abstract:
+        if mode == 'read':
+            write = self._databases['write']
+            if Transaction.current(write) is not None or recently_wrote(write):
+                mode = 'write'
+        name = self._databases.get(mode, '')
+        if isinstance(name, list):
+            for pool in replicas(name):
+                try:
+                    return await pool.get()
+                except Exception:
+                    pool.eject(settings.DATABASE_EJECT_TIME)
+            return await self.database('write')
+        current = Transaction.current(name)
+        if current is not None:
+            return current.connection
         pool = self._get_pool(mode)
         return await pool.get()
     
     async def release(self: Table, mode: str, connection: Abstract):
-        await self._get_pool(mode).release(connection)
+        for name in (self._databases['write'], self._databases.get(mode, '')):
+            current = Transaction.current(name) if isinstance(name, str) else None
+            if current is not None and current.connection is connection:
+                return
+        await connection.pool.release(connection)
     
     def __str__(self: Table) -> str:
         return self._name
@@ -50,11 +101,86 @@ class Table():
         return pool._backend
     
     def __getattr__(self: Table, key: str) -> str:
-        return f'{id(self)}.{key}'
+        return f'{self.alias}.{key}'
     
     def select(self: Table) -> Request:
         return Request(self, 'SELECT')
     
+    def insert(self: Table, values: Dict[str, Any]) -> Request:
+        return Request(self, 'INSERT', values)
+
+    async def insert_many(self: Table, rows: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]], columns: Optional[List[str]] = None, returning: bool = False, copy: Optional[bool] = None) -> Union[int, List[Any]]:
+        if copy and returning:
+            raise TypeError("COPY cannot return primary keys, use returning with copy disabled")
+        backend_type = self.get_backend('write')
+        iterator = _iterate(rows)
+        batch: List[Dict[str, Any]] = []
+        async for row in iterator:
+            batch.append(row)
+            break
+        if not batch:
+            return [] if returning else 0
+        if columns is None:
+            columns = list(batch[0].keys())
+        batch_size = max(1, backend_type.max_parameters // len(columns))
+        async for row in iterator:
+            batch.append(row)
+            if len(batch) > batch_size:
+                break
+        database = self._databases['write']
+        if copy is None:
+            copy = not returning and len(batch) > batch_size and Transaction.current(database) is None
+        if copy:
+            count = await backend_type.copy_from(self._get_pool('write'), Transaction.current(database), str(self), columns, _chain(
+                [tuple(row[column] for column in columns) for row in batch],
+                (tuple(row[column] for column in columns) async for row in iterator)
+            ))
+            record_write(database)
+            await self._written(database)
+            return count
+        result: List[Any] = []
+        count = 0
+        async with Transaction(database) as transaction:
+            connection = transaction.connection
+            rows = _chain(batch, iterator)
+            while True:
+                batch = []
+                async for row in rows:
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        break
+                if not batch:
+                    break
+                sql = backend_type.to_insert(str(self), tuple(columns), len(batch), self.primary if returning else None)
+                params = {
+                    f'r{index}_{position}': row[column]
+                    for index, row in enumerate(batch)
+                    for position, column in enumerate(columns)
+                }
+                await connection.execute_query(sql, params)
+                if returning:
+                    result.extend(line[0] for line in await connection.fetch_all())
+                else:
+                    count += await connection.count()
+        record_write(database)
+        await self._written(database)
+        return result if returning else count
+
+    async def _written(self: Table, database: str) -> None:
+        current = Transaction.current(database)
+        if current is not None:
+            current.written.add(str(self))
+        await QueryCache.notify_write({str(self)})
+
+    def loader(self: Table, column: Optional[str] = None) -> Loader:
+        return Loader.get(self, column or self.primary)
+
+    async def load(self: Table, value: Any, column: Optional[str] = None) -> Optional[Result]:
+        return await self.loader(column).load(value)
+
+    async def load_many(self: Table, values: Iterable[Any], column: Optional[str] = None) -> List[Optional[Result]]:
+        return await self.loader(column).load_many(values)
+
     def update(self: Table) -> Request:
         return Request(self, 'UPDATE')
     
@@ -63,10 +189,9 @@ class Table():
     
     def where(self: Table, mode: str = None) -> Where:
         if mode is None:
-            if self._databases['read'] != self._databases['write']:
-                raise TypeError("Cannot create a where object without mode when read and write databases are not the same")
-            else:
-                mode = 'read'
+            if self.get_backend('read') is not self.get_backend('write'):
+                raise TypeError("Cannot create a where object without mode when read and write databases do not use the same backend")
+            mode = 'write'
         return Where(self.get_backend(mode))
 
     def columns(self: Table, columns: Union[str, List[str], Dict[str, str]]) -> Request:
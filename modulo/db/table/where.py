@@ -1,4 +1,6 @@
-from typing import Dict, List, Union, Callable, TYPE_CHECKING, Any
+from __future__ import annotations
+from functools import reduce
+from typing import Dict, List, Optional, Set, Tuple, Union, TYPE_CHECKING, Any
 from modulo.db.backends import Abstract
 
 
@@ -6,84 +8,118 @@ if TYPE_CHECKING:
     from .request import Request
 
 
+class Condition():
+    __slots__ = ('column', 'kind', 'value')
+
+    def __init__(self: Condition, column: str, kind: str, value: Any) -> None:
+        self.column = column
+        self.kind = kind
+        self.value = value
+
+
+class Group():
+    __slots__ = ('operator', 'children')
+
+    def __init__(self: Group, operator: str, children: Tuple[Union[Condition, Group], ...]) -> None:
+        self.operator = operator
+        self.children = children
+
+
 class Where():
-    def __init__(self: Where, backend: Abstract) -> None:
-        self._sql = ''
+    def __init__(self: Where, backend: Abstract, prefix: str = 'p') -> None:
         self._backend: Abstract = backend
-        self._params: Dict[str, Union[str, int, float]] = {}
+        self._prefix = prefix
+        self._tree: Optional[Union[Condition, Group]] = None
+        self._tables: Set[str] = set()
+        self._compiled: Optional[Tuple[str, Dict[str, Any]]] = None
 
-    def _partial(self: Where, elements: Dict[str, Any]], join: Callable[str, str]) -> None:
+    def _condition(self: Where, column: str, value: Any) -> Condition:
         from .request import Request
 
-        for key in args:
-            if isinstance(args[key], Request):
-                request: Request = args[key]
-
-                if request._action != 'SELECT':
-                    raise TypeError('Where object can only accept SELECT request as subquery')
-
-                placeholder = request.sql
-                self._params = {
-                    **self._params,
-                    **request.params
-                }
-                subquery = True
-                is_list = False
-            else:
-                value = args[key]
-                subquery = False
-                placeholder = f'{id(self)}{key}'
-                if value is None:
-                    is_none = True
-                    is_list = False
-                elif isinstance(value, list):
-                    is_list = True
-                    is_none = False
-                    self._params[placeholder] = value
-                else:
-                    self._params[placeholder] = value
-                    is_none = False
-                    is_list = False
-            partial = self._backend.to_partial_where(key, placeholder, is_list, subquery, is_none)
-            if self._sql:
-                self._sql = join(self._sql, partial)
-            else:
-                self._sql = partial
+        if isinstance(value, Request):
+            if value._action != 'SELECT':
+                raise TypeError('Where object can only accept SELECT request as subquery')
+            self._tables |= value.tables
+            return Condition(column, 'subquery', value)
+        if value is None:
+            return Condition(column, 'none', None)
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return Condition(column, 'list', list(value))
+        return Condition(column, 'value', value)
+
+    def _combine(self: Where, operator: str, node: Union[Condition, Group]) -> None:
+        tree = self._tree
+        if tree is None:
+            self._tree = node
+        elif isinstance(tree, Group) and tree.operator == operator:
+            self._tree = Group(operator, tree.children + (node,))
+        else:
+            self._tree = Group(operator, (tree, node))
+        self._compiled = None
 
     def where(self: Where, *args, **kwargs) -> Where:
-        self._partial(kwargs, self._backend.where_and)
+        for key in kwargs:
+            self._combine('AND', self._condition(key, kwargs[key]))
         return self
-    
+
     def and_where(self: Where, *args, **kwargs) -> Where:
         return self.where(**kwargs)
-    
+
     def or_where(self: Where, *args, **kwargs) -> Where:
-        self._partial(kwargs, self._backend.where_or)
+        for key in kwargs:
+            self._combine('OR', self._condition(key, kwargs[key]))
+        return self
+
+    def seek(self: Where, columns: List[str], values: List[Any], descending: List[bool]) -> Where:
+        self._combine('AND', Condition(tuple(columns), 'seek', (tuple(values), tuple(descending))))
         return self
 
     def append(self: Where, other: Where) -> None:
-        if self._sql:
-            self._sql = self._backend.where_and(self._sql, other._sql)
-        else:
-            self._sql = other._sql
-        self._params = {
-            **self._params,
-            other._params
-        }
-    
+        if other._tree is not None:
+            self._tables |= other._tables
+            self._combine('AND', other._tree)
+
     def append_or(self: Where, other: Where) -> None:
-        if self._sql:
-            self._sql = self._backend.where_or(self._sql, other._sql)
-        else:
-            self._sql = other._sql
-        self._params = {
-            **self._params,
-            other._params
-        }
-        
+        if other._tree is not None:
+            self._tables |= other._tables
+            self._combine('OR', other._tree)
+
+    def _bind(self: Where, params: Dict[str, Any], value: Any) -> str:
+        placeholder = f'{self._prefix}{len(params)}'
+        params[placeholder] = value
+        return placeholder
+
+    def _compile_node(self: Where, node: Union[Condition, Group], params: Dict[str, Any]) -> str:
+        backend = self._backend
+        if isinstance(node, Group):
+            join = backend.where_and if node.operator == 'AND' else backend.where_or
+            return reduce(join, [self._compile_node(child, params) for child in node.children])
+        if node.kind == 'subquery':
+            subquery_params = node.value.params
+            mapping = {name: self._bind(params, subquery_params[name]) for name in subquery_params}
+            return backend.to_partial_where(node.column, backend.rename_placeholders(node.value.sql, mapping), is_subquery=True)
+        if node.kind == 'seek':
+            values, descending = node.value
+            placeholders = [backend.placeholder(self._bind(params, value)) for value in values]
+            return backend.to_seek(list(node.column), placeholders, list(descending))
+        if node.kind == 'none':
+            return backend.to_partial_where(node.column, '', is_none=True)
+        return backend.to_partial_where(node.column, self._bind(params, node.value), is_list=node.kind == 'list')
+
+    def compile(self: Where) -> Tuple[str, Dict[str, Any]]:
+        if self._compiled is None:
+            params: Dict[str, Any] = {}
+            sql = self._compile_node(self._tree, params) if self._tree is not None else ''
+            self._compiled = (sql, params)
+        return self._compiled
+
     def __str__(self: Where) -> str:
-        return self._sql
+        return self.compile()[0]
 
     @property
     def params(self: Where) -> Dict[str, Any]:
-        return self._params
+        return self.compile()[1]
+
+    @property
+    def tables(self: Where) -> Set[str]:
+        return self._tables
@@ -0,0 +1,72 @@
+from __future__ import annotations
+from asyncio import Lock
+from contextvars import ContextVar, Token
+from typing import Dict, Optional, Set
+from modulo.conf import settings
+from .backends import Abstract
+from .cache import QueryCache
+from .pool import Pool
+
+
+_transactions: ContextVar[Dict[str, Transaction]] = ContextVar('modulo_db_transactions', default={})
+
+
+class Transaction():
+    def __init__(self: Transaction, database: str = 'default') -> None:
+        self.database = database
+        self.connection: Optional[Abstract] = None
+        self._pool: Optional[Pool] = None
+        self._savepoint: Optional[str] = None
+        self._depth = 0
+        self._token: Optional[Token] = None
+        self._parent: Optional[Transaction] = None
+        self.written: Set[str] = set()
+        self.lock = Lock()
+
+    @staticmethod
+    def current(database: str) -> Optional[Transaction]:
+        return _transactions.get().get(database, None)
+
+    async def __aenter__(self: Transaction) -> Transaction:
+        parent = Transaction.current(self.database)
+        if parent is not None:
+            self._parent = parent
+            self.connection = parent.connection
+            self.lock = parent.lock
+            self._depth = parent._depth + 1
+            self._savepoint = f'modulo_savepoint_{self._depth}'
+            await self.connection.savepoint(self._savepoint)
+        else:
+            self._pool = settings.DATABASES[self.database]
+            self.connection = await self._pool.get()
+            try:
+                await self.connection.transaction()
+            except BaseException:
+                await self._pool.release(self.connection)
+                raise
+        self._token = _transactions.set({**_transactions.get(), self.database: self})
+        return self
+
+    async def __aexit__(self: Transaction, exc_type: Optional[type], exc: Optional[BaseException], traceback: object) -> bool:
+        _transactions.reset(self._token)
+        if self._savepoint is not None:
+            if exc_type is None:
+                await self.connection.release_savepoint(self._savepoint)
+                self._parent.written |= self.written
+            else:
+                await self.connection.rollback_to_savepoint(self._savepoint)
+            return False
+        try:
+            if exc_type is None:
+                await self.connection.commit()
+            else:
+                await self.connection.rollback()
+        finally:
+            await self._pool.release(self.connection)
+        if exc_type is None and self.written:
+            await QueryCache.notify_write(self.written)
+        return False
+
+
+def transaction(database: str = 'default') -> Transaction:
+    return Transaction(database)
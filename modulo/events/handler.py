@@ -1,4 +1,7 @@
-from typing import Dict, List
+from __future__ import annotations
+from asyncio import gather
+from inspect import isawaitable, iscoroutinefunction
+from typing import Dict, List, Optional, Set, Tuple
 
 
 class Handler():
@@ -9,20 +12,63 @@ class Handler():
         if Handler._instance is None:
             Handler._instance = Handler()
         return Handler._instance
-    
+
     def __init__(self: Handler) -> None:
         self._handlers: Dict[str, List[callable]] = {}
-    
+        self._concurrent: Set[str] = set()
+        self._dispatch: Optional[Dict[str, Tuple[Tuple[callable, bool], ...]]] = None
+
     def __setitem__(self: Handler, key: str, value: callable):
         if key not in self._handlers:
             self._handlers[key] = []
         self._handlers[key].append(value)
+        self._dispatch = None
+
+    def __contains__(self: Handler, key: str) -> bool:
+        return bool(self._handlers.get(key))
+
+    def concurrent(self: Handler, key: str, enabled: bool = True) -> None:
+        if enabled:
+            self._concurrent.add(key)
+        else:
+            self._concurrent.discard(key)
+
+    def freeze(self: Handler) -> Dict[str, Tuple[Tuple[callable, bool], ...]]:
+        self._dispatch = {
+            key: tuple((handle, iscoroutinefunction(handle)) for handle in handlers)
+            for key, handlers in self._handlers.items()
+            if handlers
+        }
+        return self._dispatch
 
     async def trigger(self: Handler, key: str, param: object) -> None:
-        if key in self._handlers:
-            for handle in self._handlers[key]:
-                if not handle(**param):
-                    break
+        dispatch = self._dispatch
+        if dispatch is None:
+            dispatch = self.freeze()
+        handlers = dispatch.get(key)
+        if not handlers:
+            return
+        if key in self._concurrent:
+            await self._trigger_concurrent(handlers, param)
+            return
+        for handle, is_coroutine in handlers:
+            if is_coroutine:
+                result = await handle(**param)
+            else:
+                result = handle(**param)
+                if isawaitable(result):
+                    result = await result
+            if not result:
+                break
+
+    async def _trigger_concurrent(self: Handler, handlers: Tuple[Tuple[callable, bool], ...], param: object) -> None:
+        pending = []
+        for handle, is_coroutine in handlers:
+            result = handle(**param)
+            if is_coroutine or isawaitable(result):
+                pending.append(result)
+        if pending:
+            await gather(*pending)
 
 async def trigger(event: str, param: object) -> list:
     await Handler.get().trigger(event, param)
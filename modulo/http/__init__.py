@@ -1,7 +1,18 @@
 from .context import Context
 from .response import Response
 from .exceptions import BodyNotReady
+from .codec import JSONCodec
 from .handler import HTTPHandler
 from .router import Router, route
+from .cache import CachePolicy, ResponseCache
 
 http_router = Router.get()
+http_cache = ResponseCache.get()
+
+
+def __getattr__(name: str):
+    if name == 'FileResponse':
+        from .file_response import FileResponse
+
+        return FileResponse
+    raise AttributeError(f'module {__name__} has no attribute {name}')
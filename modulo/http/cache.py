@@ -0,0 +1,137 @@
+from __future__ import annotations
+from collections import OrderedDict
+from email.utils import formatdate
+from hashlib import blake2b
+from time import monotonic, time
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from modulo.conf import settings
+from modulo.events import event_handler
+from .compression import negotiate
+
+if TYPE_CHECKING:
+    from .context import HTTPContext
+    from .response import Response
+    from .router import Router
+
+
+class CachePolicy():
+    def __init__(self: CachePolicy, ttl: Optional[int] = None, vary: Optional[List[str]] = None) -> None:
+        self.ttl = ttl
+        self.vary = [header.lower() for header in vary or []]
+
+
+class CacheEntry():
+    def __init__(self: CacheEntry, status: int, headers: List[List[bytes]], body: bytes, etag: str, expires: float) -> None:
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+        self.expires = expires
+        self.size = len(body) + sum(len(name) + len(value) for name, value in headers)
+
+
+class ResponseCache():
+    _instance = None
+
+    @staticmethod
+    def get() -> ResponseCache:
+        if ResponseCache._instance is None:
+            ResponseCache._instance = ResponseCache()
+            event_handler['protocol.http.request_ready'] = ResponseCache._instance.handle
+        return ResponseCache._instance
+
+    def __init__(self: ResponseCache) -> None:
+        self._policies: Dict[str, CachePolicy] = {}
+        self._entries: OrderedDict[Tuple, CacheEntry] = OrderedDict()
+        self._size = 0
+        self._router: Optional[Router] = None
+
+    def register(self: ResponseCache, name: str, policy: CachePolicy) -> None:
+        self._policies[name] = policy
+
+    def clear(self: ResponseCache) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def _key(self: ResponseCache, context: HTTPContext, policy: CachePolicy) -> Tuple:
+        headers = context.headers
+        return (
+            context.path,
+            context.query,
+            negotiate(headers.get('accept-encoding', ''), settings.COMPRESSION_ALGORITHMS),
+            tuple(headers.get(header, '') for header in policy.vary)
+        )
+
+    def _lookup(self: ResponseCache, key: Tuple) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _remove(self: ResponseCache, key: Tuple) -> None:
+        self._size -= self._entries.pop(key).size
+
+    async def handle(self: ResponseCache, context: HTTPContext, response: Response) -> bool:
+        if not self._policies or context.method not in ('get', 'head'):
+            return True
+        if self._router is None:
+            from .router import Router
+
+            self._router = Router.get()
+        match = self._router.match(context.path)
+        if match is None or match[0] not in self._policies:
+            return True
+        key = self._key(context, self._policies[match[0]])
+        entry = self._lookup(key)
+        if entry is None:
+            response.cache_key = key
+            response.cache_policy = self._policies[match[0]]
+            return True
+        if_none_match = context.headers.get('if-none-match', None)
+        if if_none_match is not None and self._etag_matches(if_none_match, entry.etag):
+            headers = [header for header in entry.headers if header[0] in (b'etag', b'last-modified', b'vary', b'cache-control')]
+            await response.handler.handle_start_response(status_code=304, headers=headers)
+        else:
+            await response.handler.handle_start_response(status_code=entry.status, headers=entry.headers)
+            if context.method != 'head' and entry.body:
+                await response.handler.handle_send_response_body(entry.body)
+        await response.handler.handle_close_response()
+        return False
+
+    @staticmethod
+    def _etag_matches(header: str, etag: str) -> bool:
+        if header.strip() == '*':
+            return True
+        return any(candidate.strip().removeprefix('W/') == etag for candidate in header.split(','))
+
+    def store(self: ResponseCache, response: Response, headers: Dict[str, str], body: bytes) -> None:
+        if response.status_code != 200:
+            return
+        names = {name.lower(): value for name, value in headers.items()}
+        if 'set-cookie' in names or 'no-store' in names.get('cache-control', '') or 'private' in names.get('cache-control', ''):
+            return
+        policy: CachePolicy = response.cache_policy
+        ttl = policy.ttl if policy.ttl is not None else settings.HTTP_CACHE_TTL
+        etag = names.get('etag', None) or f'"{blake2b(body, digest_size=16).hexdigest()}"'
+        headers['etag'] = etag
+        if 'last-modified' not in names:
+            headers['last-modified'] = formatdate(time(), usegmt=True)
+        entry = CacheEntry(
+            response.status_code,
+            [[name.lower().encode('latin1'), str(value).encode('latin1')] for name, value in headers.items()],
+            body,
+            etag,
+            monotonic() + ttl
+        )
+        if entry.size > settings.HTTP_CACHE_MAX_SIZE:
+            return
+        if response.cache_key in self._entries:
+            self._remove(response.cache_key)
+        self._entries[response.cache_key] = entry
+        self._size += entry.size
+        while self._size > settings.HTTP_CACHE_MAX_SIZE or len(self._entries) > settings.HTTP_CACHE_MAX_ENTRIES:
+            self._remove(next(iter(self._entries)))
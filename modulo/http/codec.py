@@ -0,0 +1,76 @@
+from __future__ import annotations
+import json
+from typing import Any, Dict, Union
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+from modulo.conf import settings, ImproperConfigurationException
+
+
+class JSONCodec():
+    _instance = None
+
+    @staticmethod
+    def get() -> JSONCodec:
+        if JSONCodec._instance is None:
+            JSONCodec._instance = JSONCodec.create(settings.JSON_CODEC)
+        return JSONCodec._instance
+
+    @staticmethod
+    def create(name: Union[str, JSONCodec]) -> JSONCodec:
+        if isinstance(name, JSONCodec):
+            return name
+        if name == 'auto':
+            name = 'orjson' if orjson is not None else 'ujson' if ujson is not None else 'json'
+        if name not in CODECS:
+            raise ImproperConfigurationException(f'Unknown JSON codec {name}')
+        codec = CODECS[name]
+        if not codec.available():
+            raise ImproperConfigurationException(f'JSON codec {name} requires the {name} library')
+        return codec()
+
+    @staticmethod
+    def available() -> bool:
+        return True
+
+    def dumps(self: JSONCodec, data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(self: JSONCodec, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    @staticmethod
+    def available() -> bool:
+        return orjson is not None
+
+    def dumps(self: OrjsonCodec, data: Any) -> bytes:
+        return orjson.dumps(data)
+
+    def loads(self: OrjsonCodec, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    @staticmethod
+    def available() -> bool:
+        return ujson is not None
+
+    def dumps(self: UjsonCodec, data: Any) -> bytes:
+        return ujson.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    def loads(self: UjsonCodec, data: Union[bytes, str]) -> Any:
+        return ujson.loads(data)
+
+
+CODECS: Dict[str, type] = {
+    'json': JSONCodec,
+    'orjson': OrjsonCodec,
+    'ujson': UjsonCodec
+}
@@ -0,0 +1,61 @@
+from __future__ import annotations
+import zlib
+from asyncio import get_running_loop
+from typing import Dict, List, Optional
+
+
+WBITS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS
+}
+
+
+def negotiate(accept_encoding: str, algorithms: List[str]) -> Optional[str]:
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+    best: Optional[str] = None
+    best_weight = 0.0
+    for algorithm in algorithms:
+        if algorithm not in WBITS:
+            continue
+        weight = weights.get(algorithm, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = algorithm, weight
+    return best
+
+
+class Compressor():
+    def __init__(self: Compressor, encoding: str, level: int = 6, executor_threshold: int = 0) -> None:
+        self.encoding = encoding
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, WBITS[encoding])
+        self._executor_threshold = executor_threshold
+
+    async def _run(self: Compressor, func: callable, data: bytes) -> bytes:
+        if self._executor_threshold and len(data) >= self._executor_threshold:
+            return await get_running_loop().run_in_executor(None, func, data)
+        return func(data)
+
+    def _compress_all(self: Compressor, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+    async def compress(self: Compressor, data: bytes) -> bytes:
+        return await self._run(self._compressor.compress, data)
+
+    async def compress_all(self: Compressor, data: bytes) -> bytes:
+        return await self._run(self._compress_all, data)
+
+    def flush(self: Compressor) -> bytes:
+        return self._compressor.flush()
@@ -1,125 +1,260 @@
+from __future__ import annotations
+from asyncio import Event
 from io import BytesIO
-from cgi import parse_header, FieldStorage
+from tempfile import SpooledTemporaryFile
 import codecs
-from json import loads
-from typing import Dict, AnyStr
+from typing import Any, AsyncIterator, Dict, AnyStr, BinaryIO, List, Optional, Tuple
 from urllib import parse
 from http.cookies import SimpleCookie
+from modulo.conf import settings
 from modulo.server import Context
-from .exceptions import BodyNotReady, MissingBoundaryException, InvalidContentLengthException, MissingContentDispositionException
+from .exceptions import BodyNotReady, BodyTooLarge
+from .multipart import MultipartParser, Part, parse_header
+from .codec import JSONCodec
+
+_MISSING = object()
+
 
 class HTTPContext(Context):
+    __slots__ = (
+        'version', 'method', 'is_secure', 'path', 'query', 'raw_headers', 'extensions',
+        'remote_addr', 'remote_port', 'server_name', 'server_port',
+        '_headers', '_cookies', '_parsed_query', '_content_type', '_raw_body', '_body', '_post_data', '_json',
+        '_body_ready', '_body_chunks', '_body_size', '_body_file', '_body_event', '_multipart', 'stream_body'
+    )
+
     def __init__(self: HTTPContext) -> None:
         super().__init__()
+        self._body_file: Optional[SpooledTemporaryFile] = None
+        self._multipart: Optional[MultipartParser] = None
+        self.reset()
+
+    def reset(self: HTTPContext) -> None:
+        self.version = '1.0'
+        self.method = 'unknown'
+        self.is_secure = False
+        self.path = ''
+        self.query = ''
+        self.raw_headers: List[Tuple[bytes, bytes]] = []
+        self.extensions: Dict[str, Any] = {}
+        self.remote_addr = 'Unknown'
+        self.remote_port = 0
+        self.server_name = 'Unknown'
+        self.server_port = 0
+        self._headers: Any = _MISSING
+        self._cookies: Any = _MISSING
+        self._parsed_query: Any = _MISSING
+        self._content_type: Any = _MISSING
+        self._raw_body: Any = _MISSING
+        self._body: Any = _MISSING
+        self._post_data: Any = _MISSING
+        self._json: Any = _MISSING
         self._body_ready = False
+        self._body_chunks: List[bytes] = []
+        self._body_size = 0
+        if self._body_file is not None:
+            self._body_file.close()
+        self._body_file = None
+        self._body_event: Optional[Event] = None
+        if self._multipart is not None:
+            self._multipart.cleanup()
+        self._multipart = None
+        self.stream_body = False
 
     async def load(self: HTTPContext, params: Dict[str, AnyStr]) -> None:
-        self._params['version'] = params.get('http_version', '1.0')
-        self._params['method'] = params('method', 'Unknown').lower()
-        self._params['is_secure'] = params.get('scheme', 'http') == 'https'
-        self._params['path'] = params.get('path', '')
-        self._params['query'] = params.get('query_string', b'').decode('utf-8')
-        self._params['raw_headers'] = params.get('headers', [])
+        self.version = params.get('http_version', '1.0')
+        self.method = params.get('method', 'Unknown').lower()
+        self.is_secure = params.get('scheme', 'http') == 'https'
+        self.path = params.get('path', '')
+        self.query = params.get('query_string', b'').decode('utf-8')
+        self.raw_headers = params.get('headers', [])
+        self.extensions = params.get('extensions', None) or {}
 
         client = params.get('client', None)
         if client:
-            self._params['remote_addr'] = client[0]
-            self._params['remote_port'] = client[1]
-        else:
-            self._params['remote_addr'] = 'Unknown'
-            self._params['remote_port'] = 0
+            self.remote_addr = client[0]
+            self.remote_port = client[1]
 
         server = params.get('server', None)
         if server:
-            self._params['server_name'] = server[0]
-            self._params['server_port'] = server[1]
-        else:
-            self._params['server_name'] = 'Unknown'
-            self._params['server_port'] = 0
-    
+            self.server_name = server[0]
+            self.server_port = server[1]
+
     @property
     def get(self: HTTPContext) -> Dict[str, Any]:
-        if 'parsed_query' not in self._params:
-            self._params['parsed_query'] = parse.parse_qs(self.query, keep_blank_values=True)
-        return self._params['parsed_query']
+        if self._parsed_query is _MISSING:
+            self._parsed_query = parse.parse_qs(self.query, keep_blank_values=True)
+        return self._parsed_query
 
     @property
     def headers(self: HTTPContext) -> Dict[str, str]:
         # Note: HTTP / HTTPbis state that headers are ASCII-only.
         # we use latin1 here in case something else is coming.
-        if 'headers' not in self._params:
-            self._params['headers'] = {
+        if self._headers is _MISSING:
+            self._headers = {
                 name.decode('latin1'): value.decode('latin1')
-                for name, value in self._params['raw_headers']
+                for name, value in self.raw_headers
             }
-        return self._params['headers']
+        return self._headers
 
     @property
-    def cookies(self: HTTPContext) => Dict[str, str]:
-        if 'cookies' not in self._params:
-            cookies_string = self.headers.get('http_cookie', '')
+    def cookies(self: HTTPContext) -> Dict[str, str]:
+        if self._cookies is _MISSING:
             simple_cookies = SimpleCookie()
-            simple_cookies.load(cookies_string)
-            cookies = {
-                key: simple_cookies[key].value for key in simple_cookies.items()
+            simple_cookies.load(self.headers.get('cookie', ''))
+            self._cookies = {
+                key: morsel.value for key, morsel in simple_cookies.items()
             }
-            self._params['cookies'] = cookies
-        return self._params['cookies']
+        return self._cookies
 
     def append_body(self: HTTPContext, body: bytes) -> None:
-        if 'raw_body' not in self._params:
-            self._params['raw_body'] = b''
-        self._params['raw_body'] += body
+        max_size = settings.BODY_MAX_SIZE
+        if max_size:
+            expected = self.content_length if not self._body_size else None
+            if self._body_size + len(body) > max_size or (expected or 0) > max_size:
+                raise BodyTooLarge(f'Request body exceeds {max_size} bytes')
+        if not body:
+            return
+        if not self._body_size and self.content_type[0] == 'multipart/form-data':
+            self._multipart = self._create_multipart()
+        self._body_size += len(body)
+        if self._multipart is not None:
+            self._multipart.feed(body)
+            self._notify_body()
+            return
+        if self._body_file is not None:
+            self._body_file.write(body)
+            return
+        self._body_chunks.append(body)
+        threshold = settings.BODY_SPOOL_THRESHOLD
+        if threshold and self._body_size > threshold:
+            self._body_file = SpooledTemporaryFile(max_size=threshold)
+            self._body_file.writelines(self._body_chunks)
+            self._body_chunks = []
 
     def close_body(self: HTTPContext) -> None:
         self._body_ready = True
-    
-    def _parse_multipart(self:HTTPContext, content_params: Dict[str, str], charset: codecs.CodecInfo) -> None:
-        storage = FieldStorage(fp=BytesIO(self._params['raw_body']), headers=self.headers, keep_blank_values=True, encoding=charset)
-        self._params['post_data'] = {}
-        for key in storage:
-            if storage[key].file:
-                self._params['post_data'][key] = storage[key].file
-                self._params['post_data'][key].filename = storage[key].filename
-                self._params['post_data'][key].type = storage[key].type
-            elif storage[key].list:
-                self._params['post_data'][key] = storage[key].list
+        if self._multipart is not None:
+            self._multipart.close()
+        self._notify_body()
+
+    def _notify_body(self: HTTPContext) -> None:
+        if self._body_event is not None:
+            self._body_event.set()
+
+    @property
+    def content_type(self: HTTPContext) -> Tuple[str, Dict[str, str]]:
+        if self._content_type is _MISSING:
+            self._content_type = parse_header(self.headers.get('content-type', ''))
+        return self._content_type
+
+    @property
+    def charset(self: HTTPContext) -> str:
+        try:
+            return codecs.lookup(self.content_type[1].get('charset', 'utf-8')).name
+        except LookupError:
+            return 'utf-8'
+
+    def _create_multipart(self: HTTPContext) -> MultipartParser:
+        return MultipartParser(
+            self.content_type[1].get('boundary', ''),
+            charset=self.charset,
+            max_part_size=settings.MULTIPART_MAX_PART_SIZE,
+            max_field_size=settings.MULTIPART_MAX_FIELD_SIZE,
+            max_parts=settings.MULTIPART_MAX_PARTS,
+            spool_size=settings.BODY_SPOOL_THRESHOLD
+        )
+
+    async def parts(self: HTTPContext) -> AsyncIterator[Part]:
+        if not self._body_ready and not self.stream_body:
+            raise BodyNotReady("Parts can only be awaited before the body is complete from a route declared with stream=True")
+        index = 0
+        while True:
+            if self._multipart is not None:
+                while index < len(self._multipart.parts):
+                    yield self._multipart.parts[index]
+                    index += 1
+            if self._body_ready:
+                return
+            if self._body_event is None:
+                self._body_event = Event()
+            await self._body_event.wait()
+            self._body_event.clear()
+
+    @property
+    def content_length(self: HTTPContext) -> Optional[int]:
+        try:
+            return int(self.headers['content-length'])
+        except (KeyError, ValueError):
+            return None
+
+    @property
+    def body_size(self: HTTPContext) -> int:
+        return self._body_size
+
+    @property
+    def body_file(self: HTTPContext) -> BinaryIO:
+        if not self._body_ready:
+            raise BodyNotReady("Body is not ready yet")
+        if self._body_file is None:
+            return BytesIO(self.raw_body)
+        self._body_file.seek(0)
+        return self._body_file
+
+    @property
+    def raw_body(self: HTTPContext) -> bytes:
+        if not self._body_ready:
+            raise BodyNotReady("Body is not ready yet")
+        if self._raw_body is _MISSING:
+            if self._body_file is not None:
+                self._body_file.seek(0)
+                self._raw_body = self._body_file.read()
             else:
-                self._params['post_data'][key] = storage[key].value
+                self._raw_body = b''.join(self._body_chunks)
+                self._body_chunks = [self._raw_body]
+        return self._raw_body
     
+    def _parse_multipart(self: HTTPContext) -> None:
+        if self._multipart is None:
+            self._multipart = self._create_multipart()
+            self._multipart.close()
+        self._post_data = self._multipart.data
+
     def _parse_urlencoded(self: HTTPContext) -> None:
-        self._params['post_data'] = parse.parse_qs(self._params['body'], keep_blank_values=True)
+        self._post_data = parse.parse_qs(self._body, keep_blank_values=True)
 
     def _load_body(self: HTTPContext) -> None:
         if not self._body_ready:
             raise BodyNotReady("Body is not ready yet")
-        if 'body' not in self._params:
-            content_type_header = self.headers.get('content-type', '')
-            content_type, content_params = parse_header(content_type_header)
-            charset = content_params.get('charset', 'utf-8')
-            try:
-                charset = codecs.lookup(charset)
-            except LookupError:
-                pass
+        if self._body is _MISSING:
+            content_type = self.content_type[0]
             if content_type == 'multipart/form-data':
-                self._parse_multipart(content_params, charset)
+                self._parse_multipart()
+                self._body = ''
             else:
-                self._params['body'] = self._params.get('raw_body', b'').decode(charset)
+                self._body = self.raw_body.decode(self.charset)
                 if content_type == 'application/x-www-form-urlencoded':
                     self._parse_urlencoded()
 
     @property
     def body(self: HTTPContext) -> str:
-        if 'body' not in self._params:
+        if self._body is _MISSING:
             self._load_body()
-        return self._params.get('body', '')
+        return self._body
 
     @property
     def json(self: HTTPContext) -> Any:
-        return loads(self.body)
+        if self._json is _MISSING:
+            if self.charset in ('utf-8', 'ascii'):
+                self._json = JSONCodec.get().loads(self.raw_body)
+            else:
+                self._json = JSONCodec.get().loads(self.body)
+        return self._json
 
     @property
     def data(self: HTTPContext) -> Dict[str, Any]:
-        if 'body' not in self._params:
+        if self._body is _MISSING:
             self._load_body()
-        return self._params.get('post_data', {})
+        if self._post_data is _MISSING:
+            return {}
+        return self._post_data
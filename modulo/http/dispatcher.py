@@ -0,0 +1,171 @@
+from __future__ import annotations
+import re
+from typing import Dict, List, Optional, Tuple
+
+
+_METACHARS = '.^$*+?{}[]\\|()'
+_QUANTIFIERS = '*+?{'
+_NAMED_GROUP = re.compile(r'\(\?P<([A-Za-z_][A-Za-z0-9_]*)>')
+_NAMED_REFERENCE = re.compile(r'\(\?P=([A-Za-z_][A-Za-z0-9_]*)\)')
+_NAMED_CONDITION = re.compile(r'\(\?\(([A-Za-z_][A-Za-z0-9_]*)\)')
+_NUMBERED_REFERENCE = re.compile(r'\\[1-9]|\(\?\([0-9]+\)')
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            if char == ']':
+                in_class = False
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+    return False
+
+
+def static_prefix(pattern: str) -> str:
+    if pattern.startswith('(?') or _has_top_level_alternation(pattern):
+        return ''
+    position = 1 if pattern.startswith('^') else 0
+    prefix: List[str] = []
+    while position < len(pattern):
+        char = pattern[position]
+        if char == '\\':
+            if position + 1 >= len(pattern) or pattern[position + 1].isalnum():
+                break
+            literal = pattern[position + 1]
+            position += 2
+        elif char in _METACHARS:
+            break
+        else:
+            literal = char
+            position += 1
+        if position < len(pattern) and pattern[position] in _QUANTIFIERS:
+            break
+        prefix.append(literal)
+    return ''.join(prefix)
+
+
+def _is_combinable(pattern: re.Pattern) -> bool:
+    if pattern.flags & ~re.UNICODE:
+        return False
+    return _NUMBERED_REFERENCE.search(pattern.pattern) is None
+
+
+class _Route():
+    def __init__(self: _Route, index: int, name: str, pattern: re.Pattern) -> None:
+        self.index = index
+        self.name = name
+        self.pattern = pattern
+        self.combinable = _is_combinable(pattern)
+        self.prefix = static_prefix(pattern.pattern) if not pattern.flags & ~re.UNICODE else ''
+        self.group = f'_r{index}'
+        self.groups: Dict[str, str] = {
+            f'_r{index}_{group}': group for group in pattern.groupindex
+        }
+
+    def to_alternative(self: _Route) -> str:
+        source = _NAMED_GROUP.sub(lambda m: f'(?P<{self.group}_{m.group(1)}>', self.pattern.pattern)
+        source = _NAMED_REFERENCE.sub(lambda m: f'(?P={self.group}_{m.group(1)})', source)
+        source = _NAMED_CONDITION.sub(lambda m: f'(?({self.group}_{m.group(1)})', source)
+        return f'(?P<{self.group}>{source})'
+
+
+class _Node():
+    def __init__(self: _Node, label: str = '') -> None:
+        self.label = label
+        self.children: Dict[str, _Node] = {}
+        self.routes: List[_Route] = []
+        self.matchers: Tuple[Tuple[re.Pattern, Optional[_Route], int], ...] = ()
+
+    def insert(self: _Node, key: str, route: _Route) -> None:
+        if not key:
+            self.routes.append(route)
+            return
+        child = self.children.get(key[0])
+        if child is None:
+            child = _Node(key)
+            self.children[key[0]] = child
+            child.routes.append(route)
+            return
+        common = 0
+        limit = min(len(key), len(child.label))
+        while common < limit and key[common] == child.label[common]:
+            common += 1
+        if common < len(child.label):
+            split = _Node(child.label[:common])
+            child.label = child.label[common:]
+            split.children[child.label[0]] = child
+            self.children[key[0]] = split
+            child = split
+        child.insert(key[common:], route)
+
+
+class Dispatcher():
+    def __init__(self: Dispatcher, routes: Dict[str, re.Pattern]) -> None:
+        self._routes: Dict[str, _Route] = {}
+        self._root = _Node()
+        for index, (name, pattern) in enumerate(routes.items()):
+            route = _Route(index, name, pattern)
+            self._routes[route.group] = route
+            self._root.insert(route.prefix, route)
+        self._compile(self._root)
+
+    def _compile(self: Dispatcher, node: _Node) -> None:
+        combinable = [route for route in node.routes if route.combinable]
+        matchers: List[Tuple[re.Pattern, Optional[_Route], int]] = []
+        if combinable:
+            matchers.append((self._combine(combinable), None, combinable[0].index))
+        for route in node.routes:
+            if not route.combinable:
+                matchers.append((route.pattern, route, route.index))
+        node.matchers = tuple(sorted(matchers, key=lambda matcher: matcher[2]))
+        for child in node.children.values():
+            self._compile(child)
+
+    @staticmethod
+    def _combine(routes: List[_Route]) -> re.Pattern:
+        return re.compile('|'.join(route.to_alternative() for route in routes))
+
+    def match(self: Dispatcher, path: str) -> Optional[Tuple[str, Dict[str, Optional[str]]]]:
+        best: Optional[_Route] = None
+        best_match: Optional[re.Match] = None
+        node = self._root
+        position = 0
+        while True:
+            for pattern, route, first in node.matchers:
+                if best is not None and first > best.index:
+                    break
+                match = pattern.match(path)
+                if match is None:
+                    continue
+                if route is None:
+                    route = self._routes[match.lastgroup]
+                if best is None or route.index < best.index:
+                    best = route
+                    best_match = match
+            if position >= len(path):
+                break
+            child = node.children.get(path[position])
+            if child is None or not path.startswith(child.label, position):
+                break
+            node = child
+            position += len(child.label)
+        if best is None:
+            return None
+        if best.combinable:
+            return best.name, {
+                original: best_match.group(group) for group, original in best.groups.items()
+            }
+        return best.name, best_match.groupdict()
@@ -1,2 +1,22 @@
 class BodyNotReady(Exception):
     pass
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class InvalidRequestError(Exception):
+    pass
+
+
+class InvalidContentLengthException(InvalidRequestError):
+    pass
+
+
+class MissingBoundaryException(InvalidRequestError):
+    pass
+
+
+class MissingContentDispositionException(InvalidRequestError):
+    pass
@@ -0,0 +1,177 @@
+from __future__ import annotations
+try:
+    import aiofiles
+    import aiofiles.os
+except ImportError:
+    raise ImportError("File responses require aiofiles library")
+from collections import OrderedDict
+from email.utils import formatdate
+from mimetypes import guess_type
+from os import stat_result
+from os.path import abspath
+from stat import S_ISREG
+from typing import AsyncIterator, Dict, Optional, Tuple, TYPE_CHECKING
+from modulo.conf import settings
+from .response import Response
+
+
+if TYPE_CHECKING:
+    from .handler import HTTPHandler
+
+
+_UNSATISFIABLE = (-1, -1)
+
+
+class FileCache():
+    _instance = None
+
+    @staticmethod
+    def get() -> FileCache:
+        if FileCache._instance is None:
+            FileCache._instance = FileCache(settings.FILE_CACHE_SIZE, settings.FILE_CACHE_MAX_FILE_SIZE)
+        return FileCache._instance
+
+    def __init__(self: FileCache, max_size: int, max_file_size: int) -> None:
+        self._max_size = max_size
+        self._max_file_size = max_file_size
+        self._size = 0
+        self._entries: OrderedDict[str, Tuple[int, int, bytes]] = OrderedDict()
+
+    def accepts(self: FileCache, size: int) -> bool:
+        return 0 < self._max_size and size <= min(self._max_file_size, self._max_size)
+
+    def lookup(self: FileCache, path: str, stat: stat_result) -> Optional[bytes]:
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        if entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+            self._remove(path)
+            return None
+        self._entries.move_to_end(path)
+        return entry[2]
+
+    def store(self: FileCache, path: str, stat: stat_result, content: bytes) -> None:
+        if not self.accepts(len(content)):
+            return
+        if path in self._entries:
+            self._remove(path)
+        self._entries[path] = (stat.st_mtime_ns, stat.st_size, content)
+        self._size += len(content)
+        while self._size > self._max_size:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self: FileCache, path: str) -> None:
+        self._size -= len(self._entries.pop(path)[2])
+
+
+class FileResponse(Response):
+    def __init__(self: FileResponse, handler: HTTPHandler, path: str, content_type: Optional[str] = None, use_cache: bool = True) -> None:
+        super().__init__(handler)
+        self.path = abspath(path)
+        self.use_cache = use_cache
+        self.compression = False
+        if content_type is None:
+            content_type, _ = guess_type(self.path)
+        self.content_type = content_type or 'application/octet-stream'
+
+    @staticmethod
+    def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+        unit, _, ranges = header.partition('=')
+        if unit.strip().lower() != 'bytes' or ',' in ranges:
+            return None
+        start, _, end = ranges.strip().partition('-')
+        try:
+            first = int(start) if start else None
+            last = int(end) if end else None
+        except ValueError:
+            return None
+        if first is None:
+            if last is None:
+                return None
+            if not last:
+                return _UNSATISFIABLE
+            return max(size - last, 0), size - 1
+        if last is None:
+            last = size - 1
+        if first > last or first >= size:
+            return _UNSATISFIABLE
+        return first, min(last, size - 1)
+
+    def _select_range(self: FileResponse, stat: stat_result, etag: str, last_modified: str) -> Optional[Tuple[int, int]]:
+        headers: Dict[str, str] = self.handler.context.headers
+        requested = headers.get('range', None)
+        if requested is None or not stat.st_size:
+            return None
+        condition = headers.get('if-range', None)
+        if condition is not None and condition != etag and condition != last_modified:
+            return None
+        return self._parse_range(requested, stat.st_size)
+
+    async def _read(self: FileResponse, start: int, length: int) -> AsyncIterator[bytes]:
+        chunk_size = settings.FILE_CHUNK_SIZE
+        async with aiofiles.open(self.path, mode='rb') as f:
+            await f.seek(start)
+            while length > 0:
+                chunk = await f.read(min(chunk_size, length))
+                if not chunk:
+                    break
+                length -= len(chunk)
+                yield chunk
+
+    async def _load(self: FileResponse, stat: stat_result) -> Optional[bytes]:
+        cache = FileCache.get()
+        if not self.use_cache or not cache.accepts(stat.st_size):
+            return None
+        content = cache.lookup(self.path, stat)
+        if content is None:
+            async with aiofiles.open(self.path, mode='rb') as f:
+                content = await f.read()
+            if len(content) != stat.st_size:
+                return None
+            cache.store(self.path, stat, content)
+        return content
+
+    async def send(self: FileResponse) -> FileResponse:
+        try:
+            stat = await aiofiles.os.stat(self.path)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            stat = None
+        if stat is None or not S_ISREG(stat.st_mode):
+            self.status_code = 404
+            self.content_type = 'text/plain'
+            return await super().send()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self.headers['content-type'] = self.content_type
+        self.headers['accept-ranges'] = 'bytes'
+        self.headers['last-modified'] = last_modified
+        self.headers['etag'] = etag
+        start, length = 0, stat.st_size
+        selected = self._select_range(stat, etag, last_modified)
+        if selected == _UNSATISFIABLE:
+            self.status_code = 416
+            self.headers['content-range'] = f'bytes */{stat.st_size}'
+            self.headers['content-length'] = '0'
+            await self.start_response()
+            await self.close_response()
+            return self
+        if selected is not None:
+            start, length = selected[0], selected[1] - selected[0] + 1
+            self.status_code = 206
+            self.headers['content-range'] = f'bytes {selected[0]}-{selected[1]}/{stat.st_size}'
+        self.headers['content-length'] = str(length)
+        await self.start_response()
+        if self.handler.context.method == 'head' or not length:
+            await self.close_response()
+            return self
+        if selected is None and 'http.response.pathsend' in self.handler.context.extensions:
+            await self.handler.handle_send_path(self.path)
+            return self
+        content = await self._load(stat)
+        if content is not None:
+            await self.handler.handle_send_response_body(content[start:start + length])
+        else:
+            self.iterator = self._read(start, length)
+            await self.send_response_body()
+        await self.close_response()
+        return self
@@ -1,15 +1,39 @@
-from typing import Dict, AnyStr, Any, Awaitable
+from __future__ import annotations
+from asyncio import Task, create_task
+from typing import Dict, AnyStr, Any, Awaitable, Optional
 from modulo.server import Handler
 from modulo.events import handle, trigger
-from modulo.server import settings
+from modulo.conf import settings
 from .context import HTTPContext
-from .response import HTTPResponse
-from .exceptions import InvalidRequestError
+from .response import Response
+from .exceptions import InvalidRequestError, BodyTooLarge
 
 class HTTPHandler(Handler):
     def __init__(self: HTTPHandler) -> None:
         super().__init__()
-        self.response: HTTPResponse = HTTPResponse(self)
+        self.response: Response = Response(self)
+        self.disconnected = False
+        self._pipeline: Optional[Task] = None
+        self._event_params = {
+            'context': self.context,
+            'response': self.response
+        }
+
+    def reset(self: HTTPHandler) -> None:
+        self._stop_pipeline()
+        super().reset()
+        self.response.reset()
+        self.disconnected = False
+
+    def _stop_pipeline(self: HTTPHandler) -> None:
+        pipeline = self._pipeline
+        self._pipeline = None
+        if pipeline is None:
+            return
+        if not pipeline.done():
+            pipeline.cancel()
+        elif not pipeline.cancelled():
+            pipeline.exception()
 
     def get_message_type(self: HTTPHandler) -> str:
         return 'http'
@@ -18,10 +42,7 @@ class HTTPHandler(Handler):
         return HTTPContext()
     
     async def _trigger(self: HTTPHandler, event: str) -> None:
-        await trigger(event, {
-            'context': self.context,
-            'response': self.response
-        })
+        await trigger(event, self._event_params)
 
     async def on_event(self: HTTPHandler, event: Dict) -> None:
         event_type = event.get('type', '')
@@ -30,39 +51,62 @@ class HTTPHandler(Handler):
         elif event_type == 'http.disconnect':
             await self.handle_disconnect()
 
-    async def load_scope(self: Handler, scope: Dict[str, AnyStr], scope: Dict[str, AnyStr], receive: Awaitable, send: Awaitable) -> bool:
+    async def load_scope(self: Handler, scope: Dict[str, AnyStr], receive: Awaitable, send: Awaitable) -> bool:
         await super().load_scope(scope, receive, send)
         await self._trigger('protocol.http.open_connection')
         return True
     
+    async def _process_request(self: HTTPHandler) -> None:
+        if self.keep_running:
+            await self._trigger('protocol.http.request_ready')
+        if self.keep_running:
+            await self._trigger('protocol.http.process_request')
+        if self.keep_running:
+            await self._trigger('protocol.http.request_end')
+
     async def handle_request(self: Handler, type: str, body: bytes, more_body: bool = False) -> bool:
         try:
+            if more_body and self._pipeline is None and self.context.stream_body:
+                self._pipeline = create_task(self._process_request())
             self.context.append_body(body)
             await self._trigger('protocol.http.body_part')
             if not more_body:
                 self.context.close_body()
                 await self._trigger('protocol.http.body_ready')
-                if self.keep_running:
-                    await self._trigger('protocol.http.request_ready')
-                if self.keep_running:
-                    await self._trigger('protocol.http.process_request')
-                if self.keep_running:
-                    await self._trigger('protocol.http.request_end')
+                pipeline = self._pipeline
+                if pipeline is not None:
+                    self._pipeline = None
+                    await pipeline
+                elif self.keep_running:
+                    await self._process_request()
             return True
+        except BodyTooLarge:
+            self._stop_pipeline()
+            self.keep_running = False
+            await self._send_error(413)
+            return False
+        except InvalidRequestError as e:
+            self._stop_pipeline()
+            self.keep_running = False
+            await self._send_error(400, str(e) if settings.DEBUG else '')
+            return False
         except Exception as e:
-            content = str(e) if settings.DEBUG else ''
-            await self.send({
-                'type': 'http.response.start',
-                'status': 500,
-                'headers': []
-            })
-            await self.send({
-                'type': 'http.response.body',
-                'body': content.encode('ascii'),
-                'more_body': False
-            })
+            self._stop_pipeline()
+            await self._send_error(500, str(e) if settings.DEBUG else '')
             return False
 
+    async def _send_error(self: Handler, status_code: int, content: str = '') -> None:
+        await self.send({
+            'type': 'http.response.start',
+            'status': status_code,
+            'headers': []
+        })
+        await self.send({
+            'type': 'http.response.body',
+            'body': content.encode('ascii', errors='replace'),
+            'more_body': False
+        })
+
     async def handle_start_response(self: Handler, status_code: int, headers: Any) -> bool:
         await self.send({
             'type': 'http.response.start',
@@ -79,6 +123,14 @@ class HTTPHandler(Handler):
         })
         return True
     
+    async def handle_send_path(self: Handler, path: str) -> bool:
+        await self.send({
+            'type': 'http.response.pathsend',
+            'path': path
+        })
+        self.keep_running = False
+        return True
+
     async def handle_close_response(self: Handler) -> bool:
         await self.send({
             'type': 'http.response.body',
@@ -89,6 +141,16 @@ class HTTPHandler(Handler):
         return True
     
     async def handle_disconnect(self: Handler) -> bool:
+        if self.disconnected:
+            return True
+        self.disconnected = True
+        self._stop_pipeline()
         await self._trigger('protocol.http.disconnect')
         self.keep_running = False
         return True
+
+    async def watch_disconnect(self: Handler) -> None:
+        while not self.disconnected:
+            event = await self.receive()
+            if event.get('type', '') == 'http.disconnect':
+                await self.handle_disconnect()
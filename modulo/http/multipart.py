@@ -0,0 +1,203 @@
+from __future__ import annotations
+from email.message import Message
+from email.utils import collapse_rfc2231_value
+from tempfile import SpooledTemporaryFile
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+from .exceptions import BodyTooLarge, InvalidRequestError, MissingBoundaryException, MissingContentDispositionException
+
+
+def parse_header(line: str) -> Tuple[str, Dict[str, str]]:
+    message = Message()
+    message['content-type'] = line
+    params = message.get_params(header='content-type', failobj=[])
+    if not params:
+        return '', {}
+    value = params[0][0].strip().lower()
+    options = {
+        key.lower(): collapse_rfc2231_value(option)
+        for key, option in params[1:]
+    }
+    return value, options
+
+
+class Part():
+    def __init__(self: Part, headers: Dict[str, str], charset: str, spool_size: int) -> None:
+        disposition, options = parse_header(headers.get('content-disposition', ''))
+        if disposition != 'form-data' or 'name' not in options:
+            raise MissingContentDispositionException('Multipart part without a form-data content-disposition')
+        self.headers = headers
+        self.name: str = options['name']
+        self.filename: Optional[str] = options.get('filename', None)
+        content_type, content_params = parse_header(headers.get('content-type', 'text/plain'))
+        self.content_type = content_type
+        self.charset: str = content_params.get('charset', charset)
+        self.size = 0
+        self.file: Optional[BinaryIO] = None
+        self._value = bytearray()
+        if self.filename is not None:
+            self.file = SpooledTemporaryFile(max_size=spool_size)
+            self.file.filename = self.filename
+            self.file.type = self.content_type
+
+    @property
+    def is_file(self: Part) -> bool:
+        return self.file is not None
+
+    @property
+    def value(self: Part) -> Union[str, BinaryIO]:
+        if self.file is not None:
+            return self.file
+        try:
+            return self._value.decode(self.charset, errors='replace')
+        except LookupError:
+            return self._value.decode('utf-8', errors='replace')
+
+    def write(self: Part, data: Union[bytes, bytearray]) -> None:
+        self.size += len(data)
+        if self.file is not None:
+            self.file.write(data)
+        else:
+            self._value += data
+
+    def close(self: Part) -> None:
+        if self.file is not None:
+            self.file.seek(0)
+
+    def cleanup(self: Part) -> None:
+        if self.file is not None:
+            self.file.close()
+
+
+class MultipartParser():
+    PREAMBLE = 0
+    DELIMITER = 1
+    HEADERS = 2
+    BODY = 3
+    DONE = 4
+
+    def __init__(self: MultipartParser, boundary: str, charset: str = 'utf-8', max_part_size: int = 0, max_field_size: int = 0, max_parts: int = 0, max_header_size: int = 16384, spool_size: int = 1024 * 1024) -> None:
+        if not boundary:
+            raise MissingBoundaryException('Multipart request without boundary')
+        self._delimiter = b'--' + boundary.encode('latin1')
+        self._separator = b'\r\n' + self._delimiter
+        self._charset = charset
+        self._max_part_size = max_part_size
+        self._max_field_size = max_field_size
+        self._max_parts = max_parts
+        self._max_header_size = max_header_size
+        self._spool_size = spool_size
+        self._buffer = bytearray()
+        self._state = MultipartParser.PREAMBLE
+        self._current: Optional[Part] = None
+        self.parts: List[Part] = []
+
+    @property
+    def done(self: MultipartParser) -> bool:
+        return self._state == MultipartParser.DONE
+
+    def feed(self: MultipartParser, data: bytes) -> None:
+        if self._state == MultipartParser.DONE:
+            return
+        self._buffer += data
+        while self._step():
+            pass
+
+    def close(self: MultipartParser) -> None:
+        if self._state != MultipartParser.DONE:
+            raise InvalidRequestError('Multipart body ended before its closing boundary')
+        self._buffer = bytearray()
+
+    def cleanup(self: MultipartParser) -> None:
+        for part in self.parts:
+            part.cleanup()
+        if self._current is not None:
+            self._current.cleanup()
+            self._current = None
+
+    def _step(self: MultipartParser) -> bool:
+        if self._state == MultipartParser.PREAMBLE:
+            index = self._buffer.find(self._delimiter)
+            if index < 0:
+                del self._buffer[:max(0, len(self._buffer) - len(self._delimiter) + 1)]
+                return False
+            del self._buffer[:index + len(self._delimiter)]
+            self._state = MultipartParser.DELIMITER
+            return True
+        if self._state == MultipartParser.DELIMITER:
+            if len(self._buffer) < 2:
+                return False
+            if self._buffer[:2] == b'--':
+                self._state = MultipartParser.DONE
+                self._buffer = bytearray()
+                return False
+            index = self._buffer.find(b'\r\n')
+            if index < 0:
+                return False
+            del self._buffer[:index + 2]
+            self._state = MultipartParser.HEADERS
+            return True
+        if self._state == MultipartParser.HEADERS:
+            if self._buffer[:2] == b'\r\n':
+                raise MissingContentDispositionException('Multipart part without headers')
+            index = self._buffer.find(b'\r\n\r\n')
+            if index < 0:
+                if len(self._buffer) > self._max_header_size:
+                    raise InvalidRequestError('Multipart part headers are too large')
+                return False
+            self._start_part(bytes(self._buffer[:index]))
+            del self._buffer[:index + 4]
+            self._state = MultipartParser.BODY
+            return True
+        if self._state == MultipartParser.BODY:
+            index = self._buffer.find(self._separator)
+            if index < 0:
+                keep = len(self._separator) - 1
+                if len(self._buffer) > keep:
+                    self._write(self._buffer[:-keep])
+                    del self._buffer[:-keep]
+                return False
+            self._write(self._buffer[:index])
+            del self._buffer[:index + len(self._separator)]
+            self._finish_part()
+            self._state = MultipartParser.DELIMITER
+            return True
+        return False
+
+    def _start_part(self: MultipartParser, raw_headers: bytes) -> None:
+        if self._max_parts and len(self.parts) >= self._max_parts:
+            raise BodyTooLarge(f'Multipart body has more than {self._max_parts} parts')
+        headers: Dict[str, str] = {}
+        for line in raw_headers.decode('latin1').split('\r\n'):
+            if ':' not in line:
+                continue
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+        self._current = Part(headers, self._charset, self._spool_size)
+
+    def _write(self: MultipartParser, data: Union[bytes, bytearray]) -> None:
+        if not data:
+            return
+        part = self._current
+        size = part.size + len(data)
+        if self._max_part_size and size > self._max_part_size:
+            raise BodyTooLarge(f'Multipart part {part.name} exceeds {self._max_part_size} bytes')
+        if not part.is_file and self._max_field_size and size > self._max_field_size:
+            raise BodyTooLarge(f'Multipart field {part.name} exceeds {self._max_field_size} bytes')
+        part.write(data)
+
+    def _finish_part(self: MultipartParser) -> None:
+        self._current.close()
+        self.parts.append(self._current)
+        self._current = None
+
+    @property
+    def data(self: MultipartParser) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        for part in self.parts:
+            if part.name not in data:
+                data[part.name] = part.value
+            elif isinstance(data[part.name], list):
+                data[part.name].append(part.value)
+            else:
+                data[part.name] = [data[part.name], part.value]
+        return data
@@ -1,40 +1,123 @@
-from typing import Any, Dict, TYPE_CHECKING
-from json import dumps
+from __future__ import annotations
+from asyncio import create_task
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, TYPE_CHECKING, Union
+from modulo.conf import settings
+from .codec import JSONCodec
+from .compression import Compressor, negotiate
+from .cache import CachePolicy, ResponseCache
 
 
 if TYPE_CHECKING:
     from .handler import HTTPHandler
+    from .file_response import FileResponse
 
 
 class Response():
     def __init__(self: Response, handler: HTTPHandler) -> None:
+        self.handler = handler
+        self.reset()
+
+    def reset(self: Response) -> None:
         self.status_code = 200
-        self.content = ''
+        self.content: Union[str, bytes] = ''
+        self.iterator: Optional[AsyncIterator[Union[bytes, str]]] = None
         self.headers: Dict[str, str] = {}
         self.charset = 'utf-8'
         self.content_type = 'text/plain'
-        self.handler = handler
- 
+        self.compression = True
+        self._compressor: Optional[Compressor] = None
+        self.cache_key: Optional[Tuple] = None
+        self.cache_policy: Optional[CachePolicy] = None
+
+    def _encoded_content(self: Response) -> bytes:
+        if isinstance(self.content, bytes):
+            return self.content
+        return self.content.encode(self.charset)
+
+    def _select_compressor(self: Response) -> Optional[Compressor]:
+        if not self.compression or not settings.COMPRESSION_ALGORITHMS:
+            return None
+        if self.status_code < 200 or self.status_code in (204, 304):
+            return None
+        headers = {key.lower(): value for key, value in self.headers.items()}
+        if 'content-encoding' in headers:
+            return None
+        content_type = headers.get('content-type', '').split(';')[0].strip().lower()
+        if content_type.startswith(tuple(settings.COMPRESSION_EXCLUDED_TYPES)):
+            return None
+        if self.iterator is None and len(self._encoded_content()) < settings.COMPRESSION_MIN_SIZE:
+            return None
+        vary = headers.get('vary', '')
+        if 'accept-encoding' not in vary.lower():
+            self.headers['vary'] = f'{vary}, accept-encoding' if vary else 'accept-encoding'
+        encoding = negotiate(self.handler.context.headers.get('accept-encoding', ''), settings.COMPRESSION_ALGORITHMS)
+        if encoding is None:
+            return None
+        return Compressor(encoding, settings.COMPRESSION_LEVEL, settings.COMPRESSION_EXECUTOR_THRESHOLD)
+
+    async def _compress(self: Response) -> None:
+        self._compressor = self._select_compressor()
+        if self._compressor is None:
+            return
+        self.headers['content-encoding'] = self._compressor.encoding
+        if self.iterator is None:
+            self.content = await self._compressor.compress_all(self._encoded_content())
+            self._compressor = None
+            self.headers['content-length'] = str(len(self.content))
+
     async def start_response(self: Response) -> Response:
         if 'content-type' not in map(str.lower, self.headers.keys()):
             self.headers['content-type'] = f'{self.content_type}; charset={self.charset}'
+        await self._compress()
+        if self.cache_key is not None and self.iterator is None:
+            ResponseCache.get().store(self, self.headers, self._encoded_content())
         headers = [
-            [key.lowercase(), self.headers[key]] for key in self.headers
+            [key.lower().encode('latin1'), str(self.headers[key]).encode('latin1')] for key in self.headers
         ]
         await self.handler.handle_start_response(status_code=self.status_code, headers=headers)
         return self
     
     async def send_response_body(self: Response) -> Response:
-        if self.content:
+        if self.iterator is not None:
+            await self._send_stream()
+        elif isinstance(self.content, bytes):
+            if self.content:
+                await self.handler.handle_send_response_body(self.content)
+        elif self.content:
             await self.handler.handle_send_response_body(self.content.encode(self.charset))
         return self
-    
+
+    async def _send_stream(self: Response) -> None:
+        watcher = create_task(self.handler.watch_disconnect())
+        try:
+            async for chunk in self.iterator:
+                if self.handler.disconnected:
+                    break
+                if isinstance(chunk, str):
+                    chunk = chunk.encode(self.charset)
+                if chunk and self._compressor is not None:
+                    chunk = await self._compressor.compress(chunk)
+                if chunk:
+                    await self.handler.handle_send_response_body(chunk)
+            if self._compressor is not None and not self.handler.disconnected:
+                await self.handler.handle_send_response_body(self._compressor.flush())
+        except OSError:
+            await self.handler.handle_disconnect()
+        finally:
+            watcher.cancel()
+            aclose = getattr(self.iterator, 'aclose', None)
+            if aclose is not None:
+                await aclose()
+
     async def close_response(self: Response) -> Response:
-        await self.handler.handle_disconnect()
+        if not self.handler.disconnected:
+            await self.handler.handle_close_response()
         return self
     
     async def send(self: Response) -> Response:
-        await self.start_response().send_response_body().close_response()
+        await self.start_response()
+        await self.send_response_body()
+        await self.close_response()
         return self
     
     def text(self: Response, text: str, append: bool = False) -> Response:
@@ -44,9 +127,22 @@ class Response():
             self.content = text
         return self
     
+    def stream(self: Response, iterator: AsyncIterator[Union[bytes, str]]) -> Response:
+        self.iterator = iterator
+        return self
+
+    def file(self: Response, path: str, content_type: Optional[str] = None, use_cache: bool = True) -> FileResponse:
+        from .file_response import FileResponse
+
+        response = FileResponse(self.handler, path, content_type=content_type, use_cache=use_cache)
+        response.headers.update(self.headers)
+        return response
+
     def json(self: Response, data: Any) -> Response:
         self.content_type = 'application/json'
-        return self.text(dumps(data))
+        self.charset = 'utf-8'
+        self.content = JSONCodec.get().dumps(data)
+        return self
     
     def set_charset(self: Response, charset: str) -> Response:
         self.charset = charset
@@ -1,9 +1,12 @@
+from __future__ import annotations
 import re
-from typing import Optional, Dict
+from typing import Optional, Dict, Set, Tuple, Union
 from uuid import uuid4
-from modulo.events import handle, trigger, event_handler
+from modulo.events import trigger, event_handler
 from .context import Context
 from .response import Response
+from .dispatcher import Dispatcher
+from .cache import CachePolicy, ResponseCache
 
 class Router():
     _instance = None
@@ -12,35 +15,64 @@ class Router():
     def get() -> Router:
         if Router._instance is None:
             Router._instance = Router()
+            event_handler['protocol.http.open_connection'] = Router._instance.prepare
+            event_handler['protocol.http.process_request'] = Router._instance.handle
         return Router._instance
 
     def __init__(self: Router) -> None:
         self._routes: Dict[str, re.Pattern] = {}
+        self._dispatcher: Optional[Dispatcher] = None
+        self._streaming: Set[str] = set()
 
-    def register(self: Router, route: str, name: str) -> None:
+    def register(self: Router, route: str, name: str, stream: bool = False) -> None:
         self._routes[name] = re.compile(route)
-    
-    @handle('protocol.http.process_request')
+        if stream:
+            self._streaming.add(name)
+        else:
+            self._streaming.discard(name)
+        self._dispatcher = None
+
+    def compile(self: Router) -> Dispatcher:
+        self._dispatcher = Dispatcher(self._routes)
+        return self._dispatcher
+
+    def match(self: Router, path: str) -> Optional[Tuple[str, Dict[str, Optional[str]]]]:
+        dispatcher = self._dispatcher
+        if dispatcher is None:
+            dispatcher = self.compile()
+        return dispatcher.match(path)
+
+    def prepare(self: Router, context: Context, response: Response) -> bool:
+        if self._streaming:
+            match = self.match(context.path)
+            context.stream_body = match is not None and match[0] in self._streaming
+        return True
+
     async def handle(self: Router, context: Context, response: Response) -> bool:
-        for key in self._routes:
-            match = self._routes[key].match(context.path)
-            if match is not None:
-                params = {
-                    'context': context,
-                    'response': response,
-                    **match.groupdict
-                }
-                await trigger(key, params)
-                return True
+        match = self.match(context.path)
+        if match is not None:
+            key, groups = match
+            params = {
+                'context': context,
+                'response': response,
+                **groups
+            }
+            await trigger(key, params)
+            return True
         response.status_code = 404
         await response.send()
         return False
 
-def route(route: str, name: Optional[str] = None):
+def route(route: str, name: Optional[str] = None, cache: Optional[Union[int, CachePolicy]] = None, stream: bool = False):
     if name is None:
         uuid = uuid4().hex
-        name = 'http.route.{uuid}'
-    Router.get().register(route, name)
+        name = f'http.route.{uuid}'
+    Router.get().register(route, name, stream)
+    if cache is not None:
+        if not isinstance(cache, CachePolicy):
+            cache = CachePolicy(ttl=cache)
+        ResponseCache.get().register(name, cache)
     def decorate(func):
         event_handler[name] = func
         return func
+    return decorate
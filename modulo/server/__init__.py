@@ -1,3 +1,4 @@
 from .context import Context
 from .handler import Handler
+from .lifespan import LifespanHandler
 from .asgi import ASGIServer
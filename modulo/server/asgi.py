@@ -1,30 +1,58 @@
-from typing import Dict, AnyStr, Awaitable, Optional
+from __future__ import annotations
+from typing import Dict, AnyStr, Awaitable, List, Optional
 from importlib import import_module
-from modulo.server import Handler
-from modulo.http import HTTPHandler
+from modulo.server import Handler, LifespanHandler
 from modulo.conf import settings, ImproperConfigurationException
+from modulo.events import event_handler
 
 
 class ASGI2Compatibility():
-    def __init__(self: ASGI2Compatibility, scope: Dict[str, AnyStr], handler: Handler) -> None:
+    def __init__(self: ASGI2Compatibility, scope: Dict[str, AnyStr], server: ASGIServer) -> None:
         self._scope = scope
-        self._handler = handler
+        self._server = server
     
     async def __call__(self: ASGI2Compatibility, receive: Awaitable, send: Awaitable) -> None:
-        await self._handler.load_scope(scope, receive, send)
-        await self._handler.run()
+        await self._server.serve(self._scope, receive, send)
 
 
 class ASGIServer():
     def __init__(self: ASGIServer) -> None:
+        from modulo.http import HTTPHandler, http_router
+
         if not settings.ROUTES:
             raise ImproperConfigurationException('No route have been registered!')
         for route in settings.ROUTES:
             import_module(route)
+        http_router.compile()
+        event_handler.freeze()
         self._handlers = {
             'http': HTTPHandler,
+            'lifespan': LifespanHandler,
             **settings.CUSTOM_HANDLERS
         }
+        self._free: Dict[str, List[Handler]] = {event_type: [] for event_type in self._handlers}
+        self._free_size: int = settings.HANDLER_POOL_SIZE
+
+    def acquire(self: ASGIServer, event_type: str) -> Handler:
+        free = self._free[event_type]
+        if free:
+            return free.pop()
+        return self._handlers[event_type]()
+
+    def release(self: ASGIServer, event_type: str, handler: Handler) -> None:
+        handler.reset()
+        free = self._free[event_type]
+        if len(free) < self._free_size:
+            free.append(handler)
+
+    async def serve(self: ASGIServer, scope: Dict[str, AnyStr], receive: Awaitable, send: Awaitable) -> None:
+        event_type = scope['type']
+        handler = self.acquire(event_type)
+        try:
+            await handler.load_scope(scope, receive, send)
+            await handler.run()
+        finally:
+            self.release(event_type, handler)
     
     async def __call__(self: ASGIServer, scope: Dict[str, AnyStr], receive: Optional[Awaitable] = None, send: Optional[Awaitable] = None) -> None:
         event_type = scope.get('type', '')
@@ -32,6 +60,5 @@ class ASGIServer():
             raise ValueError(f'Unsupported scope type {event_type}')
         asgi_version = scope.get('asgi', {}).get('version', '2.0')
         if asgi_version < '3.0':
-            return ASGI2Compatibility(scope, self._handlers[event_type])
-        await self._handlers[event_type].load_scope(scope, receive, send)
-        await self._handlers[event_type].run()
+            return ASGI2Compatibility(scope, self)
+        await self.serve(scope, receive, send)
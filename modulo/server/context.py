@@ -1,9 +1,15 @@
+from __future__ import annotations
 from typing import Any, Dict, AnyStr
 
 class Context():
+    __slots__ = ('_params',)
+
     def __init__(self: Context) -> None:
         self._params: Dict[str, AnyStr] = {}
 
+    def reset(self: Context) -> None:
+        self._params = {}
+
     async def load(self: Context, params: Dict[str, AnyStr]) -> None:
         self._params = params
 
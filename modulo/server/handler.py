@@ -1,3 +1,4 @@
+from __future__ import annotations
 from typing import Dict, AnyStr, Awaitable, Optional
 from modulo.events import trigger
 from .context import Context
@@ -10,13 +11,19 @@ class Handler():
         self.receive: Optional[Awaitable] = None
         self.keep_running: bool = True
 
+    def reset(self: Handler) -> None:
+        self.send = None
+        self.receive = None
+        self.keep_running = True
+        self.context.reset()
+
     def get_message_type(self: Handler) -> str:
         return 'NoneType'
 
     def get_context_class(self: Handler) -> Context:
         return Context()
 
-    async def load_context(self: Handler, params: Dict[str, AnyStr) -> None:
+    async def load_context(self: Handler, params: Dict[str, AnyStr]) -> None:
         await self.context.load(params)
 
     async def load_scope(self: Handler, scope: Dict[str, AnyStr], receive: Awaitable, send: Awaitable) -> None:
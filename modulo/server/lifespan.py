@@ -0,0 +1,20 @@
+from __future__ import annotations
+from typing import Dict
+from .handler import Handler, trigger
+
+
+class LifespanHandler(Handler):
+    async def on_event(self: LifespanHandler, event: Dict) -> None:
+        if event['type'] == 'lifespan.startup':
+            await self._run_phase('server.startup', 'lifespan.startup')
+        elif event['type'] == 'lifespan.shutdown':
+            await self._run_phase('server.shutdown', 'lifespan.shutdown')
+            self.keep_running = False
+
+    async def _run_phase(self: LifespanHandler, event: str, message: str) -> None:
+        try:
+            await trigger(event, {})
+        except Exception as error:
+            await self.send({'type': f'{message}.failed', 'message': str(error)})
+            return
+        await self.send({'type': f'{message}.complete'})
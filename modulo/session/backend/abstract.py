@@ -1,5 +1,9 @@
-from typing import Dict, Any
-from modulo.server import Context
+from __future__ import annotations
+from typing import Dict, Any, TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from modulo.server import Context
 
 
 class Abstract():
@@ -0,0 +1,38 @@
+from asyncio import Event, sleep
+from typing import Dict, List, Optional, Sequence, Tuple
+from modulo.server import ASGIServer
+
+
+async def request(server: ASGIServer, path: str, method: str = 'GET', headers: Optional[Sequence[Tuple[bytes, bytes]]] = None, chunks: Sequence[bytes] = (b'',), extensions: Optional[Dict] = None) -> Tuple[int, Dict[str, str], bytes, List[Dict]]:
+    events = [
+        {'type': 'http.request', 'body': chunk, 'more_body': index < len(chunks) - 1}
+        for index, chunk in enumerate(chunks)
+    ]
+    messages: List[Dict] = []
+
+    async def receive():
+        await sleep(0)
+        if events:
+            return events.pop(0)
+        await Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'query_string': query.encode('latin1'),
+        'headers': list(headers or []),
+        'extensions': extensions or {}
+    }
+    await server(scope, receive, send)
+    start = next(message for message in messages if message['type'] == 'http.response.start')
+    response_headers = {key.decode('latin1'): value.decode('latin1') for key, value in start['headers']}
+    body = b''.join(message.get('body', b'') for message in messages if message['type'] == 'http.response.body')
+    return start['status'], response_headers, body, messages
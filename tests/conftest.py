@@ -0,0 +1,62 @@
+import os
+
+os.environ.setdefault('MODULO_CONFIG_MODULE', 'modulo_settings')
+
+import pytest  # noqa: E402
+from modulo.conf import settings  # noqa: E402
+
+
+@pytest.fixture
+def configure(monkeypatch):
+    def configure(**values):
+        for key, value in values.items():
+            monkeypatch.setitem(settings._values, key, value)
+    return configure
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, configure):
+    import sqlite3
+    from modulo.db import Pool, Sqlite
+    from tables import SQLITE_SCHEMA
+
+    path = tmp_path / 'db.sqlite'
+    connection = sqlite3.connect(path)
+    connection.executescript(SQLITE_SCHEMA)
+    connection.close()
+    pool = Pool({'backend': {'type': Sqlite, 'options': {'database': str(path)}}, 'pool_size': 2, 'acquire_timeout': 1})
+    configure(DATABASES={'default': pool})
+    return pool
+
+
+@pytest.fixture
+def postgres_db(configure):
+    dsn = os.environ.get('MODULO_TEST_POSTGRES_DSN')
+    if not dsn:
+        pytest.skip('MODULO_TEST_POSTGRES_DSN is not set')
+    import psycopg2
+    from modulo.db import Pool, Postgres
+    from tables import POSTGRES_SCHEMA
+
+    connection = psycopg2.connect(dsn)
+    with connection:
+        with connection.cursor() as cursor:
+            cursor.execute(POSTGRES_SCHEMA)
+    connection.close()
+    pool = Pool({'backend': {'type': Postgres, 'options': {'dsn': dsn}}, 'pool_size': 2, 'acquire_timeout': 1})
+    configure(DATABASES={'default': pool})
+    return pool
+
+
+@pytest.fixture(params=['sqlite', 'postgres'])
+def database(request):
+    return request.getfixturevalue(f'{request.param}_db')
+
+
+@pytest.fixture
+def events(monkeypatch):
+    from modulo.events import event_handler
+
+    monkeypatch.setattr(event_handler, '_handlers', {key: list(handlers) for key, handlers in event_handler._handlers.items()})
+    monkeypatch.setattr(event_handler, '_dispatch', None)
+    return event_handler
@@ -0,0 +1,2 @@
+ROUTES = ['routes']
+DATABASES = {}
@@ -0,0 +1,81 @@
+from modulo.http import route
+
+
+@route(r'^/items/(?P<id>\d+)$')
+async def item(context, response, id):
+    response.json({'id': int(id)})
+    await response.send()
+
+
+@route(r'^/echo$')
+async def echo(context, response):
+    body = context.body_file.read()
+    response.json({'size': len(body), 'spooled': context._body_file is not None, 'data': context.data if context.content_type[0] != 'application/octet-stream' else {}})
+    await response.send()
+
+
+def describe(value):
+    if hasattr(value, 'read'):
+        return {'filename': value.filename, 'type': value.type, 'content': value.read().decode('latin1')}
+    return value
+
+
+@route(r'^/upload$')
+async def upload(context, response):
+    response.json({key: describe(value) for key, value in context.data.items()})
+    await response.send()
+
+
+@route(r'^/upload/stream$', stream=True)
+async def upload_stream(context, response):
+    parts = []
+    async for part in context.parts():
+        parts.append({'name': part.name, 'size': part.size, 'received': context.body_size})
+    response.json(parts)
+    await response.send()
+
+
+@route(r'^/stream/(?P<count>\d+)$')
+async def stream(context, response, count):
+    async def numbers():
+        for index in range(int(count)):
+            yield f'{index},'
+    response.compression = False
+    await response.stream(numbers()).send()
+
+
+@route(r'^/files/(?P<name>[\w.]+)$')
+async def files(context, response, name):
+    await response.file(f'{context.get["root"][0]}/{name}').send()
+
+
+@route(r'^/json$')
+async def json_echo(context, response):
+    assert context.json is context.json
+    response.json({'received': context.json})
+    await response.send()
+
+
+@route(r'^/text/(?P<size>\d+)$')
+async def text(context, response, size):
+    response.content_type = context.get.get('type', ['text/plain'])[0]
+    response.text('a' * int(size))
+    await response.send()
+
+
+CACHED_CALLS = []
+
+
+@route(r'^/cached$', cache=60)
+async def cached(context, response):
+    CACHED_CALLS.append(context.path)
+    response.text(f'call {len(CACHED_CALLS)}')
+    await response.send()
+
+
+@route(r'^/cached/private$', cache=60)
+async def cached_private(context, response):
+    CACHED_CALLS.append(context.path)
+    response.headers['cache-control'] = 'private'
+    response.text(f'call {len(CACHED_CALLS)}')
+    await response.send()
@@ -0,0 +1,53 @@
+import asyncio
+from modulo.db import Table
+from modulo.db.table.field import Field
+
+
+class Category(Table):
+    _name = 'category'
+    _columns = {'id': Field(), 'title': Field()}
+    _databases = {'read': 'default', 'write': 'default'}
+
+
+class Item(Table):
+    _name = 'item'
+    _columns = {'id': Field(), 'name': Field(), 'price': Field(), 'category_id': Field()}
+    _databases = {'read': 'default', 'write': 'default'}
+
+
+class Document(Table):
+    _name = 'document'
+    _columns = {'id': Field(), 'tags': Field(), 'data': Field(), 'body': Field()}
+    _databases = {'read': 'default', 'write': 'default'}
+
+
+SQLITE_SCHEMA = '''
+CREATE TABLE category (id INTEGER PRIMARY KEY, title TEXT NOT NULL);
+CREATE TABLE item (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    price INTEGER NOT NULL DEFAULT 0,
+    category_id INTEGER REFERENCES category (id)
+);
+'''
+
+POSTGRES_SCHEMA = '''
+DROP TABLE IF EXISTS item, category, document;
+CREATE TABLE category (id SERIAL PRIMARY KEY, title TEXT NOT NULL);
+CREATE TABLE item (
+    id SERIAL PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    price INTEGER NOT NULL DEFAULT 0,
+    category_id INTEGER REFERENCES category (id)
+);
+CREATE TABLE document (id SERIAL PRIMARY KEY, tags TEXT[], data JSONB, body TEXT);
+'''
+
+
+def run(pool, coroutine):
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await pool.close()
+    return asyncio.run(main())
@@ -0,0 +1,45 @@
+import asyncio
+import json
+from modulo.server import ASGIServer
+from client import request
+
+
+def test_chunked_body_is_joined():
+    status, _, body, _ = asyncio.run(request(
+        ASGIServer(), '/echo', 'POST',
+        [(b'content-type', b'application/x-www-form-urlencoded')],
+        [b'a=1&', b'b=2', b'&c=3']
+    ))
+    assert status == 200
+    assert json.loads(body) == {'size': 11, 'spooled': False, 'data': {'a': ['1'], 'b': ['2'], 'c': ['3']}}
+
+
+def test_large_body_is_spooled(configure):
+    configure(BODY_SPOOL_THRESHOLD=10)
+    status, _, body, _ = asyncio.run(request(
+        ASGIServer(), '/echo', 'POST',
+        [(b'content-type', b'application/octet-stream')],
+        [b'x' * 8, b'x' * 8, b'x' * 8]
+    ))
+    assert status == 200
+    assert json.loads(body) == {'size': 24, 'spooled': True, 'data': {}}
+
+
+def test_body_over_limit_is_rejected(configure):
+    configure(BODY_MAX_SIZE=10)
+    status, _, _, _ = asyncio.run(request(
+        ASGIServer(), '/echo', 'POST',
+        [(b'content-type', b'application/octet-stream')],
+        [b'x' * 8, b'x' * 8]
+    ))
+    assert status == 413
+
+
+def test_declared_length_over_limit_is_rejected(configure):
+    configure(BODY_MAX_SIZE=10)
+    status, _, _, _ = asyncio.run(request(
+        ASGIServer(), '/echo', 'POST',
+        [(b'content-type', b'application/octet-stream'), (b'content-length', b'100')],
+        [b'x']
+    ))
+    assert status == 413
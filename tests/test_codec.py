@@ -0,0 +1,33 @@
+import asyncio
+import json
+import pytest
+from modulo.conf import ImproperConfigurationException
+from modulo.http.codec import CODECS, JSONCodec
+from modulo.server import ASGIServer
+from client import request
+
+
+@pytest.mark.parametrize('name', [name for name, codec in CODECS.items() if codec.available()])
+def test_codecs_round_trip(name):
+    codec = JSONCodec.create(name)
+    data = {'text': 'é', 'list': [1, 2.5, None, True]}
+    encoded = codec.dumps(data)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == data
+    assert codec.loads(encoded.decode('utf-8')) == data
+
+
+def test_unknown_codec():
+    with pytest.raises(ImproperConfigurationException):
+        JSONCodec.create('missing')
+
+
+def test_json_body_is_parsed_once_and_response_is_bytes():
+    status, headers, body, _ = asyncio.run(request(
+        ASGIServer(), '/json', 'POST',
+        [(b'content-type', b'application/json')],
+        [b'{"a": [1, ', b'"\xc3\xa9"]}']
+    ))
+    assert status == 200
+    assert headers['content-type'] == 'application/json; charset=utf-8'
+    assert json.loads(body) == {'received': {'a': [1, 'é']}}
@@ -0,0 +1,76 @@
+import pytest
+from modulo.db import Pool, Postgres, Sqlite
+from modulo.db.backends.compiler import compile_shape, shape
+from tables import Category, Item
+
+
+@pytest.fixture(params=[Postgres, Sqlite], ids=['postgres', 'sqlite'])
+def backend(request, configure):
+    configure(DATABASES={'default': Pool({'backend': {'type': request.param}})})
+    return request.param
+
+
+def test_select_sql(backend):
+    request = Item().select().where({'name': 'a', 'price': [1, 2]}).order_by(['-price', 'id']).limit(5).offset(10)
+    expected = {
+        Postgres: 'SELECT id AS id, name AS name, price AS price, category_id AS category_id FROM item AS item WHERE (name = %(w0)s) AND (price = ANY(%(w1)s)) ORDER BY price DESC, id ASC LIMIT 5 OFFSET 10',
+        Sqlite: 'SELECT id AS id, name AS name, price AS price, category_id AS category_id FROM item AS item WHERE (name = :w0) AND (price IN (SELECT value FROM json_each(:w1))) ORDER BY price DESC, id ASC LIMIT 5 OFFSET 10'
+    }
+    assert request.sql == expected[backend]
+    assert request.params == {'w0': 'a', 'w1': [1, 2]}
+
+
+def test_write_sql(backend):
+    placeholder = backend.placeholder
+    assert Item().insert({'name': 'a', 'price': 1}).sql == f'INSERT INTO item (name, price) VALUES ({placeholder("v0")}, {placeholder("v1")})'
+    assert Item().delete().where({'id': None}).sql == 'DELETE FROM item AS item WHERE id IS NULL'
+
+
+def test_subquery_placeholders_are_renamed(backend):
+    categories = Category().select().columns('id').where({'title': 'books'})
+    request = Item().select().where({'category_id': categories, 'price': 3})
+    assert request.params == {'w0': 'books', 'w1': 3}
+    assert backend.placeholder('w0') in request.sql and backend.placeholder('w1') in request.sql
+    assert request.tables == {'item', 'category'}
+
+
+def test_group_by_having_and_join(backend):
+    request = Item().select().columns({'category': 'item.category_id', 'total': 'count(*)'}) \
+        .join(Category(), category_id='category.id').group_by('item.category_id').having(**{'count(*)': 2})
+    sql = request.sql
+    assert 'LEFT JOIN category AS category ON category.category_id = category.id' in sql
+    assert sql.endswith(f'GROUP BY item.category_id HAVING count(*) = {backend.placeholder("h0")}')
+
+
+def test_self_join_uses_aliases(backend):
+    parent = Item('parent')
+    sql = Item().select().join(parent, id='item.id').sql
+    assert 'LEFT JOIN item AS parent ON parent.id = item.id' in sql
+
+
+def test_same_shape_compiles_once(backend):
+    compile_shape.cache_clear()
+    first = Item().select().where({'name': 'a'})
+    second = Item().select().where({'name': 'b'})
+    assert first.sql == second.sql
+    assert shape(first) == shape(second)
+    info = compile_shape.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+
+def test_insert_and_update_many_are_cached(backend):
+    assert backend.to_insert('item', ('name', 'price'), 2) is backend.to_insert('item', ('name', 'price'), 2)
+    sql = backend.to_update_many('item', 'item', 'id', ('price',), 2)
+    assert sql.startswith('UPDATE item AS item SET price = modulo_values.price FROM (SELECT id, price FROM item WHERE 1 = 0 UNION ALL VALUES')
+    assert sql.endswith('AS modulo_values WHERE item.id = modulo_values.id')
+
+
+def test_rename_placeholders(backend):
+    sql = f'a = {backend.placeholder("w0")} AND b = {backend.placeholder("w1")}'
+    assert backend.rename_placeholders(sql, {'w0': 'x'}) == f'a = {backend.placeholder("x")} AND b = {backend.placeholder("w1")}'
+
+
+def test_prepared_statement_positional_conversion():
+    from modulo.db.backends.postgres import _to_positional
+
+    assert _to_positional('SELECT %(a)s, %(b)s, %(a)s, 100%%') == ('SELECT $1, $2, $1, 100%', ['a', 'b'])
@@ -0,0 +1,61 @@
+import asyncio
+import gzip
+import zlib
+import pytest
+from modulo.http.compression import Compressor, negotiate
+from modulo.server import ASGIServer
+from client import request
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip, deflate', 'gzip'),
+    ('deflate;q=1, gzip;q=0.5', 'deflate'),
+    ('gzip;q=0, deflate;q=0', None),
+    ('*', 'gzip'),
+    ('br', None),
+    ('', None)
+])
+def test_negotiate(header, expected):
+    assert negotiate(header, ['gzip', 'deflate']) == expected
+
+
+def test_compressor_streams():
+    async def main():
+        compressor = Compressor('gzip', executor_threshold=10)
+        data = await compressor.compress(b'a' * 100) + await compressor.compress(b'b' * 5) + compressor.flush()
+        return gzip.decompress(data)
+
+    assert asyncio.run(main()) == b'a' * 100 + b'b' * 5
+
+
+def fetch(path, encoding):
+    return asyncio.run(request(ASGIServer(), path, headers=[(b'accept-encoding', encoding)]))
+
+
+def test_large_responses_are_compressed():
+    status, headers, body, _ = fetch('/text/2000', b'gzip')
+    assert status == 200
+    assert headers['content-encoding'] == 'gzip'
+    assert headers['vary'] == 'accept-encoding'
+    assert headers['content-length'] == str(len(body))
+    assert gzip.decompress(body) == b'a' * 2000
+
+
+def test_deflate():
+    _, headers, body, _ = fetch('/text/2000', b'deflate')
+    assert headers['content-encoding'] == 'deflate'
+    assert zlib.decompress(body) == b'a' * 2000
+
+
+def test_small_and_excluded_responses_are_not_compressed():
+    _, headers, body, _ = fetch('/text/10', b'gzip')
+    assert 'content-encoding' not in headers
+    assert body == b'a' * 10
+    _, headers, body, _ = fetch('/text/2000?type=image/png', b'gzip')
+    assert 'content-encoding' not in headers
+
+
+def test_no_accepted_encoding():
+    _, headers, body, _ = fetch('/text/2000', b'identity')
+    assert 'content-encoding' not in headers
+    assert body == b'a' * 2000
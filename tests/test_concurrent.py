@@ -0,0 +1,92 @@
+import pytest
+from modulo.db import batch, gather, transaction
+from tables import Category, Document, Item, run
+
+
+async def seed():
+    await Item().insert_many([{'name': f'item-{index}', 'price': index} for index in range(5)])
+
+
+def dicts(rows):
+    return [row.as_dict() for row in rows]
+
+
+def test_gather_returns_results_in_order(database):
+    async def main():
+        await seed()
+        results = await gather(
+            Item().select().where({'price': 1}),
+            Item().insert({'name': 'new'}),
+            Item().select().where({'price': 3})
+        )
+        return [row.name for row in results[0]], results[1], [row.name for row in results[2]]
+
+    assert run(database, main()) == (['item-1'], None, ['item-3'])
+    assert database.stats['in_use'] == 0
+
+
+def test_gather_inside_transaction_is_sequential(database):
+    async def main():
+        async with transaction():
+            results = await gather(Item().insert({'name': 'a'}), Item().select())
+        return len(results[1])
+
+    assert run(database, main()) == 1
+
+
+def test_batch_matches_all(database):
+    async def main():
+        await seed()
+        requests = [
+            Item().select().where({'price': [1, 3]}).order_by('-price'),
+            Item().select().columns({'label': 'name', 'doubled': 'price * 2'}).order_by('id').limit(2),
+            Category().select()
+        ]
+        batched = await batch(*requests)
+        return [dicts(rows) for rows in batched], [dicts(await request.all()) for request in requests]
+
+    batched, expected = run(database, main())
+    assert batched == expected
+    assert batched[1] == [{'label': 'item-0', 'doubled': 0}, {'label': 'item-1', 'doubled': 2}]
+
+
+def test_batch_runs_writes_before_reads(database):
+    async def main():
+        await seed()
+        return await batch(
+            Item().insert({'name': 'new', 'price': 10}),
+            Item().delete().where({'price': 0}),
+            Item().select().columns('name').order_by('id')
+        )
+
+    inserted, deleted, rows = run(database, main())
+    assert (inserted, deleted) == (None, None)
+    assert [row.name for row in rows] == ['item-1', 'item-2', 'item-3', 'item-4', 'new']
+
+
+def test_batch_rejects_write_after_read(database):
+    with pytest.raises(TypeError):
+        run(database, batch(Item().select(), Item().insert({'name': 'a'})))
+
+
+def test_batch_write_failure_rolls_back_everything(database):
+    async def main():
+        with pytest.raises(Exception):
+            await batch(Item().insert({'name': 'a'}), Item().insert({'name': 'a'}))
+        return await Item().select().all()
+
+    assert run(database, main()) == []
+    assert database.stats['in_use'] == 0
+
+
+def test_postgres_batch_decodes_column_types(postgres_db):
+    async def main():
+        await Document().insert({'tags': ['a', 'b'], 'body': 'text'}).execute()
+        request = Document().select().columns({'tags': 'tags', 'body': 'body', 'createdAt': 'now()', 'ratio': '1.5::numeric', 'flag': 'true'})
+        batched, = await batch(request)
+        return dicts(batched), dicts(await request.all())
+
+    batched, expected = run(postgres_db, main())
+    assert [{key: value for key, value in row.items() if key != 'createdAt'} for row in batched] == [{key: value for key, value in row.items() if key != 'createdAt'} for row in expected]
+    assert type(batched[0]['createdAt']) is type(expected[0]['createdAt'])
+    assert batched[0]['tags'] == ['a', 'b']
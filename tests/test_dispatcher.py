@@ -0,0 +1,81 @@
+import random
+import re
+import pytest
+from modulo.http.dispatcher import Dispatcher, static_prefix
+
+
+def linear(routes, path):
+    for name, pattern in routes.items():
+        match = pattern.match(path)
+        if match is not None:
+            return name, match.groupdict()
+    return None
+
+
+def build(count, seed=0):
+    generator = random.Random(seed)
+    routes = {}
+    for index in range(count):
+        kind = generator.randrange(5)
+        if kind == 0:
+            source = f'^/static/{index}$'
+        elif kind == 1:
+            source = rf'^/api/v{index % 3}/items/(?P<id>\d+)$'
+        elif kind == 2:
+            source = rf'^/users/{index}/(?P<slug>[a-z-]+)/?$'
+        elif kind == 3:
+            source = r'^/(?P<any>.*)\.json$'
+        else:
+            source = rf'^/files/{index}/(?P<path>.+)$'
+        routes[f'route{index}'] = re.compile(source)
+    return routes
+
+
+@pytest.mark.parametrize('count', [10, 100, 1000])
+def test_matches_like_linear_scan(count):
+    routes = build(count)
+    dispatcher = Dispatcher(routes)
+    generator = random.Random(count)
+    paths = ['/', '/static', '/static/1', '/unknown', '/a.json', '/api/v1/items/12', '/api/v1/items/x']
+    for _ in range(500):
+        index = generator.randrange(count)
+        paths.extend([
+            f'/static/{index}',
+            f'/api/v{index % 3}/items/{index}',
+            f'/users/{index}/some-slug/',
+            f'/files/{index}/a/b.txt',
+            f'/files/{index}/a/b.json'
+        ])
+    for path in paths:
+        assert dispatcher.match(path) == linear(routes, path), path
+
+
+def test_first_registered_route_wins():
+    routes = {
+        'generic': re.compile(r'^/(?P<page>\w+)$'),
+        'about': re.compile(r'^/about$')
+    }
+    assert Dispatcher(routes).match('/about') == ('generic', {'page': 'about'})
+
+
+def test_uncombinable_patterns_keep_their_semantics():
+    routes = {
+        'backreference': re.compile(r'^/(\w)/\1$'),
+        'insensitive': re.compile(r'^/upper$', re.IGNORECASE),
+        'named': re.compile(r'^/(?P<a>\w)/(?P=a)/(?P<b>\w+)$')
+    }
+    dispatcher = Dispatcher(routes)
+    for path in ('/a/a', '/a/b', '/UPPER', '/x/x/yy', '/x/y/yy'):
+        assert dispatcher.match(path) == linear(routes, path)
+
+
+@pytest.mark.parametrize('pattern, prefix', [
+    (r'^/static/x$', '/static/x'),
+    (r'^/api/(?P<id>\d+)$', '/api/'),
+    (r'^/ab?c$', '/a'),
+    (r'^/a\.b', '/a.b'),
+    (r'^/a|^/b', ''),
+    (r'(?i)^/a', '')
+])
+def test_static_prefix(pattern, prefix):
+    assert static_prefix(pattern) == prefix
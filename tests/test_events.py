@@ -0,0 +1,74 @@
+import asyncio
+from modulo.events import Handler
+
+
+def test_trigger_calls_sync_and_async_handlers_in_order():
+    handler = Handler()
+    calls = []
+
+    def first(value):
+        calls.append(('first', value))
+        return True
+
+    async def second(value):
+        calls.append(('second', value))
+        return True
+
+    handler['event'] = first
+    handler['event'] = second
+    asyncio.run(handler.trigger('event', {'value': 1}))
+    assert calls == [('first', 1), ('second', 1)]
+
+
+def test_falsy_result_stops_the_chain():
+    handler = Handler()
+    calls = []
+    handler['event'] = lambda: calls.append('first')
+    handler['event'] = lambda: calls.append('second') or True
+    asyncio.run(handler.trigger('event', {}))
+    assert calls == ['first']
+
+
+def test_sync_handler_returning_awaitable_is_awaited():
+    handler = Handler()
+    calls = []
+
+    async def later():
+        calls.append('awaited')
+        return True
+
+    handler['event'] = lambda: later()
+    asyncio.run(handler.trigger('event', {}))
+    assert calls == ['awaited']
+
+
+def test_handlers_registered_after_freeze_are_dispatched():
+    handler = Handler()
+    calls = []
+    handler.freeze()
+    handler['event'] = lambda: calls.append('late') or True
+    asyncio.run(handler.trigger('event', {}))
+    assert calls == ['late']
+    assert 'event' in handler
+    assert 'missing' not in handler
+
+
+def test_concurrent_handlers_run_together():
+    handler = Handler()
+    started = []
+
+    async def wait(name, event):
+        started.append(name)
+        if len(started) == 2:
+            event.set()
+        await asyncio.wait_for(event.wait(), 1)
+
+    handler['event'] = lambda event: wait('a', event)
+    handler['event'] = lambda event: wait('b', event)
+    handler.concurrent('event')
+
+    async def main():
+        await handler.trigger('event', {'event': asyncio.Event()})
+
+    asyncio.run(main())
+    assert sorted(started) == ['a', 'b']
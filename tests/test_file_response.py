@@ -0,0 +1,96 @@
+import asyncio
+import subprocess
+import sys
+import pytest
+from modulo.server import ASGIServer
+from client import request
+
+
+CONTENT = bytes(range(256)) * 10
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / 'data.bin').write_bytes(CONTENT)
+    return tmp_path
+
+
+def fetch(root, name='data.bin', headers=(), extensions=None, method='GET'):
+    return asyncio.run(request(ASGIServer(), f'/files/{name}?root={root}', method, list(headers), extensions=extensions))
+
+
+def test_full_file(root):
+    status, headers, body, _ = fetch(root)
+    assert status == 200
+    assert body == CONTENT
+    assert headers['content-length'] == str(len(CONTENT))
+    assert headers['accept-ranges'] == 'bytes'
+    assert 'last-modified' in headers
+
+
+def test_missing_file(root):
+    assert fetch(root, 'missing.bin')[0] == 404
+
+
+def test_chunked_reads_are_bounded(root, configure):
+    configure(FILE_CHUNK_SIZE=1000, FILE_CACHE_SIZE=0)
+    _, _, body, messages = fetch(root)
+    chunks = [message['body'] for message in messages if message.get('body')]
+    assert body == CONTENT
+    assert max(len(chunk) for chunk in chunks) == 1000
+
+
+@pytest.mark.parametrize('header, status, expected, content_range', [
+    ('bytes=0-9', 206, CONTENT[:10], 'bytes 0-9/2560'),
+    ('bytes=2550-', 206, CONTENT[2550:], 'bytes 2550-2559/2560'),
+    ('bytes=-5', 206, CONTENT[-5:], 'bytes 2555-2559/2560'),
+    ('bytes=100-99999', 206, CONTENT[100:], 'bytes 100-2559/2560'),
+    ('bytes=5000-', 416, b'', 'bytes */2560'),
+    ('bytes=0-1,5-6', 200, CONTENT, None)
+], ids=['first', 'suffix-open', 'suffix-length', 'clamped', 'unsatisfiable', 'multiple'])
+def test_ranges(root, header, status, expected, content_range):
+    got_status, headers, body, _ = fetch(root, headers=[(b'range', header.encode())])
+    assert got_status == status
+    assert body == expected
+    assert headers.get('content-range') == content_range
+    assert headers['content-length'] == str(len(expected))
+
+
+def test_if_range(root):
+    _, headers, _, _ = fetch(root)
+    status, _, body, _ = fetch(root, headers=[(b'range', b'bytes=0-1'), (b'if-range', headers['etag'].encode())])
+    assert (status, body) == (206, CONTENT[:2])
+    status, _, body, _ = fetch(root, headers=[(b'range', b'bytes=0-1'), (b'if-range', b'"stale"')])
+    assert (status, body) == (200, CONTENT)
+
+
+def test_pathsend(root):
+    status, _, body, messages = fetch(root, extensions={'http.response.pathsend': {}})
+    assert status == 200
+    assert body == b''
+    assert messages[-1] == {'type': 'http.response.pathsend', 'path': str(root / 'data.bin')}
+
+
+def test_small_file_cache_revalidates_on_change(root, configure):
+    configure(FILE_CACHE_SIZE=1 << 20)
+    from modulo.http.file_response import FileCache
+
+    FileCache._instance = None
+    try:
+        assert fetch(root)[2] == CONTENT
+        (root / 'data.bin').write_bytes(b'changed')
+        assert fetch(root)[2] == b'changed'
+    finally:
+        FileCache._instance = None
+
+
+def test_http_package_imports_without_aiofiles(tmp_path):
+    blocker = tmp_path / 'aiofiles.py'
+    blocker.write_text('raise ImportError("blocked")\n')
+    code = 'import modulo.http\ntry:\n    modulo.http.FileResponse\nexcept ImportError:\n    print("lazy")\n'
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        env={'PYTHONPATH': f'{tmp_path}:{":".join(sys.path)}', 'MODULO_CONFIG_MODULE': 'modulo_settings'},
+        capture_output=True, text=True
+    )
+    assert result.stdout.strip() == 'lazy', result.stderr
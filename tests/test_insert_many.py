@@ -0,0 +1,125 @@
+import threading
+import pytest
+from modulo.db import Sqlite, transaction
+from modulo.db.backends import postgres
+from modulo.db.backends.postgres import _copy_value
+from tables import Document, Item, run
+
+
+def rows(count):
+    return [{'name': f'item-{index}', 'price': index} for index in range(count)]
+
+
+async def async_rows(count):
+    for row in rows(count):
+        yield row
+
+
+async def count_items():
+    return len(await Item().select().all())
+
+
+@pytest.mark.parametrize('copy', [False, True], ids=['values', 'copy'])
+def test_insert_many(database, copy):
+    async def main():
+        inserted = await Item().insert_many(async_rows(250), copy=copy)
+        return inserted, await count_items()
+
+    assert run(database, main()) == (250, 250)
+    assert database.stats['in_use'] == 0
+
+
+def test_insert_many_batches_by_parameter_limit(sqlite_db, monkeypatch):
+    monkeypatch.setattr(Sqlite, 'max_parameters', 4)
+
+    async def main():
+        ids = await Item().insert_many(rows(5), returning=True)
+        return ids, await count_items()
+
+    assert run(sqlite_db, main()) == ([1, 2, 3, 4, 5], 5)
+
+
+def test_insert_many_empty(database):
+    async def main():
+        return await Item().insert_many([]), await Item().insert_many([], returning=True)
+
+    assert run(database, main()) == (0, [])
+
+
+@pytest.mark.parametrize('copy', [False, True], ids=['values', 'copy'])
+def test_missing_column_is_rejected(database, copy):
+    async def main():
+        with pytest.raises(KeyError):
+            await Item().insert_many([{'name': 'a', 'price': 1}, {'name': 'b'}], copy=copy)
+        return await count_items()
+
+    assert run(database, main()) == 0
+    assert database.stats['in_use'] == 0
+
+
+def test_failed_copy_does_not_leak_connection(database):
+    async def main():
+        with pytest.raises(Exception):
+            await Item().insert_many([{'name': 'a'}, {'name': 'a'}], copy=True)
+        return await count_items()
+
+    assert run(database, main()) == 0
+    assert database.stats['in_use'] == 0
+
+
+def test_copy_returning_is_rejected(sqlite_db):
+    with pytest.raises(TypeError):
+        run(sqlite_db, Item().insert_many(rows(1), copy=True, returning=True))
+
+
+def test_postgres_copy_refuses_transaction(postgres_db):
+    async def main():
+        async with transaction():
+            await Item().insert_many(rows(2), copy=True)
+
+    with pytest.raises(TypeError):
+        run(postgres_db, main())
+
+
+def test_postgres_copy_runs_on_its_own_executor(postgres_db, monkeypatch):
+    threads = []
+    connect = postgres.psycopg2.connect
+
+    def record(dsn):
+        threads.append(threading.current_thread().name)
+        return connect(dsn)
+
+    async def refuse():
+        raise AssertionError('COPY must not take a pooled connection')
+
+    async def main():
+        with monkeypatch.context() as patch:
+            patch.setattr(postgres.psycopg2, 'connect', record)
+            patch.setattr(postgres_db, 'get', refuse)
+            count = await Item().insert_many(rows(3), copy=True)
+        return count, await count_items()
+
+    assert run(postgres_db, main()) == (3, 3)
+    assert [name.startswith('modulo-copy') for name in threads] == [True]
+
+
+def test_postgres_copy_encodes_arrays_and_json(postgres_db):
+    documents = [
+        {'tags': ['a', 'b "quoted"', 'back\\slash', None], 'data': {'key': [1, 'two'], 'tab': '\t'}, 'body': 'line\nbreak'},
+        {'tags': [], 'data': None, 'body': None}
+    ]
+
+    async def main():
+        await Document().insert_many(documents, copy=True)
+        return [row.as_dict() for row in await Document().select().columns(['tags', 'data', 'body']).order_by('id').all()]
+
+    assert run(postgres_db, main()) == documents
+
+
+def test_copy_value():
+    assert _copy_value(None) == '\\N'
+    assert _copy_value(True) == 't'
+    assert _copy_value(b'\x01') == '\\\\x01'
+    assert _copy_value('a\tb') == 'a\\tb'
+    assert _copy_value([1, None, [2]]) == '{"1",NULL,{"2"}}'
+    assert _copy_value({'a': 1}) == '{"a": 1}'
@@ -0,0 +1,101 @@
+import asyncio
+import sqlite3
+import pytest
+from modulo.db import PoolTimeoutException, Request
+from modulo.db import instrumentation
+from modulo.db.instrumentation import fingerprint
+from tables import Item, run
+
+
+def collect(events, name):
+    queries = []
+
+    def handle(query):
+        queries.append(query)
+        return True
+
+    events[name] = handle
+    return queries
+
+
+def test_failed_write_releases_connection(sqlite_db):
+    sqlite_db._size = 1
+
+    async def main():
+        await Item().insert({'name': 'a'}).execute()
+        with pytest.raises(sqlite3.IntegrityError):
+            await Item().insert({'name': 'a'}).execute()
+        stats = sqlite_db.stats
+        await Item().insert({'name': 'b'}).execute()
+        return (stats['in_use'], stats['idle']), [row.name for row in await Item().select().order_by('id').all()]
+
+    assert run(sqlite_db, main()) == ((0, 1), ['a', 'b'])
+
+
+def test_failed_write_releases_connection_on_every_backend(database):
+    database._size = 1
+
+    async def main():
+        await Item().insert({'name': 'a'}).execute()
+        for _ in range(2):
+            with pytest.raises(Exception) as error:
+                await Item().insert({'name': 'a'}).execute()
+            assert not isinstance(error.value, PoolTimeoutException)
+        return len(await Item().select().all())
+
+    assert run(database, main()) == 1
+
+
+def test_query_event(database, events):
+    queries = collect(events, 'db.query')
+
+    async def main():
+        await Item().insert_many([{'name': 'a'}, {'name': 'b'}])
+        await Request(Item(), 'UPDATE', {'price': 5}).where({'name': 'a'}).execute()
+        await Item().select().all()
+
+    run(database, main())
+    update, select = queries
+    assert (update.database, update.table, update.action, update.rows, update.error) == ('default', 'item', 'UPDATE', 1, None)
+    assert (select.action, select.rows) == ('SELECT', 2)
+    assert select.duration == select.execute_time + select.fetch_time >= 0
+    assert select.pool_wait >= 0
+
+
+def test_failed_queries_are_recorded(database, events):
+    queries = collect(events, 'db.query')
+
+    async def main():
+        await Item().insert({'name': 'a'}).execute()
+        with pytest.raises(Exception):
+            await Item().insert({'name': 'a'}).execute()
+        with pytest.raises(Exception):
+            await Item().select().columns('missing').all()
+
+    run(database, main())
+    assert [query.error is None for query in queries] == [True, False, False]
+    assert [query.action for query in queries] == ['INSERT', 'INSERT', 'SELECT']
+
+
+def test_slow_queries_are_logged_with_a_plan(database, events, configure, caplog):
+    configure(DATABASE_SLOW_QUERY_THRESHOLD=1e-9, DATABASE_EXPLAIN_SAMPLE_RATE=1.0)
+    slow = collect(events, 'db.slow_query')
+
+    async def main():
+        await Item().insert({'name': 'a'}).execute()
+        await Item().select().where({'name': 'a'}).all()
+        pending = len(instrumentation._tasks)
+        while instrumentation._tasks or len(slow) < 2:
+            await asyncio.sleep(0.01)
+        return pending
+
+    with caplog.at_level('WARNING', logger='modulo.db'):
+        assert run(database, main()) == 1
+    insert, select = slow
+    assert insert.explain is None
+    assert select.explain
+    assert 'Slow query on default' in caplog.text
+
+
+def test_fingerprint_normalizes_literals_and_placeholders():
+    assert fingerprint("SELECT *  FROM item WHERE id = %(w0)s AND name = 'x' LIMIT 5") == 'SELECT * FROM item WHERE id = ? AND name = ? LIMIT ?'
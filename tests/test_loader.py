@@ -0,0 +1,106 @@
+import asyncio
+from modulo.db import Loader, loaders, transaction
+from tables import Category, Item, run
+
+
+def count_selects(events):
+    queries = []
+    events['db.query'] = lambda query: queries.append(query.sql) or True
+    return queries
+
+
+async def seed():
+    await Item().insert_many([{'name': f'item-{index}', 'price': index} for index in range(5)])
+
+
+def test_concurrent_loads_are_batched(database, events):
+    queries = count_selects(events)
+
+    async def main():
+        await seed()
+        queries.clear()
+        rows = await asyncio.gather(*[Item().load(key) for key in (3, 1, 3, 42)])
+        return [row.name if row is not None else None for row in rows]
+
+    assert run(database, main()) == ['item-2', 'item-0', 'item-2', None]
+    assert len(queries) == 1
+
+
+def test_load_many_by_other_column(database, events):
+    queries = count_selects(events)
+
+    async def main():
+        await seed()
+        queries.clear()
+        rows = await Item().load_many(['item-4', 'item-0'], column='name')
+        return [row.price for row in rows]
+
+    assert run(database, main()) == [4, 0]
+    assert len(queries) == 1
+
+
+def test_scope_memoizes_results(database, events):
+    queries = count_selects(events)
+
+    async def main():
+        await seed()
+        queries.clear()
+        async with loaders():
+            first = await Item().load(1)
+            second = await Item().load(1)
+            assert Item().loader() is Item().loader()
+            Item().loader().clear(1)
+            third = await Item().load(1)
+        outside = await Item().load(1)
+        return first is second, first is third, outside is first
+
+    assert run(database, main()) == (True, False, False)
+    assert len(queries) == 3
+
+
+def test_unscoped_loader_does_not_memoize(database, events):
+    queries = count_selects(events)
+
+    async def main():
+        await seed()
+        queries.clear()
+        await Item().load(1)
+        await Item().load(1)
+
+    run(database, main())
+    assert len(queries) == 2
+
+
+def test_loaders_are_separate_per_table_and_transaction(database):
+    async def main():
+        async with loaders():
+            outside = Item().loader()
+            assert Category().loader() is not outside
+            assert Item('alias').loader() is not outside
+            async with transaction():
+                inside = Item().loader()
+                await Item().insert({'name': 'new'}).execute()
+                loaded = await Item().load('new', column='name')
+            return inside is not outside, loaded.name
+
+    assert run(database, main()) == (True, 'new')
+
+
+def test_errors_reach_every_waiter(database):
+    async def main():
+        loader = Loader(Item(), 'missing', ('key',))
+        results = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+        return [isinstance(result, Exception) for result in results]
+
+    assert run(database, main()) == [True, True]
+
+
+def test_loaders_share_a_transaction_connection(database):
+    async def main():
+        async with transaction():
+            await Category().insert({'title': 'tools'}).execute()
+            await seed()
+            item, category = await asyncio.gather(Item().load(1), Category().load(1))
+        return item.name, category.title
+
+    assert run(database, main()) == ('item-0', 'tools')
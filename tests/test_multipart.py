@@ -0,0 +1,150 @@
+import asyncio
+import json
+import pytest
+from modulo.http.exceptions import BodyTooLarge, InvalidRequestError, MissingBoundaryException, MissingContentDispositionException
+from modulo.http.multipart import MultipartParser, parse_header
+from modulo.server import ASGIServer
+from client import request
+
+
+BOUNDARY = 'xXxBoundaryxXx'
+
+
+def encode(parts, boundary=BOUNDARY):
+    body = b'preamble\r\n'
+    for name, value, filename in parts:
+        disposition = f'form-data; name="{name}"'
+        headers = ''
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+            headers = 'Content-Type: application/octet-stream\r\n'
+        body += f'--{boundary}\r\nContent-Disposition: {disposition}\r\n{headers}\r\n'.encode('latin1')
+        body += value + b'\r\n'
+    return body + f'--{boundary}--\r\nepilogue'.encode('latin1')
+
+
+PARTS = [
+    ('title', b'hello world', None),
+    ('tags', b'a', None),
+    ('tags', b'b', None),
+    ('document', b'\x00\r\n--xXx' + bytes(range(256)) * 40 + b'\r\n-', 'doc.bin'),
+    ('empty', b'', None)
+]
+
+
+def chunked(data, size):
+    return [data[index:index + size] for index in range(0, len(data), size)]
+
+
+def parse(body, size, **options):
+    parser = MultipartParser(BOUNDARY, **options)
+    for chunk in chunked(body, size):
+        parser.feed(chunk)
+    parser.close()
+    return parser
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, len(BOUNDARY) + 3, 64, 1000, 1 << 20])
+def test_parser_is_independent_of_chunk_size(size):
+    parser = parse(encode(PARTS), size)
+    data = parser.data
+    assert data['title'] == 'hello world'
+    assert data['tags'] == ['a', 'b']
+    assert data['empty'] == ''
+    assert data['document'].filename == 'doc.bin'
+    assert data['document'].read() == PARTS[3][1]
+    parser.cleanup()
+    assert data['document'].closed
+
+
+def test_small_file_parts_spool_to_disk_past_threshold():
+    parser = parse(encode(PARTS), 100, spool_size=128)
+    document = parser.data['document']
+    assert document._rolled
+    assert document.read() == PARTS[3][1]
+
+
+def test_limits():
+    with pytest.raises(BodyTooLarge):
+        parse(encode(PARTS), 10, max_field_size=5)
+    with pytest.raises(BodyTooLarge):
+        parse(encode(PARTS), 10, max_part_size=100)
+    with pytest.raises(BodyTooLarge):
+        parse(encode(PARTS), 10, max_parts=2)
+
+
+def test_malformed_bodies():
+    with pytest.raises(MissingBoundaryException):
+        MultipartParser('')
+    with pytest.raises(InvalidRequestError):
+        parse(encode(PARTS)[:-30], 10)
+
+
+@pytest.mark.parametrize('size', [1, 2, 64])
+def test_part_without_headers_is_rejected(size):
+    body = f'--{BOUNDARY}\r\n\r\nvalue\r\n--{BOUNDARY}--\r\n'.encode('latin1')
+    with pytest.raises(MissingContentDispositionException):
+        parse(body, size)
+
+
+def test_parse_header():
+    assert parse_header('multipart/form-data; boundary="a b"; charset=UTF-8') == ('multipart/form-data', {'boundary': 'a b', 'charset': 'UTF-8'})
+    assert parse_header('') == ('', {})
+
+
+def headers(boundary=BOUNDARY):
+    return [(b'content-type', f'multipart/form-data; boundary={boundary}'.encode('latin1'))]
+
+
+@pytest.mark.parametrize('size', [1, 5, 64, 4096])
+def test_data_from_handler(size):
+    status, _, body, _ = asyncio.run(request(ASGIServer(), '/upload', 'POST', headers(), chunked(encode(PARTS), size)))
+    assert status == 200
+    data = json.loads(body)
+    assert data['tags'] == ['a', 'b']
+    assert data['document'] == {'filename': 'doc.bin', 'type': 'application/octet-stream', 'content': PARTS[3][1].decode('latin1')}
+
+
+@pytest.mark.parametrize('size', [3, 64, 1024])
+def test_streaming_route_sees_parts_before_the_body_ends(size):
+    body = encode(PARTS)
+    status, _, response, _ = asyncio.run(request(ASGIServer(), '/upload/stream', 'POST', headers(), chunked(body, size)))
+    assert status == 200
+    parts = json.loads(response)
+    assert [part['name'] for part in parts] == ['title', 'tags', 'tags', 'document', 'empty']
+    assert parts[3]['size'] == len(PARTS[3][1])
+    assert parts[0]['received'] < len(body)
+
+
+def test_malformed_body_answers_400():
+    status, _, _, _ = asyncio.run(request(ASGIServer(), '/upload/stream', 'POST', headers(), chunked(encode(PARTS)[:-30], 64)))
+    assert status == 400
+
+
+def test_parts_outside_a_streaming_route_before_body_is_rejected():
+    from modulo.http.context import HTTPContext
+    from modulo.http.exceptions import BodyNotReady
+
+    async def main():
+        context = HTTPContext()
+        async for _ in context.parts():
+            pass
+
+    with pytest.raises(BodyNotReady):
+        asyncio.run(main())
+
+
+def test_reset_closes_part_files():
+    from modulo.http.context import HTTPContext
+
+    async def main():
+        context = HTTPContext()
+        await context.load({'headers': headers()})
+        for chunk in chunked(encode(PARTS), 100):
+            context.append_body(chunk)
+        context.close_body()
+        document = context.data['document']
+        context.reset()
+        return document
+
+    assert asyncio.run(main()).closed
@@ -0,0 +1,90 @@
+import pytest
+from modulo.db.table.page import decode_cursor, encode_cursor
+from tables import Item, run
+
+
+async def seed():
+    await Item().insert_many([{'name': f'item-{index:02}', 'price': index % 3} for index in range(10)])
+
+
+async def walk(request, size, **options):
+    pages = []
+    page = await request.paginate(size=size, **options)
+    pages.append([row.name for row in page])
+    while page.next is not None:
+        page = await request.paginate(after=page.next, size=size, **options)
+        pages.append([row.name for row in page])
+    return pages, page
+
+
+def test_forward_walk_by_primary_key(database):
+    async def main():
+        await seed()
+        pages, last = await walk(Item().select(), 4)
+        return pages, last.next
+
+    pages, last_next = run(database, main())
+    assert pages == [
+        ['item-00', 'item-01', 'item-02', 'item-03'],
+        ['item-04', 'item-05', 'item-06', 'item-07'],
+        ['item-08', 'item-09']
+    ]
+    assert last_next is None
+
+
+def test_mixed_direction_ordering_with_ties(database):
+    async def main():
+        await seed()
+        pages, _ = await walk(Item().select(), 3, order_by=['-price', 'name'])
+        expected = [row.name for row in await Item().select().order_by(['-price', 'name']).all()]
+        return pages, expected
+
+    pages, expected = run(database, main())
+    assert [name for page in pages for name in page] == expected
+    assert [len(page) for page in pages] == [3, 3, 3, 1]
+
+
+def test_backward_walk(database):
+    async def main():
+        await seed()
+        first = await Item().select().paginate(size=4, order_by=['-price'])
+        second = await Item().select().paginate(after=first.next, size=4, order_by=['-price'])
+        back = await Item().select().paginate(before=second.prev, size=4, order_by=['-price'])
+        return [row.name for row in first], [row.name for row in back], first.prev, back.prev
+
+    first, back, first_prev, back_prev = run(database, main())
+    assert back == first
+    assert first_prev is None and back_prev is None
+
+
+def test_filters_and_columns_are_kept(database):
+    async def main():
+        await seed()
+        page = await Item().select().columns(['name']).where({'price': 1}).paginate(size=10)
+        return [row.as_dict() for row in page], page.next
+
+    rows, next_cursor = run(database, main())
+    assert [row['name'] for row in rows] == ['item-01', 'item-04', 'item-07']
+    assert next_cursor is None
+
+
+def test_cursor_must_match_ordering(database):
+    async def main():
+        await seed()
+        page = await Item().select().paginate(size=2, order_by=['price'])
+        with pytest.raises(ValueError):
+            await Item().select().paginate(after=page.next, size=2, order_by=['name'])
+        with pytest.raises(ValueError):
+            await Item().select().paginate(after='not a cursor', size=2)
+        with pytest.raises(TypeError):
+            await Item().select().paginate(after=page.next, before=page.next)
+
+    run(database, main())
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(['price', 'id'], [3, 10])
+    assert '=' not in cursor
+    assert decode_cursor(cursor, ['price', 'id']) == [3, 10]
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, ['id'])
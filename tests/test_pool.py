@@ -0,0 +1,192 @@
+import asyncio
+import pytest
+from modulo.db import Pool, PoolTimeoutException, Sqlite
+from modulo.server import ASGIServer
+
+
+def make_pool(path, **options):
+    return Pool({'backend': {'type': options.pop('backend', Sqlite), 'options': {'database': str(path)}}, **options})
+
+
+class FailingReset(Sqlite):
+    async def reset(self):
+        raise RuntimeError('broken connection')
+
+
+class DeadPing(Sqlite):
+    async def ping(self):
+        return False
+
+
+def test_warm_up_and_stats(tmp_path):
+    async def main():
+        pool = make_pool(tmp_path / 'db.sqlite', pool_size=4, min_size=2)
+        await pool.start()
+        stats = pool.stats
+        await pool.close()
+        return stats
+
+    stats = asyncio.run(main())
+    assert (stats['size'], stats['max_size'], stats['in_use'], stats['idle']) == (2, 4, 0, 2)
+
+
+def test_acquire_timeout(tmp_path):
+    async def main():
+        pool = make_pool(tmp_path / 'db.sqlite', pool_size=1, acquire_timeout=0.05)
+        connection = await pool.get()
+        with pytest.raises(PoolTimeoutException):
+            await pool.get()
+        timeouts = pool.stats['timeouts']
+        await pool.release(connection)
+        await pool.close()
+        return timeouts
+
+    assert asyncio.run(main()) == 1
+
+
+def test_waiter_receives_released_connection(tmp_path):
+    async def main():
+        pool = make_pool(tmp_path / 'db.sqlite', pool_size=1)
+        connection = await pool.get()
+        waiter = asyncio.create_task(pool.get())
+        await asyncio.sleep(0.01)
+        assert pool.stats['waiters'] == 1
+        await pool.release(connection)
+        received = await waiter
+        await pool.release(received)
+        await pool.close()
+        return received is connection
+
+    assert asyncio.run(main())
+
+
+def test_release_rolls_back_implicit_transaction(tmp_path):
+    async def main():
+        pool = make_pool(tmp_path / 'db.sqlite', pool_size=1)
+        connection = await pool.get()
+        await connection.execute_query('CREATE TABLE item (id INTEGER PRIMARY KEY)')
+        await connection.complete()
+        await connection.execute_query('INSERT INTO item (id) VALUES (1)')
+        await pool.release(connection)
+        reused = await pool.get()
+        await reused.execute_query('SELECT count(*) FROM item')
+        count = (await reused.fetch_one())[0]
+        in_transaction = reused._connection.in_transaction
+        await pool.release(reused)
+        await pool.close()
+        return reused is connection, count, in_transaction
+
+    assert asyncio.run(main()) == (True, 0, False)
+
+
+def test_release_discards_connection_that_cannot_be_reset(tmp_path):
+    async def main():
+        pool = make_pool(tmp_path / 'db.sqlite', backend=FailingReset)
+        connection = await pool.get()
+        await pool.release(connection)
+        return pool.stats
+
+    stats = asyncio.run(main())
+    assert (stats['size'], stats['idle'], stats['in_use']) == (0, 0, 0)
+
+
+def test_pre_ping_replaces_dead_connection(tmp_path):
+    async def main():
+        pool = make_pool(tmp_path / 'db.sqlite', backend=DeadPing, pre_ping=0)
+        first = await pool.get()
+        await pool.release(first)
+        second = await pool.get()
+        await pool.release(second)
+        size = pool.stats['size']
+        await pool.close()
+        return first is second, size
+
+    assert asyncio.run(main()) == (False, 1)
+
+
+def test_expired_connection_is_not_reused(tmp_path):
+    async def main():
+        pool = make_pool(tmp_path / 'db.sqlite', lifetime=0.01, pre_ping=None)
+        first = await pool.get()
+        await asyncio.sleep(0.02)
+        await pool.release(first)
+        second = await pool.get()
+        await pool.release(second)
+        await pool.close()
+        return first is second
+
+    assert not asyncio.run(main())
+
+
+def test_reaper_closes_idle_connections_down_to_min_size(tmp_path):
+    async def main():
+        pool = make_pool(tmp_path / 'db.sqlite', pool_size=3, min_size=1, idle_timeout=0.01, reap_interval=0.02)
+        connections = [await pool.get() for _ in range(3)]
+        for connection in connections:
+            await pool.release(connection)
+        before = pool.stats['idle']
+        await asyncio.sleep(0.1)
+        after = pool.stats['idle']
+        await pool.close()
+        return before, after
+
+    assert asyncio.run(main()) == (3, 1)
+
+
+def test_eject_marks_pool_unavailable(tmp_path):
+    pool = make_pool(tmp_path / 'db.sqlite')
+    assert pool.available
+    pool.eject(60)
+    assert not pool.available
+
+
+def test_lifespan_starts_and_closes_pools(tmp_path, configure):
+    pool = make_pool(tmp_path / 'db.sqlite', min_size=2)
+    configure(DATABASES={'default': pool})
+    server = ASGIServer()
+    events = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+    messages = []
+    sizes = []
+
+    async def receive():
+        return events.pop(0)
+
+    async def send(message):
+        messages.append(message['type'])
+        sizes.append(pool.stats['size'])
+
+    asyncio.run(server({'type': 'lifespan', 'asgi': {'version': '3.0'}}, receive, send))
+    assert messages == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+    assert sizes == [2, 0]
+
+
+def test_lifespan_reports_startup_failure(tmp_path, configure):
+    configure(DATABASES={'default': make_pool(tmp_path / 'missing' / 'db.sqlite', min_size=1)})
+    server = ASGIServer()
+    events = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+    messages = []
+
+    async def receive():
+        return events.pop(0)
+
+    async def send(message):
+        messages.append(message['type'])
+
+    asyncio.run(server({'type': 'lifespan', 'asgi': {'version': '3.0'}}, receive, send))
+    assert messages == ['lifespan.startup.failed', 'lifespan.shutdown.complete']
+
+
+def test_postgres_release_rolls_back_aborted_transaction(postgres_db):
+    async def main():
+        connection = await postgres_db.get()
+        with pytest.raises(Exception):
+            await connection.execute_query('SELECT missing_column FROM item')
+        await postgres_db.release(connection)
+        reused = await postgres_db.get()
+        await reused.execute_query('SELECT count(*) FROM item')
+        count = (await reused.fetch_one())[0]
+        await postgres_db.release(reused)
+        await postgres_db.close()
+        return reused is connection, count
+
+    assert asyncio.run(main()) == (True, 0)
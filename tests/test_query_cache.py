@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+from modulo.db import QueryCache, transaction
+from modulo.db.cache import Memory
+from tables import Item, run
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    QueryCache._instance = None
+    yield
+    QueryCache._instance = None
+
+
+def test_failed_fetch_releases_connection(database, configure):
+    database._size = 1
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(Exception):
+                await Item().select().columns(['missing']).all()
+        await Item().insert({'name': 'a'}).execute()
+        return [row.name for row in await Item().select().all()]
+
+    assert run(database, main()) == ['a']
+    assert database.stats['in_use'] == 0
+
+
+def test_cached_rows_are_reused_until_the_table_is_written(database):
+    async def main():
+        await Item().insert({'name': 'a'}).execute()
+        first = await Item().select().cache(60).all()
+        QueryCache._instance._store._entries[next(iter(QueryCache._instance._store._entries))] = ([(99, 'cached', 0, None)], float('inf'), {'item'})
+        second = await Item().select().cache(60).all()
+        await Item().insert({'name': 'b'}).execute()
+        third = await Item().select().cache(60).all()
+        return [row.name for row in first], [row.name for row in second], [row.name for row in third]
+
+    assert run(database, main()) == (['a'], ['cached'], ['a', 'b'])
+
+
+def test_fetch_in_flight_during_a_write_is_not_cached(database, monkeypatch):
+    backend = database.get_backend()
+    fetch_all = backend.fetch_all
+
+    async def main():
+        await Item().insert({'name': 'a', 'price': 1}).execute()
+        row = await Item().select().one()
+        fetched, resume = asyncio.Event(), asyncio.Event()
+
+        async def held(self):
+            data = await fetch_all(self)
+            fetched.set()
+            await resume.wait()
+            return data
+
+        with monkeypatch.context() as patch:
+            patch.setattr(backend, 'fetch_all', held)
+            reader = asyncio.create_task(Item().select().cache(60).all())
+            await fetched.wait()
+        row.price = 99
+        await row.save()
+        resume.set()
+        stale = await reader
+        fresh = await Item().select().cache(60).all()
+        return [line.price for line in stale], [line.price for line in fresh]
+
+    assert run(database, main()) == ([1], [99])
+
+
+def test_one_and_all_are_cached_separately(database):
+    async def main():
+        await Item().insert_many([{'name': 'a'}, {'name': 'b'}])
+        request = Item().select().order_by('id').cache(60)
+        return (await request.one()).name, len(await request.all())
+
+    assert run(database, main()) == ('a', 2)
+
+
+def test_requests_inside_transactions_bypass_the_cache(database):
+    async def main():
+        await Item().select().cache(60).all()
+        async with transaction():
+            await Item().insert({'name': 'a'}).execute()
+            inside = await Item().select().cache(60).all()
+        return len(inside), len(QueryCache.get()._store._entries)
+
+    assert run(database, main()) == (1, 0)
+
+
+def test_memory_store_expiry_and_limits():
+    async def main():
+        store = Memory(max_entries=2, max_rows=3)
+        await store.set('a', [(1,)], 0.01, {'t'})
+        await asyncio.sleep(0.02)
+        expired = await store.get('a')
+        await store.set('b', [(1,)], 60, {'t'})
+        await store.set('c', [(1,), (2,)], 60, {'u'})
+        await store.set('d', [(1,)], 60, {'u'})
+        await store.set('huge', [(1,)] * 4, 60, {'u'})
+        kept = [key for key in 'bcd' if await store.get(key) is not None]
+        await store.invalidate({'u'})
+        return expired, kept, await store.get('c'), await store.get('huge')
+
+    assert asyncio.run(main()) == (None, ['c', 'd'], None, None)
+
+
+def test_cache_key_depends_on_params():
+    assert QueryCache.key('default', 'all', 'SQL', {'a': 1}) != QueryCache.key('default', 'all', 'SQL', {'a': 2})
+    assert QueryCache.key('default', 'all', 'SQL', {'a': 1, 'b': 2}) == QueryCache.key('default', 'all', 'SQL', {'b': 2, 'a': 1})
@@ -0,0 +1,127 @@
+import pytest
+from modulo.db import Pool, Postgres, Sqlite, Table, transaction
+from tables import Item, run
+
+
+class ReplicatedItem(Table):
+    _name = 'item'
+    _columns = Item._columns
+    _databases = {'read': ['replica1', 'replica2'], 'write': 'default'}
+
+
+@pytest.fixture
+def replicas(sqlite_db, tmp_path, configure):
+    def pool(path):
+        return Pool({'backend': {'type': Sqlite, 'options': {'database': str(path)}}, 'acquire_timeout': 1})
+
+    databases = {
+        'default': sqlite_db,
+        'replica1': pool(tmp_path / 'db.sqlite'),
+        'replica2': pool(tmp_path / 'db.sqlite')
+    }
+    configure(DATABASES=databases)
+    return databases
+
+
+def chosen(databases, connection):
+    return next(name for name, pool in databases.items() if pool is connection.pool)
+
+
+def test_reads_go_to_least_busy_replica(replicas):
+    async def main():
+        table = ReplicatedItem()
+        first = await table.database('read')
+        second = await table.database('read')
+        names = chosen(replicas, first), chosen(replicas, second)
+        await table.release('read', first)
+        await table.release('read', second)
+        return names
+
+    assert sorted(run(replicas['default'], main())) == ['replica1', 'replica2']
+
+
+def test_ejected_replica_is_skipped(replicas):
+    replicas['replica1'].eject(60)
+
+    async def main():
+        table = ReplicatedItem()
+        connection = await table.database('read')
+        await table.release('read', connection)
+        return chosen(replicas, connection)
+
+    assert run(replicas['default'], main()) == 'replica2'
+
+
+def test_failing_replicas_are_ejected_and_reads_fall_back_to_write(replicas, tmp_path, configure):
+    broken = Pool({'backend': {'type': Sqlite, 'options': {'database': str(tmp_path / 'missing' / 'db.sqlite')}}})
+    configure(DATABASES={**replicas, 'replica1': broken, 'replica2': broken})
+
+    async def main():
+        table = ReplicatedItem()
+        connection = await table.database('read')
+        await table.release('read', connection)
+        return connection.pool
+
+    assert run(replicas['default'], main()) is replicas['default']
+    assert not broken.available
+
+
+def test_reads_stick_to_write_after_a_write(replicas, configure):
+    configure(DATABASE_STICKINESS=60)
+
+    async def main():
+        table = ReplicatedItem()
+        await table.insert({'name': 'a'}).execute()
+        connection = await table.database('read')
+        await table.release('read', connection)
+        return connection.pool
+
+    assert run(replicas['default'], main()) is replicas['default']
+
+
+def test_reads_use_the_transaction_connection(replicas):
+    async def main():
+        table = ReplicatedItem()
+        async with transaction() as current:
+            await table.insert({'name': 'a'}).execute()
+            rows = await table.select().all()
+            connection = await table.database('read')
+            await table.release('read', connection)
+            return len(rows), connection is current.connection
+
+    assert run(replicas['default'], main()) == (1, True)
+
+
+def test_where_without_mode_on_replicated_table(replicas):
+    async def main():
+        table = ReplicatedItem()
+        await table.insert({'name': 'a'}).execute()
+        return [row.name for row in await table.select().where(table.where().where(name='a')).all()]
+
+    assert run(replicas['default'], main()) == ['a']
+
+
+def test_where_without_mode_rejects_mixed_backends(replicas, configure):
+    configure(DATABASES={**replicas, 'replica1': Pool({'backend': {'type': Postgres}})})
+    with pytest.raises(TypeError):
+        ReplicatedItem().where()
+    assert ReplicatedItem().where('write')._backend is Sqlite
+
+
+def test_query_event_reports_the_replica_used(replicas, events):
+    queries = []
+
+    def collect(query):
+        queries.append(query)
+        return True
+
+    events['db.query'] = collect
+    replicas['replica1'].eject(60)
+
+    async def main():
+        table = ReplicatedItem()
+        await table.insert({'name': 'a'}).execute()
+        await table.select().all()
+
+    run(replicas['default'], main())
+    assert [(query.database, query.action) for query in queries] == [('default', 'INSERT'), ('replica2', 'SELECT')]
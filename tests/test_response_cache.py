@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+from modulo.http import http_cache
+from modulo.server import ASGIServer
+from client import request
+from routes import CACHED_CALLS
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    http_cache.clear()
+    CACHED_CALLS.clear()
+    yield
+    http_cache.clear()
+
+
+def fetch(server, path, headers=(), method='GET'):
+    return asyncio.run(request(server, path, method, list(headers)))
+
+
+def test_second_request_is_served_from_cache():
+    server = ASGIServer()
+    first = fetch(server, '/cached')
+    second = fetch(server, '/cached')
+    assert first[2] == second[2] == b'call 1'
+    assert CACHED_CALLS == ['/cached']
+    assert first[1]['etag'] == second[1]['etag']
+
+
+def test_if_none_match_answers_304():
+    server = ASGIServer()
+    etag = fetch(server, '/cached')[1]['etag']
+    status, headers, body, _ = fetch(server, '/cached', [(b'if-none-match', etag.encode())])
+    assert (status, body) == (304, b'')
+    assert headers['etag'] == etag
+
+
+def test_entries_are_keyed_by_encoding():
+    server = ASGIServer()
+    fetch(server, '/cached')
+    fetch(server, '/cached', [(b'accept-encoding', b'gzip')])
+    assert len(CACHED_CALLS) == 2
+
+
+def test_private_responses_are_not_stored():
+    server = ASGIServer()
+    fetch(server, '/cached/private')
+    fetch(server, '/cached/private')
+    assert len(CACHED_CALLS) == 2
+
+
+def test_post_bypasses_cache():
+    server = ASGIServer()
+    fetch(server, '/cached')
+    fetch(server, '/cached', method='POST')
+    assert len(CACHED_CALLS) == 2
+
+
+def test_entries_are_bounded(configure):
+    configure(HTTP_CACHE_MAX_ENTRIES=1)
+    server = ASGIServer()
+    fetch(server, '/cached')
+    fetch(server, '/cached/private')
+    fetch(server, '/cached?other=1')
+    fetch(server, '/cached')
+    assert CACHED_CALLS == ['/cached', '/cached/private', '/cached', '/cached']
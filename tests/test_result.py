@@ -0,0 +1,85 @@
+import numpy
+import pytest
+from modulo.db import Result
+from tables import Item, run
+
+
+async def seed():
+    await Item().insert_many([{'name': 'a', 'price': 1}, {'name': 'b', 'price': 2}])
+
+
+def test_result_reads_tuple_by_column():
+    result = Result(Item(), (1, 'a'), ['id', 'name'])
+    assert (result.id, result.name) == (1, 'a')
+    assert result.as_dict() == {'id': 1, 'name': 'a'}
+    assert not hasattr(result, '__dict__')
+    with pytest.raises(AttributeError):
+        result.price
+
+
+def test_dirty_tracking():
+    result = Result(Item(), (1, 'a'), {'id': 0, 'name': 1})
+    assert result.dirty == {}
+    result.name = 'b'
+    result.price = 3
+    assert result.dirty == {'name': 'b', 'price': 3}
+    assert (result.name, result.price) == ('b', 3)
+    assert result._data == (1, 'a')
+    result._commit_changes()
+    assert result.dirty == {}
+    assert result.as_dict() == {'id': 1, 'name': 'b', 'price': 3}
+
+
+def test_save_and_delete(database):
+    async def main():
+        await seed()
+        row = await Item().select().where({'name': 'a'}).one()
+        await row.save()
+        row.price = 10
+        await row.save()
+        assert row.dirty == {}
+        saved = (await Item().select().where({'name': 'a'}).one()).price
+        await row.delete()
+        return saved, [result.name for result in await Item().select().all()]
+
+    assert run(database, main()) == (10, ['b'])
+
+
+def test_save_requires_primary_key(database):
+    async def main():
+        await seed()
+        row = await Item().select().columns(['name']).one()
+        row.price = 3
+        with pytest.raises(KeyError):
+            await row.save()
+
+    run(database, main())
+
+
+@pytest.mark.parametrize('use_numpy', [False, True], ids=['lists', 'numpy'])
+def test_columns_as_arrays(database, use_numpy):
+    async def main():
+        await seed()
+        return await Item().select().columns(['name', 'price']).order_by('id').columns_as_arrays(use_numpy=use_numpy)
+
+    columns = run(database, main())
+    if use_numpy:
+        assert isinstance(columns['price'], numpy.ndarray)
+        assert columns['price'].tolist() == [1, 2]
+    else:
+        assert columns == {'name': ['a', 'b'], 'price': [1, 2]}
+
+
+def test_columns_as_arrays_empty(database):
+    columns = run(database, Item().select().columns(['name', 'price']).columns_as_arrays(use_numpy=False))
+    assert columns == {'name': [], 'price': []}
+
+
+def test_columns_as_arrays_releases_connection_on_error(database):
+    async def main():
+        with pytest.raises(Exception):
+            await Item().select().columns(['missing']).columns_as_arrays()
+        return await Item().select().all()
+
+    assert run(database, main()) == []
+    assert database.stats['in_use'] == 0
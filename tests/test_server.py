@@ -0,0 +1,69 @@
+import asyncio
+import pytest
+from modulo.http.context import HTTPContext
+from modulo.server import ASGIServer
+from client import request
+
+
+def test_handlers_are_reused_and_reset():
+    server = ASGIServer()
+    asyncio.run(request(server, '/items/1', headers=[(b'x-test', b'1')]))
+    handler = server._free['http'][-1]
+    assert handler.context.path == ''
+    assert handler.context.raw_headers == []
+    assert handler.response.status_code == 200
+    status, _, body, _ = asyncio.run(request(server, '/items/2'))
+    assert (status, body) == (200, b'{"id":2}')
+    assert server._free['http'] == [handler]
+
+
+def test_free_list_is_bounded(configure):
+    configure(HANDLER_POOL_SIZE=1)
+    server = ASGIServer()
+
+    async def main():
+        await asyncio.gather(*[request(server, f'/items/{index}') for index in range(5)])
+
+    asyncio.run(main())
+    assert len(server._free['http']) == 1
+
+
+def test_concurrent_requests_do_not_share_state():
+    server = ASGIServer()
+
+    async def main():
+        return await asyncio.gather(*[request(server, f'/items/{index}') for index in range(20)])
+
+    results = asyncio.run(main())
+    assert [body for _, _, body, _ in results] == [f'{{"id":{index}}}'.encode() for index in range(20)]
+
+
+def test_context_is_slotted():
+    context = HTTPContext()
+    assert HTTPContext.__dictoffset__ == 0
+    with pytest.raises(AttributeError):
+        context.unknown_attribute = 1
+
+
+def test_unsupported_scope_type():
+    with pytest.raises(ValueError):
+        asyncio.run(ASGIServer()({'type': 'websocket'}, None, None))
+
+
+def test_asgi2_compatibility():
+    server = ASGIServer()
+    messages = []
+    events = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+    async def receive():
+        return events.pop(0)
+
+    async def send(message):
+        messages.append(message)
+
+    async def main():
+        instance = await server({'type': 'http', 'asgi': {'version': '2.0'}, 'method': 'GET', 'path': '/items/3', 'headers': [], 'query_string': b''})
+        await instance(receive, send)
+
+    asyncio.run(main())
+    assert messages[0]['status'] == 200
@@ -0,0 +1,119 @@
+import pytest
+from modulo.db import Request, Session, session
+from tables import Item, run
+
+
+async def seed():
+    await Item().insert_many([{'name': f'item-{index}', 'price': index} for index in range(4)])
+    return await Item().select().order_by('id').all()
+
+
+async def prices():
+    return [(row.name, row.price) for row in await Item().select().order_by('id').all()]
+
+
+def test_saves_and_deletes_are_flushed_on_exit(database):
+    async def main():
+        rows = await seed()
+        async with session() as current:
+            assert Session.current() is current
+            for row in rows[:3]:
+                row.price = row.price + 10
+                await row.save()
+            await rows[3].delete()
+            assert current.pending == 4
+            assert await prices() == [('item-0', 0), ('item-1', 1), ('item-2', 2), ('item-3', 3)]
+        assert Session.current() is None
+        return current.pending, await prices(), rows[0].dirty, rows[0].price
+
+    pending, values, dirty, price = run(database, main())
+    assert pending == 0
+    assert values == [('item-0', 10), ('item-1', 11), ('item-2', 12)]
+    assert (dirty, price) == ({}, 10)
+
+
+def test_updates_are_grouped_by_changed_columns(database, monkeypatch):
+    statements = []
+    execute_query = database.get_backend().execute_query
+
+    async def spy(self, sql, params=None, prepare=True):
+        statements.append(sql)
+        return await execute_query(self, sql, params, prepare)
+
+    async def main():
+        rows = await seed()
+        with monkeypatch.context() as patch:
+            patch.setattr(database.get_backend(), 'execute_query', spy)
+            async with session():
+                for row in rows:
+                    row.price = 100
+                    await row.save()
+                rows[0].name = 'renamed'
+                await rows[0].save()
+        return await prices()
+
+    values = run(database, main())
+    assert values == [('renamed', 100), ('item-1', 100), ('item-2', 100), ('item-3', 100)]
+    assert len([sql for sql in statements if sql.startswith('UPDATE')]) == 2
+
+
+def test_deleted_results_are_not_saved(database):
+    async def main():
+        rows = await seed()
+        async with session() as current:
+            await rows[0].delete()
+            rows[0].price = 50
+            await rows[0].save()
+            pending = current.pending
+        return pending, await prices()
+
+    pending, values = run(database, main())
+    assert pending == 1
+    assert [name for name, _ in values] == ['item-1', 'item-2', 'item-3']
+
+
+def test_failed_flush_keeps_pending_changes(database):
+    async def main():
+        rows = await seed()
+        current = Session()
+        rows[0].name = 'item-1'
+        current.add(rows[0])
+        rows[2].price = 20
+        current.add(rows[2])
+        current.remove(rows[3])
+        with pytest.raises(Exception):
+            await current.flush()
+        after_failure = current.pending, await prices()
+        rows[0].name = 'item-0b'
+        await current.flush()
+        return after_failure, current.pending, await prices()
+
+    (pending, values), final_pending, final = run(database, main())
+    assert pending == 3
+    assert values == [('item-0', 0), ('item-1', 1), ('item-2', 2), ('item-3', 3)]
+    assert final_pending == 0
+    assert final == [('item-0b', 0), ('item-1', 1), ('item-2', 20)]
+
+
+def test_exception_discards_the_session(database):
+    async def main():
+        rows = await seed()
+        with pytest.raises(RuntimeError):
+            async with session():
+                rows[0].price = 99
+                await rows[0].save()
+                raise RuntimeError()
+        return await prices()
+
+    assert run(database, main())[0] == ('item-0', 0)
+
+
+def test_save_outside_session_is_immediate(database):
+    async def main():
+        rows = await seed()
+        rows[1].price = 7
+        await rows[1].save()
+        await Request(Item(), 'DELETE').where({'id': rows[0].id}).execute()
+        return await prices()
+
+    assert run(database, main())[:2] == [('item-1', 7), ('item-2', 2)]
@@ -0,0 +1,99 @@
+import sqlite3
+import threading
+import pytest
+from modulo.db import Pool, Sqlite, transaction
+from tables import Item, run
+
+
+async def query(pool, sql, params=None):
+    connection = await pool.get()
+    try:
+        await connection.execute_query(sql, params)
+        return await connection.fetch_all()
+    finally:
+        await pool.release(connection)
+
+
+def test_default_pragmas(sqlite_db):
+    async def main():
+        return [(await query(sqlite_db, f'PRAGMA {name}'))[0][0] for name in ('journal_mode', 'foreign_keys', 'synchronous')]
+
+    assert run(sqlite_db, main()) == ['wal', 1, 1]
+
+
+def test_pragmas_can_be_overridden(tmp_path):
+    pool = Pool({'backend': {'type': Sqlite, 'options': {'database': str(tmp_path / 'db.sqlite'), 'pragmas': {'journal_mode': 'DELETE'}}}})
+    assert run(pool, query(pool, 'PRAGMA journal_mode')) == [('delete',)]
+
+
+def test_queries_run_on_the_connection_thread(sqlite_db):
+    async def main():
+        connection = await sqlite_db.get()
+        name = await connection._run(lambda: threading.current_thread().name)
+        await sqlite_db.release(connection)
+        return name
+
+    assert run(sqlite_db, main()).startswith('modulo-sqlite')
+
+
+def test_foreign_keys_are_enforced(sqlite_db):
+    with pytest.raises(sqlite3.IntegrityError):
+        run(sqlite_db, Item().insert({'name': 'a', 'category_id': 42}).execute())
+
+
+@pytest.mark.parametrize('values', [[1, 3], ['item-1', 'item-3']], ids=['ints', 'strings'])
+def test_list_parameters_bind_as_json(sqlite_db, values):
+    async def main():
+        await Item().insert_many([{'name': f'item-{index}', 'price': index} for index in range(5)])
+        column = 'price' if isinstance(values[0], int) else 'name'
+        return [row.price for row in await Item().select().where({column: values}).order_by('id').all()]
+
+    assert run(sqlite_db, main()) == [1, 3]
+
+
+def test_copy_from_spans_several_batches(sqlite_db):
+    async def main():
+        count = await Item().insert_many(({'name': f'item-{index}', 'price': index} for index in range(2500)), copy=True)
+        return count, len(await Item().select().all())
+
+    assert run(sqlite_db, main()) == (2500, 2500)
+
+
+def test_copy_from_joins_the_current_transaction(sqlite_db):
+    async def main():
+        with pytest.raises(RuntimeError):
+            async with transaction():
+                await Item().insert_many([{'name': 'a'}, {'name': 'b'}], copy=True)
+                raise RuntimeError()
+        return await Item().select().all()
+
+    assert run(sqlite_db, main()) == []
+
+
+def test_explain_query_plan(sqlite_db):
+    sql = Sqlite.to_explain(Item().select().where({'name': 'a'}).sql)
+    plan = run(sqlite_db, query(sqlite_db, sql, {'w0': 'a'}))
+    assert any('item' in str(line[-1]) for line in plan)
+
+
+def test_fetch_without_query_is_rejected(sqlite_db):
+    async def main():
+        connection = await sqlite_db.get()
+        try:
+            with pytest.raises(SyntaxError):
+                await connection.fetch_all()
+        finally:
+            await sqlite_db.release(connection)
+
+    run(sqlite_db, main())
+
+
+def test_close_rolls_back_open_transaction(sqlite_db, tmp_path):
+    async def main():
+        connection = Sqlite()
+        await connection.open(str(tmp_path / 'db.sqlite'))
+        await connection.execute_query("INSERT INTO item (name) VALUES ('a')")
+        await connection.close()
+        return await Item().select().all()
+
+    assert run(sqlite_db, main()) == []
@@ -0,0 +1,58 @@
+import pytest
+from modulo.db import Postgres, transaction
+from tables import Item, run
+
+
+async def seed(count):
+    await Item().insert_many([{'name': f'item-{index}', 'price': index} for index in range(count)])
+
+
+@pytest.mark.parametrize('batch_size', [1, 7, 1000])
+def test_stream_yields_every_row_in_order(database, batch_size):
+    async def main():
+        await seed(25)
+        return [row.price async for row in Item().select().order_by('id').stream(batch_size)]
+
+    assert run(database, main()) == list(range(25))
+    assert database.stats['in_use'] == 0
+
+
+def test_stream_releases_connection_when_abandoned(database):
+    async def main():
+        await seed(10)
+        stream = Item().select().order_by('id').stream(2)
+        first = await stream.__anext__()
+        assert database.stats['in_use'] == 1
+        await stream.aclose()
+        return first.price, database.stats['in_use'], len(await Item().select().all())
+
+    assert run(database, main()) == (0, 0, 10)
+
+
+def test_stream_inside_transaction_sees_uncommitted_rows(database):
+    async def main():
+        async with transaction():
+            await seed(3)
+            rows = [row.name async for row in Item().select().order_by('id').stream(2)]
+            await Item().insert({'name': 'after'}).execute()
+        return rows, len(await Item().select().all())
+
+    assert run(database, main()) == (['item-0', 'item-1', 'item-2'], 4)
+
+
+def test_postgres_stream_uses_server_cursor(postgres_db, monkeypatch):
+    cursors = []
+    fetch_some = Postgres.fetch_some
+
+    async def spy(self, cnt):
+        cursors.append(self._server_cursor)
+        return await fetch_some(self, cnt)
+
+    monkeypatch.setattr(Postgres, 'fetch_some', spy)
+
+    async def main():
+        await seed(5)
+        return [row.price async for row in Item().select().order_by('id').stream(2)]
+
+    assert run(postgres_db, main()) == list(range(5))
+    assert len(cursors) == 4 and len(set(cursors)) == 1 and cursors[0].startswith('modulo_cursor_')
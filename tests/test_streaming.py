@@ -0,0 +1,34 @@
+import asyncio
+from modulo.server import ASGIServer
+from client import request
+
+
+def test_iterator_chunks_are_sent_as_body_messages():
+    status, _, body, messages = asyncio.run(request(ASGIServer(), '/stream/5'))
+    assert status == 200
+    assert body == b'0,1,2,3,4,'
+    chunks = [message for message in messages if message['type'] == 'http.response.body']
+    assert [chunk['body'] for chunk in chunks] == [b'0,', b'1,', b'2,', b'3,', b'4,', b'']
+    assert chunks[-1]['more_body'] is False
+
+
+def test_stream_stops_when_the_client_disconnects():
+    server = ASGIServer()
+    sent = []
+
+    async def receive():
+        if not sent:
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.sleep(0)
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+        if len(sent) > 3:
+            raise OSError('connection lost')
+
+    async def main():
+        await server({'type': 'http', 'asgi': {'version': '3.0'}, 'method': 'GET', 'path': '/stream/100000', 'headers': [], 'query_string': b''}, receive, send)
+
+    asyncio.run(asyncio.wait_for(main(), 5))
+    assert len(sent) < 10
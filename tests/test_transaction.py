@@ -0,0 +1,84 @@
+import pytest
+from modulo.db import QueryCache, Transaction, transaction
+from tables import Item, run
+
+
+async def names():
+    return [row.name for row in await Item().select().order_by('id').all()]
+
+
+def test_commit(database):
+    async def main():
+        async with transaction() as current:
+            await Item().insert({'name': 'a'}).execute()
+            await Item().insert({'name': 'b'}).execute()
+            assert current.written == {'item'}
+        return await names()
+
+    assert run(database, main()) == ['a', 'b']
+    assert database.stats['in_use'] == 0
+
+
+def test_rollback_on_error(database):
+    async def main():
+        with pytest.raises(RuntimeError):
+            async with transaction():
+                await Item().insert({'name': 'a'}).execute()
+                raise RuntimeError()
+        return await names()
+
+    assert run(database, main()) == []
+    assert database.stats['in_use'] == 0
+
+
+def test_savepoint_rollback_keeps_outer_work(database):
+    async def main():
+        async with transaction():
+            await Item().insert({'name': 'a'}).execute()
+            with pytest.raises(RuntimeError):
+                async with transaction() as nested:
+                    assert nested._savepoint == 'modulo_savepoint_1'
+                    await Item().insert({'name': 'b'}).execute()
+                    raise RuntimeError()
+            async with transaction():
+                await Item().insert({'name': 'c'}).execute()
+        return await names()
+
+    assert run(database, main()) == ['a', 'c']
+
+
+def test_connection_is_pinned(database):
+    async def main():
+        async with transaction() as current:
+            assert Transaction.current('default') is current
+            for mode in ('read', 'write'):
+                connection = await Item().database(mode)
+                assert connection is current.connection
+                await Item().release(mode, connection)
+            assert database.stats['in_use'] == 1
+        assert Transaction.current('default') is None
+
+    run(database, main())
+
+
+def test_cache_is_invalidated_on_commit_only(database, configure):
+    configure(QUERY_CACHE_BACKEND=None)
+    QueryCache._instance = None
+
+    async def main():
+        await Item().insert({'name': 'a'}).execute()
+        cached = await Item().select().cache(60).all()
+        with pytest.raises(RuntimeError):
+            async with transaction():
+                await Item().insert({'name': 'b'}).execute()
+                raise RuntimeError()
+        after_rollback = await Item().select().cache(60).all()
+        async with transaction():
+            await Item().insert({'name': 'c'}).execute()
+        after_commit = await Item().select().cache(60).all()
+        return len(cached), len(after_rollback), len(after_commit)
+
+    try:
+        assert run(database, main()) == (1, 1, 2)
+    finally:
+        QueryCache._instance = None
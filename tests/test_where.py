@@ -0,0 +1,77 @@
+import pytest
+from modulo.db import Postgres, Sqlite, Where
+from tables import Category, Item, run
+
+
+def test_and_conditions_flatten():
+    where = Where(Postgres).where(a=1, b=2).and_where(c=3)
+    assert str(where) == '((a = %(p0)s) AND (b = %(p1)s)) AND (c = %(p2)s)'
+    assert where._tree.operator == 'AND' and len(where._tree.children) == 3
+    assert where.params == {'p0': 1, 'p1': 2, 'p2': 3}
+
+
+def test_or_wraps_previous_tree():
+    where = Where(Sqlite).where(a=1, b=2).or_where(c=None)
+    assert str(where) == '((a = :p0) AND (b = :p1)) OR (c IS NULL)'
+
+
+def test_nested_groups():
+    inner = Where(Postgres).where(a=1).or_where(b=2)
+    where = Where(Postgres).where(c=3)
+    where.append(inner)
+    where.append_or(Where(Postgres).where(d=[4, 5]))
+    assert str(where) == '((c = %(p0)s) AND ((a = %(p1)s) OR (b = %(p2)s))) OR (d = ANY(%(p3)s))'
+    assert where.params == {'p0': 3, 'p1': 1, 'p2': 2, 'p3': [4, 5]}
+
+
+def test_appending_empty_where_is_a_no_op():
+    where = Where(Postgres).where(a=1)
+    where.append(Where(Postgres))
+    where.append_or(Where(Postgres))
+    assert str(where) == 'a = %(p0)s'
+    assert str(Where(Postgres)) == '' and Where(Postgres).params == {}
+
+
+def test_collections_bind_as_lists():
+    where = Where(Postgres).where(a=(1, 2), b={3})
+    assert where.params == {'p0': [1, 2], 'p1': [3]}
+
+
+def test_compilation_is_cached_until_modified():
+    where = Where(Postgres).where(a=1)
+    compiled = where.compile()
+    assert where.compile() is compiled
+    where.where(b=2)
+    assert where.compile() is not compiled
+    assert where.params == {'p0': 1, 'p1': 2}
+
+
+def test_seek_condition():
+    where = Where(Postgres).seek(['price', 'id'], [3, 10], [True, True])
+    assert str(where) == '(price, id) < (%(p0)s, %(p1)s)'
+    mixed = Where(Postgres).seek(['price', 'id'], [3, 10], [True, False])
+    assert str(mixed) == '(price < %(p0)s) OR (price = %(p0)s AND id > %(p1)s)'
+
+
+def test_subqueries(configure):
+    from modulo.db import Pool
+    configure(DATABASES={'default': Pool({'backend': {'type': Postgres}})})
+    subquery = Category().select().columns('id').where({'title': 'books'})
+    where = Where(Postgres).where(a=1, category_id=subquery)
+    assert str(where) == '(a = %(p0)s) AND (category_id IN (SELECT id AS id FROM category AS category WHERE title = %(p1)s))'
+    assert where.params == {'p0': 1, 'p1': 'books'}
+    assert where.tables == {'category'}
+    with pytest.raises(TypeError):
+        Where(Postgres).where(a=Category().delete())
+
+
+def test_where_objects_in_requests(database):
+    async def main():
+        await Item().insert_many([{'name': f'item-{index}', 'price': index} for index in range(6)])
+        table = Item()
+        cheap_or_named = table.where().where(price=[0, 1]).or_where(name='item-5')
+        rows = await table.select().where(cheap_or_named).where({'category_id': None}).order_by('id').all()
+        either = await table.select().where({'price': 2}).or_where(table.where().where(price=4)).order_by('id').all()
+        return [row.price for row in rows], [row.price for row in either]
+
+    assert run(database, main()) == ([0, 1, 5], [2, 4])